@@ -94,13 +94,13 @@ class CapitalGainsCalculator:
             dates_needed.add(txn.sale_date)
             dates_needed.add(txn.acquisition_date)
         
-        # Get exchange rates for all dates
+        # Get exchange rates for all dates in one batch
+        rates = self.exchange_rate_service.get_rates_for_dates(dates_needed, use_sbi)
         print("\n   Exchange rates used (SBI TT Buy):")
-        for date in sorted(dates_needed):
-            rate = self.exchange_rate_service.get_rate(date, use_sbi)
-            print(f"   {date.strftime('%Y-%m-%d')}: Rs.{rate:.4f}/USD")
+        for date_str, rate in rates.items():
+            print(f"   {date_str}: Rs.{rate:.4f}/USD")
         
-        # Calculate gains for each transaction
+        # Calculate gains for each transaction (rates are served from the cache)
         for txn in transactions:
             self._calculate_transaction_gains(txn, use_sbi)
         
@@ -151,7 +151,7 @@ class CapitalGainsCalculator:
         Get the cached exchange rates.
         
         Returns:
-            Dictionary of date -> rate mappings
+            Read-only view of date -> rate mappings
         """
         return self.exchange_rate_service.get_cached_rates()
     
@@ -6,9 +6,66 @@ SBI TT Buy rates for currency conversion.
 """
 
 import json
+import mmap
 import os
+import re
+from bisect import bisect_left
 from datetime import datetime, timedelta
-from typing import Dict, Optional
+from functools import lru_cache
+from types import MappingProxyType
+from typing import BinaryIO, Dict, Iterable, List, Mapping, Optional, Union
+
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+try:
+    import numpy as np
+    NUMPY_AVAILABLE = True
+except ImportError:
+    NUMPY_AVAILABLE = False
+
+
+def _date_key(date: datetime) -> str:
+    """Format a date as YYYY-MM-DD (faster than strftime)."""
+    return f"{date.year:04d}-{date.month:02d}-{date.day:02d}"
+
+
+@lru_cache(maxsize=4096)
+def _ordinal_key(ordinal: int) -> str:
+    """Memoized YYYY-MM-DD string for a date.toordinal() value."""
+    return _date_key(datetime.fromordinal(ordinal))
+
+
+# Keys of the SBI rates file that are dates (skips e.g. "last_updated")
+_ISO_DATE_KEY = re.compile(r"\d{4}-\d{2}-\d{2}")
+
+
+def _is_date_key(key: object) -> bool:
+    """Whether key is a valid YYYY-MM-DD date string."""
+    if not isinstance(key, str) or not _ISO_DATE_KEY.fullmatch(key):
+        return False
+    try:
+        datetime.strptime(key, "%Y-%m-%d")
+    except ValueError:
+        return False
+    return True
+
+
+def _quarter_table(rates: Dict[tuple, float], default: float) -> tuple:
+    """Flatten (year, quarter) -> rate into (base_year, rates by quarter index)."""
+    if not rates:
+        return 0, ()
+    base_year = min(year for year, _ in rates)
+    last_year = max(year for year, _ in rates)
+    table = tuple(
+        rates.get((year, quarter), default)
+        for year in range(base_year, last_year + 1)
+        for quarter in range(1, 5)
+    )
+    return base_year, table
 
 
 class ExchangeRateService:
@@ -43,26 +100,74 @@ class ExchangeRateService:
         """Initialize the exchange rate service."""
         self.cache: Dict[str, float] = {}
         self.sbi_rates: Dict[str, float] = {}
+        # (APPROXIMATE_RATES, DEFAULT_RATE, base_year, table) the flat table was built from
+        self._approx_table: Optional[tuple] = None
+    
+    @property
+    def sbi_rates(self) -> Dict[str, float]:
+        """Loaded SBI rates keyed by ISO date string."""
+        return self._sbi_rates
     
-    def load_sbi_rates(self, filepath: str) -> bool:
+    @sbi_rates.setter
+    def sbi_rates(self, rates: Dict[str, float]) -> None:
+        """
+        Replace the SBI rates and rebuild the sorted date index.
+        
+        ISO date strings sort chronologically, so the index can be
+        bisected directly; non-date keys are left out. Assign a new
+        mapping to change the rates, in-place edits are not indexed.
+        """
+        self._sbi_rates = rates
+        self._sorted_dates: List[str] = sorted(k for k in rates if _is_date_key(k))
+        self._sorted_arrays = None
+    
+    def _get_sorted_arrays(self):
+        """Get the sorted SBI dates and their rates as NumPy arrays."""
+        if self._sorted_arrays is None:
+            self._sorted_arrays = (
+                np.array(self._sorted_dates, dtype='datetime64[D]'),
+                np.array([self._sbi_rates[d] for d in self._sorted_dates], dtype=np.float64),
+            )
+        return self._sorted_arrays
+    
+    def load_sbi_rates(self, filepath: Union[str, os.PathLike, BinaryIO]) -> bool:
         """
         Load SBI TT Buy rates from a JSON file.
         
         Args:
-            filepath: Path to the JSON file containing rates
+            filepath: Path to the JSON file containing rates, or an open
+                      binary file (e.g. io.BytesIO) to read them from
             
         Returns:
             True if loaded successfully, False otherwise
             
         The JSON file should have format: {"YYYY-MM-DD": rate, ...}
         """
+        if hasattr(filepath, 'read'):
+            name = getattr(filepath, 'name', 'stream')
+            try:
+                data = filepath.read()
+                self.sbi_rates = orjson.loads(data) if ORJSON_AVAILABLE else json.loads(data)
+            except Exception as e:
+                print(f"  Warning: Error reading SBI rates file: {e}")
+                return False
+            
+            print(f"  [OK] Loaded {len(self.sbi_rates)} SBI TT Buy rates from {os.path.basename(str(name))}")
+            return True
+        
         if not os.path.exists(filepath):
             print(f"  Warning: SBI rates file not found: {filepath}")
             return False
         
         try:
-            with open(filepath, 'r', encoding='utf-8') as f:
-                self.sbi_rates = json.load(f)
+            with open(filepath, 'rb') as f:
+                if ORJSON_AVAILABLE and os.fstat(f.fileno()).st_size > 0:
+                    # Parse straight out of the page cache, no read() copy
+                    with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                        with memoryview(mm) as view:
+                            self.sbi_rates = orjson.loads(view)
+                else:
+                    self.sbi_rates = json.load(f)
             
             print(f"  [OK] Loaded {len(self.sbi_rates)} SBI TT Buy rates from {os.path.basename(filepath)}")
             return True
@@ -88,43 +193,54 @@ class ExchangeRateService:
         4. Look for previous available date (up to 7 days back)
         5. Use approximate quarterly rate
         """
-        date_str = date.strftime("%Y-%m-%d")
+        # Memoized per calendar day, so repeat lookups don't reformat the date
+        date_str = _ordinal_key(date.toordinal())
         
         # Check cache first
-        if date_str in self.cache:
-            return self.cache[date_str]
-        
-        if use_sbi and self.sbi_rates:
-            # Check SBI rates for exact date
-            if date_str in self.sbi_rates:
-                rate = self.sbi_rates[date_str]
-                self.cache[date_str] = rate
-                return rate
-            
-            # Look for next available date (SBI doesn't publish on weekends/holidays)
-            for days_forward in range(1, 8):
-                next_date = date + timedelta(days=days_forward)
-                next_str = next_date.strftime("%Y-%m-%d")
-                if next_str in self.sbi_rates:
-                    rate = self.sbi_rates[next_str]
-                    self.cache[date_str] = rate
-                    return rate
-            
-            # Fallback: Look for previous date
-            for days_back in range(1, 8):
-                prev_date = date - timedelta(days=days_back)
-                prev_str = prev_date.strftime("%Y-%m-%d")
-                if prev_str in self.sbi_rates:
-                    rate = self.sbi_rates[prev_str]
-                    self.cache[date_str] = rate
-                    return rate
-        
-        # Final fallback to approximate rate
-        print(f"  Warning: No SBI rate for {date_str}, using approximate rate")
-        rate = self._get_approximate_rate(date)
+        rate = self.cache.get(date_str)
+        if rate is not None:
+            return rate
+        
+        rate = self._lookup_sbi_rate(date, date_str) if use_sbi and self.sbi_rates else None
+        
+        if rate is None:
+            # Final fallback to approximate rate
+            print(f"  Warning: No SBI rate for {date_str}, using approximate rate")
+            rate = self._get_approximate_rate(date)
+        
         self.cache[date_str] = rate
         return rate
     
+    def _lookup_sbi_rate(self, date: datetime, date_str: str) -> Optional[float]:
+        """
+        Find the SBI rate for a date, or the nearest one within 7 days.
+        
+        Args:
+            date: Date for which to get the rate
+            date_str: The date as a YYYY-MM-DD string
+            
+        Returns:
+            SBI rate, or None if no rate is published within the window
+        """
+        # Check SBI rates for exact date
+        if date_str in self.sbi_rates:
+            return self.sbi_rates[date_str]
+        
+        # Look for next available date (SBI doesn't publish on weekends/holidays),
+        # falling back to the previous one, each up to 7 days away
+        sorted_dates = self._sorted_dates
+        i = bisect_left(sorted_dates, date_str)
+        
+        if i < len(sorted_dates):
+            if sorted_dates[i] <= _date_key(date + timedelta(days=7)):
+                return self.sbi_rates[sorted_dates[i]]
+        
+        if i > 0:
+            if sorted_dates[i - 1] >= _date_key(date - timedelta(days=7)):
+                return self.sbi_rates[sorted_dates[i - 1]]
+        
+        return None
+    
     def _get_approximate_rate(self, date: datetime) -> float:
         """
         Get approximate USD-INR rate based on historical averages.
@@ -135,27 +251,86 @@ class ExchangeRateService:
         Returns:
             Approximate exchange rate
         """
-        quarter = (date.month - 1) // 3 + 1
-        key = (date.year, quarter)
-        return self.APPROXIMATE_RATES.get(key, self.DEFAULT_RATE)
+        base_year, table = self._get_approx_table()
+        index = (date.year - base_year) * 4 + (date.month - 1) // 3
+        if 0 <= index < len(table):
+            return table[index]
+        return self.DEFAULT_RATE
     
-    def get_rates_for_dates(self, dates: set, use_sbi: bool = True) -> Dict[str, float]:
+    def _get_approx_table(self) -> tuple:
+        """
+        Get APPROXIMATE_RATES indexed by (year - base_year) * 4 + quarter - 1.
+        
+        Built once per service and rebuilt only if a different
+        APPROXIMATE_RATES mapping or DEFAULT_RATE is swapped in; editing
+        the mapping in place is not picked up.
+        """
+        rates, default = self.APPROXIMATE_RATES, self.DEFAULT_RATE
+        cached = self._approx_table
+        if cached is None or cached[0] is not rates or cached[1] != default:
+            cached = (rates, default) + _quarter_table(rates, default)
+            self._approx_table = cached
+        return cached[2], cached[3]
+    
+    def get_rates_for_dates(self, dates: Iterable[datetime], use_sbi: bool = True) -> Dict[str, float]:
         """
         Get exchange rates for multiple dates.
         
+        Repeat calls are served from the per-date cache, so callers can
+        pass overlapping slices (per quarter, per symbol) without redoing
+        the lookups.
+        
         Args:
-            dates: Set of datetime objects
+            dates: Datetime objects (any iterable; duplicates are ignored)
             use_sbi: Whether to use SBI rates
             
         Returns:
             Dictionary mapping date strings to rates
         """
+        ordered = sorted(set(dates))
+        if NUMPY_AVAILABLE and use_sbi and self.sbi_rates and len(ordered) > 1:
+            self._cache_sbi_rates_batch(ordered)
+        
         rates = {}
-        for date in sorted(dates):
-            date_str = date.strftime("%Y-%m-%d")
-            rates[date_str] = self.get_rate(date, use_sbi)
+        for date in ordered:
+            rates[_date_key(date)] = self.get_rate(date, use_sbi)
         return rates
     
+    def _cache_sbi_rates_batch(self, dates: List[datetime]) -> None:
+        """
+        Resolve SBI rates for many dates with one vectorized search.
+        
+        Applies the same next/previous 7-day window as get_rate and stores
+        the hits in the cache. Dates without an SBI rate in the window are
+        left for get_rate to handle.
+        
+        Args:
+            dates: Datetime objects to resolve
+        """
+        keys = [_date_key(d) for d in dates]
+        keys = [k for k in keys if k not in self.cache]
+        if not keys:
+            return
+        
+        rate_dates, rate_values = self._get_sorted_arrays()
+        if not len(rate_dates):
+            return
+        last = len(rate_dates) - 1
+        window = np.timedelta64(7, 'D')
+        
+        query = np.array(keys, dtype='datetime64[D]')
+        idx = np.searchsorted(rate_dates, query)
+        next_idx = np.minimum(idx, last)
+        prev_idx = np.maximum(idx - 1, 0)
+        
+        has_next = (idx <= last) & (rate_dates[next_idx] - query <= window)
+        has_prev = (idx > 0) & (query - rate_dates[prev_idx] <= window)
+        chosen = np.where(has_next, next_idx, prev_idx)
+        found = has_next | has_prev
+        
+        for key, rate in zip(np.asarray(keys)[found], rate_values[chosen[found]]):
+            self.cache[str(key)] = float(rate)
+    
     def save_cache_to_file(self, filepath: str) -> None:
         """
         Save the exchange rates cache to a JSON file.
@@ -166,14 +341,14 @@ class ExchangeRateService:
         with open(filepath, 'w') as f:
             json.dump(self.cache, f, indent=2, sort_keys=True)
     
-    def get_cached_rates(self) -> Dict[str, float]:
+    def get_cached_rates(self) -> Mapping[str, float]:
         """
         Get all cached exchange rates.
         
         Returns:
-            Dictionary of cached date -> rate mappings
+            Read-only view of the cached date -> rate mappings
         """
-        return self.cache.copy()
+        return MappingProxyType(self.cache)
     
     def clear_cache(self) -> None:
         """Clear the in-memory cache."""
@@ -7,7 +7,7 @@ between components and facilitate testing with mock implementations.
 
 from abc import ABC, abstractmethod
 from datetime import datetime
-from typing import List, Dict, Optional, Any, Protocol, runtime_checkable
+from typing import List, Dict, Iterable, Mapping, Optional, Any, Protocol, runtime_checkable, Union, BinaryIO
 
 from .models import SaleTransaction, IndianGains, TaxData
 
@@ -34,12 +34,12 @@ class IExchangeRateProvider(Protocol):
         """
         ...
     
-    def get_rates_for_dates(self, dates: set, use_sbi: bool = True) -> Dict[str, float]:
+    def get_rates_for_dates(self, dates: Iterable[datetime], use_sbi: bool = True) -> Dict[str, float]:
         """
         Get exchange rates for multiple dates.
         
         Args:
-            dates: Set of datetime objects
+            dates: Datetime objects (any iterable; duplicates are ignored)
             use_sbi: Whether to use SBI rates
             
         Returns:
@@ -77,12 +77,12 @@ class IIndianGainsParser(Protocol):
     Interface for Indian gains parsers (stocks, mutual funds).
     """
     
-    def parse(self, filepath: str) -> IndianGains:
+    def parse(self, filepath: Union[str, BinaryIO]) -> IndianGains:
         """
         Parse the file and return capital gains data.
         
         Args:
-            filepath: Path to the input file
+            filepath: Path to the input file, or an open binary file
             
         Returns:
             IndianGains object with parsed data
@@ -115,7 +115,7 @@ class IGainsCalculator(Protocol):
         """
         ...
     
-    def get_exchange_rates_cache(self) -> Dict[str, float]:
+    def get_exchange_rates_cache(self) -> Mapping[str, float]:
         """Get the cached exchange rates."""
         ...
 
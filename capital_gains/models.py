@@ -5,12 +5,17 @@ This module contains dataclasses representing transactions, stock lots,
 and other data structures used throughout the application.
 """
 
+import sys
 from dataclasses import dataclass, field
 from datetime import datetime
 from typing import Optional, List, Dict, Any
 from enum import Enum
 
 
+# dataclass(slots=True) needs Python 3.10+; older interpreters get plain dataclasses
+_SLOTS = {'slots': True} if sys.version_info >= (3, 10) else {}
+
+
 class StockType(Enum):
     """Types of stock transactions."""
     RS = "RS"       # Restricted Stock (RSU)
@@ -25,7 +30,7 @@ class TransactionSource(Enum):
     INDIAN = "Indian"       # Indian broker
 
 
-@dataclass
+@dataclass(**_SLOTS)
 class SaleTransaction:
     """
     Represents a single stock sale transaction.
@@ -95,7 +100,7 @@ class SaleTransaction:
         return self.acquisition_price_inr * self.shares
 
 
-@dataclass
+@dataclass(**_SLOTS)
 class StockLot:
     """
     Represents a purchase lot for FIFO matching.
@@ -117,7 +122,7 @@ class StockLot:
         self.remaining = self.quantity
 
 
-@dataclass
+@dataclass(**_SLOTS)
 class IndianGains:
     """
     Represents capital gains from Indian investments.
@@ -154,7 +159,7 @@ class IndianGains:
         }
 
 
-@dataclass
+@dataclass(**_SLOTS)
 class TaxData:
     """
     Contains all tax-related calculation data.
@@ -272,7 +277,7 @@ class TaxData:
         }
 
 
-@dataclass
+@dataclass(**_SLOTS)
 class QuarterlyData:
     """Capital gains data for a single advance tax quarter."""
     ltcg: float = 0.0
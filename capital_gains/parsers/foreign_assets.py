@@ -11,6 +11,19 @@ from typing import List, Dict, Any, Optional, Tuple
 from collections import defaultdict
 from io import StringIO
 
+from ..utils import parse_date as _parse_date_format
+
+# Characters stripped from amount cells ("$1,234.50", quoted CSV fields)
+_AMOUNT_STRIP = str.maketrans('', '', '$,')
+_QUOTED_AMOUNT_STRIP = str.maketrans('', '', '$,"')
+_QUOTED_COUNT_STRIP = str.maketrans('', '', ',"')
+
+# Date formats tried by ForeignAssetsParser.parse_date, in priority order
+_DATE_FORMATS = ('%m/%d/%Y', '%d/%m/%Y', '%Y-%m-%d', '%d-%m-%Y')
+# Only reached when MM/DD/YYYY fails; remembering it would misread later
+# ambiguous dates such as 05/06/2025 as day-first
+_UNMEMOIZED_FORMATS = frozenset({'%d/%m/%Y'})
+
 
 class ForeignAssetsParser:
     """
@@ -22,16 +35,27 @@ class ForeignAssetsParser:
         self.calendar_year = calendar_year
         self.cy_start = datetime(calendar_year, 1, 1)
         self.cy_end = datetime(calendar_year, 12, 31)
+        # Last format that parsed successfully, tried first on the next call
+        self._last_fmt: Optional[str] = None
     
-    @staticmethod
-    def parse_date(date_str: str) -> datetime:
+    def parse_date(self, date_str: str) -> datetime:
         """Parse date string to datetime - handles multiple formats."""
-        formats = ['%m/%d/%Y', '%d/%m/%Y', '%Y-%m-%d', '%d-%m-%Y']
-        for fmt in formats:
+        if self._last_fmt is not None:
+            try:
+                return _parse_date_format(date_str, self._last_fmt)
+            except ValueError:
+                pass
+        for fmt in _DATE_FORMATS:
+            if fmt == self._last_fmt:
+                continue
             try:
-                return datetime.strptime(date_str, fmt)
+                # Cached, with slice-based fast paths for MM/DD/YYYY and YYYY-MM-DD
+                result = _parse_date_format(date_str, fmt)
             except ValueError:
                 continue
+            if fmt not in _UNMEMOIZED_FORMATS:
+                self._last_fmt = fmt
+            return result
         raise ValueError(f"Could not parse date: {date_str}")
     
     @staticmethod
@@ -39,7 +63,7 @@ class ForeignAssetsParser:
         """Parse monetary amount from string."""
         if not value:
             return 0.0
-        clean = str(value).replace('$', '').replace(',', '').strip()
+        clean = str(value).translate(_AMOUNT_STRIP).strip()
         try:
             return float(clean)
         except ValueError:
@@ -241,7 +265,7 @@ class ForeignAssetsParser:
                 # ESPP Section Format:
                 # Purchase Date, Symbol, Market Value, Deposit Date, Purchase Price, Holding Status, Shares Purchased, Available
                 if in_espp_section and len(row) >= 8:
-                    avail_str = row[-1].replace(',', '').replace('"', '').strip()
+                    avail_str = row[-1].translate(_QUOTED_COUNT_STRIP).strip()
                     if not avail_str.isdigit():
                         continue
                     available = int(avail_str)
@@ -249,7 +273,7 @@ class ForeignAssetsParser:
                         continue
                     
                     purchase_date = row[0].replace('"', '').strip()
-                    purchase_price_str = row[4].replace('"', '').replace('$', '').replace(',', '').strip()
+                    purchase_price_str = row[4].translate(_QUOTED_AMOUNT_STRIP).strip()
                     
                     try:
                         cost = float(purchase_price_str)
@@ -269,7 +293,7 @@ class ForeignAssetsParser:
                 # RSU Section Format:
                 # Award Date, Symbol, Award ID, Type, Market Value, N/A, Deposit Date, Vest Date, FMV, Shares, Available
                 elif in_rsu_section and len(row) >= 10:
-                    avail_str = row[-1].replace(',', '').replace('"', '').strip()
+                    avail_str = row[-1].translate(_QUOTED_COUNT_STRIP).strip()
                     if not avail_str.isdigit():
                         continue
                     available = int(avail_str)
@@ -282,7 +306,7 @@ class ForeignAssetsParser:
                         continue
                     
                     vest_date = row[7].replace('"', '').strip() if len(row) > 7 else ''
-                    fmv_str = row[8].replace('"', '').replace('$', '').replace(',', '').strip() if len(row) > 8 else '0'
+                    fmv_str = row[8].translate(_QUOTED_AMOUNT_STRIP).strip() if len(row) > 8 else '0'
                     
                     try:
                         cost = float(fmv_str)
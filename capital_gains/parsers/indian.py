@@ -6,7 +6,7 @@ for stocks and mutual funds, as well as Zerodha P&L reports.
 """
 
 from abc import ABC, abstractmethod
-from typing import Dict, Any, Optional
+from typing import Dict, Any, Iterable, Optional, Sequence, TextIO, Union, BinaryIO
 
 from ..models import IndianGains
 
@@ -22,23 +22,37 @@ except ImportError:
 class BaseIndianParser(ABC):
     """Abstract base class for Indian broker parsers."""
     
+    def __init__(self, out: Optional[TextIO] = None):
+        """
+        Initialize the parser.
+        
+        Args:
+            out: Stream for progress messages (defaults to sys.stdout)
+        """
+        self.out = out
+    
     @abstractmethod
-    def parse(self, filepath: str) -> IndianGains:
+    def parse(self, filepath: Union[str, BinaryIO]) -> IndianGains:
         """
         Parse the file and return capital gains data.
         
         Args:
-            filepath: Path to the Excel file
+            filepath: Path to the Excel file, or an open binary file
             
         Returns:
             IndianGains object with parsed data
         """
         pass
     
-    def _check_openpyxl(self, filepath: str) -> bool:
+    @staticmethod
+    def _display_name(filepath: Union[str, BinaryIO]) -> str:
+        """Name to show in messages for a path or an open file."""
+        return str(getattr(filepath, 'name', filepath))
+    
+    def _check_openpyxl(self, filepath: Union[str, BinaryIO]) -> bool:
         """Check if openpyxl is available."""
         if not OPENPYXL_AVAILABLE:
-            print(f"  [WARN] openpyxl not installed, cannot read {filepath}")
+            print(f"  [WARN] openpyxl not installed, cannot read {self._display_name(filepath)}", file=self.out)
             return False
         return True
 
@@ -66,12 +80,12 @@ class IndianStocksParser(BaseIndianParser):
         'Stamp Duty', 'Brokerage', 'DP Charges', 'Total GST'
     ]
     
-    def parse(self, filepath: str) -> IndianGains:
+    def parse(self, filepath: Union[str, BinaryIO]) -> IndianGains:
         """
         Parse Indian stocks capital gains report.
         
         Args:
-            filepath: Path to the Excel file
+            filepath: Path to the Excel file, or an open binary file
             
         Returns:
             IndianGains object with STCG, LTCG, transactions, and charges
@@ -116,11 +130,11 @@ class IndianStocksParser(BaseIndianParser):
             
             wb.close()
             
-            print(f"   [OK] Indian Stocks: STCG = Rs.{result.stcg:,.2f}, LTCG = Rs.{result.ltcg:,.2f}")
-            print(f"      {len(result.transactions)} transactions loaded")
+            print(f"   [OK] Indian Stocks: STCG = Rs.{result.stcg:,.2f}, LTCG = Rs.{result.ltcg:,.2f}", file=self.out)
+            print(f"      {len(result.transactions)} transactions loaded", file=self.out)
             
         except Exception as e:
-            print(f"   [ERROR] Error reading {filepath}: {e}")
+            print(f"   [ERROR] Error reading {self._display_name(filepath)}: {e}", file=self.out)
         
         return result
     
@@ -162,12 +176,12 @@ class IndianMutualFundsParser(BaseIndianParser):
     - Transaction section starting with "Scheme Name" header
     """
     
-    def parse(self, filepath: str) -> IndianGains:
+    def parse(self, filepath: Union[str, BinaryIO]) -> IndianGains:
         """
         Parse mutual funds capital gains report.
         
         Args:
-            filepath: Path to the Excel file
+            filepath: Path to the Excel file, or an open binary file
             
         Returns:
             IndianGains object with STCG, LTCG, and transactions
@@ -213,11 +227,11 @@ class IndianMutualFundsParser(BaseIndianParser):
             
             wb.close()
             
-            print(f"   [OK] Indian MFs: STCG = Rs.{result.stcg:,.2f}, LTCG = Rs.{result.ltcg:,.2f}")
-            print(f"      {len(result.transactions)} transactions loaded")
+            print(f"   [OK] Indian MFs: STCG = Rs.{result.stcg:,.2f}, LTCG = Rs.{result.ltcg:,.2f}", file=self.out)
+            print(f"      {len(result.transactions)} transactions loaded", file=self.out)
             
         except Exception as e:
-            print(f"   [ERROR] Error reading {filepath}: {e}")
+            print(f"   [ERROR] Error reading {self._display_name(filepath)}: {e}", file=self.out)
         
         return result
     
@@ -281,12 +295,12 @@ class ZerodhaPnLParser(BaseIndianParser):
         'IPFT': 'IPFT',
     }
     
-    def parse(self, filepath: str) -> IndianGains:
+    def parse(self, filepath: Union[str, BinaryIO]) -> IndianGains:
         """
         Parse Zerodha P&L report.
         
         Args:
-            filepath: Path to the Excel file
+            filepath: Path to the Excel file, or an open binary file
             
         Returns:
             IndianGains object with realized P&L and charges
@@ -298,79 +312,79 @@ class ZerodhaPnLParser(BaseIndianParser):
         
         try:
             wb = load_workbook(filepath, data_only=True)
-            ws = wb.active
+            self._parse_rows(wb.active.iter_rows(values_only=True), result)
+            wb.close()
+        except Exception as e:
+            print(f"   [ERROR] Error reading {self._display_name(filepath)}: {e}", file=self.out)
+        
+        return result
+    
+    def _parse_rows(self, rows: Iterable[Sequence[Any]], result: IndianGains) -> None:
+        """Fill result from the P&L report rows."""
+        in_charges_section = False
+        in_data_section = False
+        total_realized_pnl = 0.0
+        
+        for row in rows:
+            # Get values from the row (columns B and C in Excel = indices 1 and 2)
+            col_b = row[1] if len(row) > 1 else None
+            col_c = row[2] if len(row) > 2 else None
             
-            in_charges_section = False
-            in_data_section = False
-            total_realized_pnl = 0.0
+            # Parse summary "Realized P&L" value
+            if col_b == 'Realized P&L' and col_c is not None:
+                try:
+                    total_realized_pnl = float(col_c)
+                except (ValueError, TypeError):
+                    pass
             
-            for row in ws.iter_rows():
-                # Get values from the row (columns B and C in Excel = indices 1 and 2)
-                col_b = row[1].value if len(row) > 1 else None
-                col_c = row[2].value if len(row) > 2 else None
-                
-                # Parse summary "Realized P&L" value
-                if col_b == 'Realized P&L' and col_c is not None:
-                    try:
-                        total_realized_pnl = float(col_c)
-                    except (ValueError, TypeError):
-                        pass
-                
-                # Identify Charges section
-                if col_b == 'Charges' and col_c is None:
-                    in_charges_section = True
-                    continue
-                
-                # Parse individual charges
-                if in_charges_section and col_b in self.CHARGE_MAPPINGS:
-                    try:
-                        charge_value = float(col_c or 0)
-                        charge_name = self.CHARGE_MAPPINGS[col_b]
-                        result.charges[charge_name] = charge_value
-                    except (ValueError, TypeError):
-                        pass
-                
-                # Check for Account Head header to stay in charges section
-                if col_b == 'Account Head':
-                    continue
-                    
-                # End charges section when we hit empty rows or transaction header
-                if in_charges_section and col_b == 'Symbol':
-                    in_charges_section = False
-                    in_data_section = True
-                    continue
-                
-                # Parse transaction rows
-                if in_data_section and col_b and col_b != 'Symbol':
-                    txn = self._parse_transaction_row(row)
-                    if txn:
-                        result.transactions.append(txn)
-            
-            wb.close()
+            # Identify Charges section
+            if col_b == 'Charges' and (col_c is None or col_c == ''):
+                in_charges_section = True
+                continue
             
-            # Zerodha reports realized P&L without LTCG/STCG distinction
-            # We'll treat it all as STCG (conservative approach)
-            # The report includes both gains and losses in realized P&L
-            result.stcg = total_realized_pnl
-            result.ltcg = 0.0
+            # Parse individual charges
+            if in_charges_section and col_b in self.CHARGE_MAPPINGS:
+                try:
+                    charge_value = float(col_c or 0)
+                    charge_name = self.CHARGE_MAPPINGS[col_b]
+                    result.charges[charge_name] = charge_value
+                except (ValueError, TypeError):
+                    pass
             
-            print(f"   [OK] Zerodha Stocks: Realized P&L = Rs.{result.stcg:,.2f}")
-            print(f"      {len(result.transactions)} transactions loaded")
-            total_charges = sum(result.charges.values())
-            if total_charges > 0:
-                print(f"      Total charges: Rs.{total_charges:,.2f}")
+            # Check for Account Head header to stay in charges section
+            if col_b == 'Account Head':
+                continue
+                
+            # End charges section when we hit empty rows or transaction header
+            if in_charges_section and col_b == 'Symbol':
+                in_charges_section = False
+                in_data_section = True
+                continue
             
-        except Exception as e:
-            print(f"   [ERROR] Error reading {filepath}: {e}")
+            # Parse transaction rows
+            if in_data_section and col_b and col_b != 'Symbol':
+                txn = self._parse_transaction_row(row)
+                if txn:
+                    result.transactions.append(txn)
         
-        return result
+        # Zerodha reports realized P&L without LTCG/STCG distinction
+        # We'll treat it all as STCG (conservative approach)
+        # The report includes both gains and losses in realized P&L
+        result.stcg = total_realized_pnl
+        result.ltcg = 0.0
+        
+        print(f"   [OK] Zerodha Stocks: Realized P&L = Rs.{result.stcg:,.2f}", file=self.out)
+        print(f"      {len(result.transactions)} transactions loaded", file=self.out)
+        total_charges = sum(result.charges.values())
+        if total_charges > 0:
+            print(f"      Total charges: Rs.{total_charges:,.2f}", file=self.out)
     
-    def _parse_transaction_row(self, row) -> Optional[Dict[str, Any]]:
+    def _parse_transaction_row(self, row: Sequence[Any]) -> Optional[Dict[str, Any]]:
         """Parse a single transaction row from Zerodha P&L report."""
         try:
             # Skip rows without valid symbol or ISIN
-            symbol = row[1].value if len(row) > 1 else None
-            isin = row[2].value if len(row) > 2 else None
+            symbol = row[1] if len(row) > 1 else None
+            isin = row[2] if len(row) > 2 else None
             
             if not symbol or not isin:
                 return None
@@ -379,14 +393,14 @@ class ZerodhaPnLParser(BaseIndianParser):
             if symbol == 'Symbol' or isin == 'ISIN':
                 return None
             
-            quantity = float(row[3].value or 0) if len(row) > 3 and row[3].value else 0
-            buy_value = float(row[4].value or 0) if len(row) > 4 and row[4].value else 0
-            sell_value = float(row[5].value or 0) if len(row) > 5 and row[5].value else 0
-            realized_pnl = float(row[6].value or 0) if len(row) > 6 and row[6].value else 0
-            realized_pnl_pct = float(row[7].value or 0) if len(row) > 7 and row[7].value else 0
-            open_quantity = float(row[9].value or 0) if len(row) > 9 and row[9].value else 0
-            open_value = float(row[11].value or 0) if len(row) > 11 and row[11].value else 0
-            unrealized_pnl = float(row[12].value or 0) if len(row) > 12 and row[12].value else 0
+            quantity = float(row[3] or 0) if len(row) > 3 and row[3] else 0
+            buy_value = float(row[4] or 0) if len(row) > 4 and row[4] else 0
+            sell_value = float(row[5] or 0) if len(row) > 5 and row[5] else 0
+            realized_pnl = float(row[6] or 0) if len(row) > 6 and row[6] else 0
+            realized_pnl_pct = float(row[7] or 0) if len(row) > 7 and row[7] else 0
+            open_quantity = float(row[9] or 0) if len(row) > 9 and row[9] else 0
+            open_value = float(row[11] or 0) if len(row) > 11 and row[11] else 0
+            unrealized_pnl = float(row[12] or 0) if len(row) > 12 and row[12] else 0
             
             return {
                 'symbol': str(symbol),
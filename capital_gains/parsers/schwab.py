@@ -5,10 +5,23 @@ This module provides parsers for Schwab Equity Awards Center (EAC)
 and Individual Brokerage account transaction files.
 """
 
+import json
 from abc import ABC, abstractmethod
 from collections import defaultdict
 from datetime import datetime
-from typing import List, Dict
+from typing import BinaryIO, Iterable, List, Dict, Optional, TextIO
+
+try:
+    import ijson
+    IJSON_AVAILABLE = True
+except ImportError:
+    IJSON_AVAILABLE = False
+
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
 
 from ..models import SaleTransaction, StockLot
 from ..utils import parse_currency, parse_date
@@ -20,6 +33,21 @@ class BaseSchwabParser(ABC):
     # Foreign stocks use 2-year holding period for LTCG classification
     LONG_TERM_DAYS = 2 * 365  # >730 days = Long Term
     
+    # Top-level key holding the transaction list in the JSON export
+    JSON_KEY = ""
+    
+    # Whether parse() consumes records one at a time, so streaming them saves memory
+    STREAMS_RECORDS = True
+    
+    def __init__(self, out: Optional[TextIO] = None):
+        """
+        Initialize the parser.
+        
+        Args:
+            out: Stream for warnings (defaults to sys.stdout)
+        """
+        self.out = out
+    
     @abstractmethod
     def parse(self, transactions: List[Dict], start_date: datetime) -> List[SaleTransaction]:
         """
@@ -34,6 +62,28 @@ class BaseSchwabParser(ABC):
         """
         pass
     
+    def read_transactions(self, file_obj: BinaryIO, stream: bool = True) -> Iterable[Dict]:
+        """
+        Read the transaction records from an open Schwab JSON export.
+        
+        With stream set, ijson installed and a parser whose parse() is
+        lazy (STREAMS_RECORDS), records under JSON_KEY are yielded one at
+        a time and the document is never loaded as a whole; otherwise it
+        is decoded in one go (with orjson when available). The result can
+        be passed straight to parse().
+        
+        Args:
+            file_obj: Schwab JSON export opened in binary mode
+            stream: Whether to stream records when the parser supports it
+            
+        Returns:
+            Iterable of transaction dictionaries
+        """
+        if stream and self.STREAMS_RECORDS and IJSON_AVAILABLE:
+            return ijson.items(file_obj, f"{self.JSON_KEY}.item", use_float=True)
+        data = orjson.loads(file_obj.read()) if ORJSON_AVAILABLE else json.load(file_obj)
+        return data.get(self.JSON_KEY, [])
+    
     def _is_long_term(self, holding_days: int) -> bool:
         """Check if holding period qualifies as long-term."""
         return holding_days > self.LONG_TERM_DAYS
@@ -71,6 +121,8 @@ class SchwabEACParser(BaseSchwabParser):
     }
     """
     
+    JSON_KEY = "Transactions"
+    
     def parse(self, transactions: List[Dict], start_date: datetime) -> List[SaleTransaction]:
         """
         Parse EAC transactions and extract sale transactions.
@@ -211,6 +263,10 @@ class SchwabIndividualParser(BaseSchwabParser):
     }
     """
     
+    JSON_KEY = "BrokerageTransactions"
+    # parse() sorts every record for FIFO matching, so streaming wouldn't save memory
+    STREAMS_RECORDS = False
+    
     def parse(self, transactions: List[Dict], start_date: datetime) -> List[SaleTransaction]:
         """
         Parse Individual Brokerage transactions using FIFO matching.
@@ -337,7 +393,8 @@ class SchwabIndividualParser(BaseSchwabParser):
             print(
                 f"  Warning: {remaining_to_sell:.3f} shares of {symbol} sold on "
                 f"{sale_date.strftime('%d-%b-%Y')} have no matching purchase - "
-                "assuming older purchase with unknown cost basis"
+                "assuming older purchase with unknown cost basis",
+                file=self.out,
             )
         
         return sales
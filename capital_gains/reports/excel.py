@@ -9,17 +9,24 @@ from datetime import datetime
 from typing import List, Dict, Any
 
 from ..models import SaleTransaction, IndianGains, TaxData
-from ..utils import get_advance_tax_quarter, ADVANCE_TAX_QUARTERS
+from ..utils import bucket_by_quarter, ADVANCE_TAX_QUARTERS
 
 
-# Check if openpyxl is available
+# Check if xlsxwriter is available
 try:
-    from openpyxl import Workbook
-    from openpyxl.styles import Font, Alignment, Border, Side, PatternFill
-    from openpyxl.utils import get_column_letter
-    OPENPYXL_AVAILABLE = True
+    import xlsxwriter
+    XLSXWRITER_AVAILABLE = True
 except ImportError:
-    OPENPYXL_AVAILABLE = False
+    XLSXWRITER_AVAILABLE = False
+
+
+# Number formats
+USD_FORMAT = {'num_format': '$#,##0.00'}
+USD_PRICE_FORMAT = {'num_format': '$#,##0.0000'}
+RATE_FORMAT = {'num_format': '#,##0.0000'}
+INR_FORMAT = {'num_format': '₹#,##0.00'}
+DATE_FORMAT = {'num_format': 'DD-MMM-YYYY'}
+PERCENT_FORMAT = {'num_format': '0.00%'}
 
 
 class ExcelReporter:
@@ -34,31 +41,32 @@ class ExcelReporter:
     - Indian mutual funds (if data provided)
     - Indian stocks (if data provided)
     - Tax calculation
+    
+    Workbooks are written with xlsxwriter in constant_memory mode, so
+    each row is flushed to disk once the next one starts and memory
+    use stays flat however many transactions are exported. Every sheet
+    is therefore written strictly top to bottom.
     """
     
     def __init__(self):
         """Initialize reporter with styles."""
-        if not OPENPYXL_AVAILABLE:
-            return
-        
-        # Define styles
-        self.header_font = Font(bold=True, color="FFFFFF", size=11)
-        self.header_fill = PatternFill(start_color="4472C4", end_color="4472C4", fill_type="solid")
-        self.header_alignment = Alignment(horizontal="center", vertical="center", wrap_text=True)
-        
-        self.thin_border = Border(
-            left=Side(style='thin'),
-            right=Side(style='thin'),
-            top=Side(style='thin'),
-            bottom=Side(style='thin')
-        )
-        
-        self.ltcg_fill = PatternFill(start_color="C6EFCE", end_color="C6EFCE", fill_type="solid")
-        self.stcg_fill = PatternFill(start_color="FFEB9C", end_color="FFEB9C", fill_type="solid")
-        self.loss_fill = PatternFill(start_color="FFC7CE", end_color="FFC7CE", fill_type="solid")
-        
-        self.summary_font = Font(bold=True, size=12)
-        self.summary_fill = PatternFill(start_color="D9E1F2", end_color="D9E1F2", fill_type="solid")
+        # Define styles (combined into workbook formats by _fmt)
+        self.header_font = {'bold': True, 'font_color': '#FFFFFF', 'font_size': 11}
+        self.header_fill = {'bg_color': '#4472C4'}
+        self.header_alignment = {'align': 'center', 'valign': 'vcenter', 'text_wrap': True}
+        
+        self.thin_border = {'border': 1}
+        
+        self.ltcg_fill = {'bg_color': '#C6EFCE'}
+        self.stcg_fill = {'bg_color': '#FFEB9C'}
+        self.loss_fill = {'bg_color': '#FFC7CE'}
+        
+        self.bold = {'bold': True}
+        self.summary_font = {'bold': True, 'font_size': 12}
+        self.summary_fill = {'bg_color': '#D9E1F2'}
+        
+        self._workbook = None
+        self._formats: Dict[tuple, Any] = {}
     
     def export(
         self,
@@ -77,18 +85,24 @@ class ExcelReporter:
             exchange_rates: Dictionary of date -> rate
             indian_gains: List of Indian gains data
             tax_data: Tax calculation data
-            
+        
         Returns:
             True if export successful, False otherwise
         """
-        if not OPENPYXL_AVAILABLE:
-            print("\n[WARN] openpyxl not installed. Run: pip install openpyxl")
+        if not XLSXWRITER_AVAILABLE:
+            print("\n[WARN] xlsxwriter not installed. Run: pip install xlsxwriter")
             return False
         
         exchange_rates = exchange_rates or {}
         indian_gains = indian_gains or []
         
-        wb = Workbook()
+        wb = xlsxwriter.Workbook(filepath, {
+            'constant_memory': True,
+            'strings_to_numbers': False,
+            'nan_inf_to_errors': True,
+        })
+        self._workbook = wb
+        self._formats = {}
         
         # Create sheets
         self._create_summary_sheet(wb, transactions, indian_gains)
@@ -103,92 +117,87 @@ class ExcelReporter:
             self._create_tax_sheet(wb, tax_data, indian_gains)
         
         # Save workbook
-        wb.save(filepath)
+        wb.close()
+        self._workbook = None
         print(f"[OK] Excel exported to: {filepath}")
         return True
     
+    def _fmt(self, *styles: Dict[str, Any]):
+        """Get the workbook format combining the given styles (cached per workbook)."""
+        props = {}
+        for style in styles:
+            props.update(style)
+        key = tuple(sorted(props.items()))
+        fmt = self._formats.get(key)
+        if fmt is None:
+            fmt = self._formats[key] = self._workbook.add_format(props)
+        return fmt
+    
+    def _write(self, ws, row: int, col: int, value, *styles: Dict[str, Any]) -> None:
+        """Write a cell using 1-based row/column numbers."""
+        ws.write(row - 1, col - 1, value, self._fmt(*styles) if styles else None)
+    
+    def _merge(self, ws, row: int, first_col: int, last_col: int, value, *styles: Dict[str, Any]) -> None:
+        """Write a value across merged cells in one row (1-based)."""
+        ws.merge_range(row - 1, first_col - 1, row - 1, last_col - 1, value, self._fmt(*styles))
+    
     def _create_summary_sheet(self, wb, transactions, indian_gains):
         """Create the summary sheet."""
-        ws = wb.active
-        ws.title = "Summary"
+        ws = wb.add_worksheet("Summary")
         
         # Categorize transactions
         long_term = [t for t in transactions if t.is_long_term]
         short_term = [t for t in transactions if not t.is_long_term]
-        eac_txns = [t for t in transactions if t.source == "EAC"]
-        individual_txns = [t for t in transactions if t.source == "Individual"]
         
         # Capital Gains Classification
         row = 1
-        ws.cell(row=row, column=1, value="CAPITAL GAINS CLASSIFICATION").font = self.summary_font
-        ws.cell(row=row, column=1).fill = self.summary_fill
-        ws.merge_cells(f'A{row}:E{row}')
+        self._merge(ws, row, 1, 5, "CAPITAL GAINS CLASSIFICATION", self.summary_font, self.summary_fill)
         
         row += 1
-        for col, header in enumerate(["Category", "Transactions", "Shares", 
+        for col, header in enumerate(["Category", "Transactions", "Shares",
                                        "Capital Gain (USD)", "Capital Gain (INR)"], 1):
-            ws.cell(row=row, column=col, value=header).font = Font(bold=True)
-            ws.cell(row=row, column=col).border = self.thin_border
+            self._write(ws, row, col, header, self.bold, self.thin_border)
         
-        # Long Term row
-        row += 1
-        ws.cell(row=row, column=1, value="Foreign Stocks LTCG (> 2 years)")
-        ws.cell(row=row, column=2, value=len(long_term))
-        ws.cell(row=row, column=3, value=sum(t.shares for t in long_term))
-        ws.cell(row=row, column=4, value=sum(t.capital_gain_usd for t in long_term))
-        ws.cell(row=row, column=5, value=sum(t.capital_gain_inr for t in long_term))
-        ws.cell(row=row, column=4).number_format = '$#,##0.00'
-        ws.cell(row=row, column=5).number_format = '₹#,##0.00'
-        for col in range(1, 6):
-            ws.cell(row=row, column=col).fill = self.ltcg_fill
-            ws.cell(row=row, column=col).border = self.thin_border
-        
-        # Short Term row
-        row += 1
-        ws.cell(row=row, column=1, value="Foreign Stocks STCG (≤ 2 years)")
-        ws.cell(row=row, column=2, value=len(short_term))
-        ws.cell(row=row, column=3, value=sum(t.shares for t in short_term))
-        ws.cell(row=row, column=4, value=sum(t.capital_gain_usd for t in short_term))
-        ws.cell(row=row, column=5, value=sum(t.capital_gain_inr for t in short_term))
-        ws.cell(row=row, column=4).number_format = '$#,##0.00'
-        ws.cell(row=row, column=5).number_format = '₹#,##0.00'
-        for col in range(1, 6):
-            ws.cell(row=row, column=col).fill = self.stcg_fill
-            ws.cell(row=row, column=col).border = self.thin_border
+        # Long Term and Short Term rows
+        for label, txns, fill in (
+            ("Foreign Stocks LTCG (> 2 years)", long_term, self.ltcg_fill),
+            ("Foreign Stocks STCG (≤ 2 years)", short_term, self.stcg_fill),
+        ):
+            row += 1
+            self._write(ws, row, 1, label, fill, self.thin_border)
+            self._write(ws, row, 2, len(txns), fill, self.thin_border)
+            self._write(ws, row, 3, sum(t.shares for t in txns), fill, self.thin_border)
+            self._write(ws, row, 4, sum(t.capital_gain_usd for t in txns), USD_FORMAT, fill, self.thin_border)
+            self._write(ws, row, 5, sum(t.capital_gain_inr for t in txns), INR_FORMAT, fill, self.thin_border)
         
         # Total row
         row += 1
-        ws.cell(row=row, column=1, value="TOTAL FOREIGN STOCKS").font = Font(bold=True)
-        ws.cell(row=row, column=2, value=len(transactions)).font = Font(bold=True)
-        ws.cell(row=row, column=3, value=sum(t.shares for t in transactions)).font = Font(bold=True)
-        ws.cell(row=row, column=4, value=sum(t.capital_gain_usd for t in transactions)).font = Font(bold=True)
-        ws.cell(row=row, column=5, value=sum(t.capital_gain_inr for t in transactions)).font = Font(bold=True)
-        ws.cell(row=row, column=4).number_format = '$#,##0.00'
-        ws.cell(row=row, column=5).number_format = '₹#,##0.00'
-        for col in range(1, 6):
-            ws.cell(row=row, column=col).border = self.thin_border
+        self._write(ws, row, 1, "TOTAL FOREIGN STOCKS", self.bold, self.thin_border)
+        self._write(ws, row, 2, len(transactions), self.bold, self.thin_border)
+        self._write(ws, row, 3, sum(t.shares for t in transactions), self.bold, self.thin_border)
+        self._write(ws, row, 4, sum(t.capital_gain_usd for t in transactions),
+                    USD_FORMAT, self.bold, self.thin_border)
+        self._write(ws, row, 5, sum(t.capital_gain_inr for t in transactions),
+                    INR_FORMAT, self.bold, self.thin_border)
         
         # Add Indian investments section
         self._add_indian_summary(ws, row + 2, indian_gains, long_term, short_term)
         
         # Column widths
-        ws.column_dimensions['A'].width = 30
-        ws.column_dimensions['B'].width = 15
-        ws.column_dimensions['C'].width = 15
-        ws.column_dimensions['D'].width = 20
-        ws.column_dimensions['E'].width = 20
+        ws.set_column('A:A', 30)
+        ws.set_column('B:B', 15)
+        ws.set_column('C:C', 15)
+        ws.set_column('D:D', 20)
+        ws.set_column('E:E', 20)
     
     def _add_indian_summary(self, ws, start_row, indian_gains, long_term, short_term):
         """Add Indian investments summary to the sheet."""
         row = start_row
-        ws.cell(row=row, column=1, value="INDIAN INVESTMENTS").font = self.summary_font
-        ws.cell(row=row, column=1).fill = self.summary_fill
-        ws.merge_cells(f'A{row}:D{row}')
+        self._merge(ws, row, 1, 4, "INDIAN INVESTMENTS", self.summary_font, self.summary_fill)
         
         row += 1
         for col, header in enumerate(["Source", "LTCG (INR)", "STCG (INR)", "Total (INR)"], 1):
-            ws.cell(row=row, column=col, value=header).font = Font(bold=True)
-            ws.cell(row=row, column=col).border = self.thin_border
+            self._write(ws, row, col, header, self.bold, self.thin_border)
         
         # Add row for each Indian source
         indian_ltcg_total = 0.0
@@ -198,37 +207,25 @@ class ExcelReporter:
             row += 1
             # Map source names to display names
             display_name = self._get_indian_source_display_name(gains.source)
-            ws.cell(row=row, column=1, value=display_name)
-            ws.cell(row=row, column=2, value=gains.ltcg)
-            ws.cell(row=row, column=3, value=gains.stcg)
-            ws.cell(row=row, column=4, value=gains.total)
+            self._write(ws, row, 1, display_name, self.thin_border)
+            
+            for col, value in enumerate((gains.ltcg, gains.stcg, gains.total), 2):
+                # Color code based on gain/loss
+                fill = self.loss_fill if value < 0 else {}
+                self._write(ws, row, col, value, INR_FORMAT, fill, self.thin_border)
             
             indian_ltcg_total += gains.ltcg
             indian_stcg_total += gains.stcg
-            
-            for col in range(2, 5):
-                ws.cell(row=row, column=col).number_format = '₹#,##0.00'
-                # Color code based on gain/loss
-                value = ws.cell(row=row, column=col).value
-                if value < 0:
-                    ws.cell(row=row, column=col).fill = self.loss_fill
-            for col in range(1, 5):
-                ws.cell(row=row, column=col).border = self.thin_border
         
         # Indian Total row
         if len(indian_gains) > 1:
             row += 1
-            ws.cell(row=row, column=1, value="Total Indian Investments").font = Font(bold=True)
-            ws.cell(row=row, column=2, value=indian_ltcg_total).font = Font(bold=True)
-            ws.cell(row=row, column=3, value=indian_stcg_total).font = Font(bold=True)
-            ws.cell(row=row, column=4, value=indian_ltcg_total + indian_stcg_total).font = Font(bold=True)
-            for col in range(2, 5):
-                ws.cell(row=row, column=col).number_format = '₹#,##0.00'
-            for col in range(1, 5):
-                ws.cell(row=row, column=col).border = self.thin_border
-                ws.cell(row=row, column=col).fill = PatternFill(
-                    start_color="D9E1F2", end_color="D9E1F2", fill_type="solid"
-                )
+            total_fill = {'bg_color': '#D9E1F2'}
+            self._write(ws, row, 1, "Total Indian Investments", self.bold, self.thin_border, total_fill)
+            for col, value in enumerate(
+                (indian_ltcg_total, indian_stcg_total, indian_ltcg_total + indian_stcg_total), 2
+            ):
+                self._write(ws, row, col, value, INR_FORMAT, self.bold, self.thin_border, total_fill)
         
         # Grand Total (All Sources)
         row += 2
@@ -237,17 +234,11 @@ class ExcelReporter:
         grand_ltcg = schwab_ltcg + indian_ltcg_total
         grand_stcg = schwab_stcg + indian_stcg_total
         
-        ws.cell(row=row, column=1, value="GRAND TOTAL (ALL SOURCES)").font = Font(bold=True, size=12)
-        ws.cell(row=row, column=2, value=grand_ltcg).font = Font(bold=True, size=12)
-        ws.cell(row=row, column=3, value=grand_stcg).font = Font(bold=True, size=12)
-        ws.cell(row=row, column=4, value=grand_ltcg + grand_stcg).font = Font(bold=True, size=12)
-        for col in range(2, 5):
-            ws.cell(row=row, column=col).number_format = '₹#,##0.00'
-        for col in range(1, 5):
-            ws.cell(row=row, column=col).border = self.thin_border
-            ws.cell(row=row, column=col).fill = PatternFill(
-                start_color="E2EFDA", end_color="E2EFDA", fill_type="solid"
-            )
+        grand_font = {'bold': True, 'font_size': 12}
+        grand_fill = {'bg_color': '#E2EFDA'}
+        self._write(ws, row, 1, "GRAND TOTAL (ALL SOURCES)", grand_font, self.thin_border, grand_fill)
+        for col, value in enumerate((grand_ltcg, grand_stcg, grand_ltcg + grand_stcg), 2):
+            self._write(ws, row, col, value, INR_FORMAT, grand_font, self.thin_border, grand_fill)
     
     def _get_indian_source_display_name(self, source: str) -> str:
         """Get display name for Indian investment sources."""
@@ -260,7 +251,7 @@ class ExcelReporter:
     
     def _create_transactions_sheet(self, wb, transactions):
         """Create the transactions sheet."""
-        ws = wb.create_sheet("Schwab Foreign Stocks")
+        ws = wb.add_worksheet("Schwab Foreign Stocks")
         
         headers = [
             'S.No', 'Source', 'Sale Date', 'Acquisition Date', 'Type', 'Symbol', 'Grant ID',
@@ -274,13 +265,21 @@ class ExcelReporter:
         ]
         
         for col, header in enumerate(headers, 1):
-            cell = ws.cell(row=1, column=col, value=header)
-            cell.font = self.header_font
-            cell.fill = self.header_fill
-            cell.alignment = self.header_alignment
-            cell.border = self.thin_border
-        
-        ws.freeze_panes = 'A2'
+            self._write(ws, 1, col, header, self.header_font, self.header_fill,
+                        self.header_alignment, self.thin_border)
+        
+        ws.freeze_panes(1, 0)
+        
+        # Number formats by column
+        column_formats = {}
+        for col_idx in (12, 13, 20):
+            column_formats[col_idx] = USD_PRICE_FORMAT
+        for col_idx in (14, 15):
+            column_formats[col_idx] = RATE_FORMAT
+        for col_idx in (16, 17, 18, 19, 21, 23):
+            column_formats[col_idx] = INR_FORMAT
+        for col_idx in (3, 4):
+            column_formats[col_idx] = DATE_FORMAT
         
         # Sort and add data
         sorted_txns = sorted(transactions, key=lambda x: (x.sale_date, x.symbol))
@@ -299,20 +298,6 @@ class ExcelReporter:
                 txn.capital_gain_usd, txn.capital_gain_inr
             ]
             
-            for col_idx, value in enumerate(row_data, 1):
-                cell = ws.cell(row=row_idx, column=col_idx, value=value)
-                cell.border = self.thin_border
-                
-                # Number formats
-                if col_idx in [12, 13, 20]:
-                    cell.number_format = '$#,##0.0000'
-                elif col_idx in [14, 15]:
-                    cell.number_format = '#,##0.0000'
-                elif col_idx in [16, 17, 18, 19, 21, 23]:
-                    cell.number_format = '₹#,##0.00'
-                elif col_idx in [3, 4]:
-                    cell.number_format = 'DD-MMM-YYYY'
-            
             # Color code
             if txn.capital_gain_inr < 0:
                 fill = self.loss_fill
@@ -321,65 +306,51 @@ class ExcelReporter:
             else:
                 fill = self.stcg_fill
             
-            ws.cell(row=row_idx, column=11).fill = fill
-            ws.cell(row=row_idx, column=23).fill = fill
+            for col_idx, value in enumerate(row_data, 1):
+                cell_fill = fill if col_idx in (11, 23) else {}
+                self._write(ws, row_idx, col_idx, value,
+                            column_formats.get(col_idx, {}), cell_fill, self.thin_border)
         
         # Totals row
         total_row = len(sorted_txns) + 2
-        ws.cell(row=total_row, column=1, value="TOTAL").font = Font(bold=True)
-        ws.cell(row=total_row, column=8, value=sum(t.shares for t in transactions)).font = Font(bold=True)
-        ws.cell(row=total_row, column=22, value=sum(t.capital_gain_usd for t in transactions)).font = Font(bold=True)
-        ws.cell(row=total_row, column=23, value=sum(t.capital_gain_inr for t in transactions)).font = Font(bold=True)
-        ws.cell(row=total_row, column=22).number_format = '$#,##0.00'
-        ws.cell(row=total_row, column=23).number_format = '₹#,##0.00'
+        self._write(ws, total_row, 1, "TOTAL", self.bold)
+        self._write(ws, total_row, 8, sum(t.shares for t in transactions), self.bold)
+        self._write(ws, total_row, 22, sum(t.capital_gain_usd for t in transactions), USD_FORMAT, self.bold)
+        self._write(ws, total_row, 23, sum(t.capital_gain_inr for t in transactions), INR_FORMAT, self.bold)
         
         # Column widths
         widths = [6, 12, 14, 14, 8, 8, 10, 10, 12, 12, 14, 16, 18, 16, 18, 16, 18, 18, 20, 14, 16, 18, 20]
-        for col_idx, width in enumerate(widths, 1):
-            ws.column_dimensions[get_column_letter(col_idx)].width = width
+        for col_idx, width in enumerate(widths):
+            ws.set_column(col_idx, col_idx, width)
     
     def _create_exchange_rates_sheet(self, wb, exchange_rates):
         """Create exchange rates sheet."""
-        ws = wb.create_sheet("Exchange Rates")
+        ws = wb.add_worksheet("Exchange Rates")
         
-        ws['A1'] = "Date"
-        ws['B1'] = "USD-INR Rate"
-        ws['C1'] = "Source"
-        for col in ['A', 'B', 'C']:
-            ws[f'{col}1'].font = self.header_font
-            ws[f'{col}1'].fill = self.header_fill
+        for col, header in enumerate(["Date", "USD-INR Rate", "Source"], 1):
+            self._write(ws, 1, col, header, self.header_font, self.header_fill)
         
         row = 2
         for date_str in sorted(exchange_rates.keys()):
-            ws.cell(row=row, column=1, value=datetime.strptime(date_str, '%Y-%m-%d'))
-            ws.cell(row=row, column=1).number_format = 'DD-MMM-YYYY'
-            ws.cell(row=row, column=2, value=exchange_rates[date_str])
-            ws.cell(row=row, column=2).number_format = '#,##0.0000'
-            ws.cell(row=row, column=3, value="SBI TT Buy Rate")
+            self._write(ws, row, 1, datetime.strptime(date_str, '%Y-%m-%d'), DATE_FORMAT)
+            self._write(ws, row, 2, exchange_rates[date_str], RATE_FORMAT)
+            self._write(ws, row, 3, "SBI TT Buy Rate")
             row += 1
         
-        ws.column_dimensions['A'].width = 15
-        ws.column_dimensions['B'].width = 15
-        ws.column_dimensions['C'].width = 20
+        ws.set_column('A:A', 15)
+        ws.set_column('B:B', 15)
+        ws.set_column('C:C', 20)
     
     def _create_quarterly_sheet(self, wb, transactions, indian_gains):
         """Create quarterly breakdown sheet."""
-        ws = wb.create_sheet("Quarterly Breakdown")
+        ws = wb.add_worksheet("Quarterly Breakdown")
         quarters = ADVANCE_TAX_QUARTERS
         
         # Calculate foreign data
-        foreign_data = {q: {'ltcg': 0.0, 'stcg': 0.0} for q in quarters}
-        for txn in transactions:
-            quarter = get_advance_tax_quarter(txn.sale_date)
-            if quarter in foreign_data:
-                if txn.is_long_term:
-                    foreign_data[quarter]['ltcg'] += txn.capital_gain_inr
-                else:
-                    foreign_data[quarter]['stcg'] += txn.capital_gain_inr
+        foreign_data = bucket_by_quarter(transactions)
         
         # Title
-        ws.cell(row=1, column=1, value="CAPITAL GAINS - QUARTERLY BREAKDOWN").font = Font(bold=True, size=14)
-        ws.merge_cells('A1:G1')
+        self._merge(ws, 1, 1, 7, "CAPITAL GAINS - QUARTERLY BREAKDOWN", {'bold': True, 'font_size': 14})
         
         self._add_quarterly_table(ws, 3, "FOREIGN STOCKS (Schwab)", foreign_data, quarters)
     
@@ -387,61 +358,38 @@ class ExcelReporter:
         """Add a quarterly breakdown table."""
         row = start_row
         
-        ws.cell(row=row, column=1, value=title).font = Font(bold=True, size=12)
-        ws.cell(row=row, column=1).fill = self.summary_fill
-        ws.merge_cells(f'A{row}:G{row}')
+        self._merge(ws, row, 1, 7, title, {'bold': True, 'font_size': 12}, self.summary_fill)
         row += 1
         
         # Headers
-        ws.cell(row=row, column=1, value="Sl").font = self.header_font
-        ws.cell(row=row, column=2, value="Type").font = self.header_font
+        header_style = (self.header_font, self.header_fill, self.thin_border)
+        self._write(ws, row, 1, "Sl", *header_style)
+        self._write(ws, row, 2, "Type", *header_style)
         for i, q in enumerate(quarters, 3):
-            ws.cell(row=row, column=i, value=q).font = self.header_font
-        for col in range(1, 8):
-            ws.cell(row=row, column=col).fill = self.header_fill
-            ws.cell(row=row, column=col).border = self.thin_border
+            self._write(ws, row, i, q, *header_style)
         row += 1
         
-        # LTCG row
-        ws.cell(row=row, column=1, value=1)
-        ws.cell(row=row, column=2, value="Long Term Capital Gain (LTCG)")
-        for i, q in enumerate(quarters, 3):
-            ws.cell(row=row, column=i, value=data[q]['ltcg'])
-            ws.cell(row=row, column=i).number_format = '₹#,##0.00'
-            ws.cell(row=row, column=i).fill = self.ltcg_fill
-            ws.cell(row=row, column=i).border = self.thin_border
-        ws.cell(row=row, column=1).border = self.thin_border
-        ws.cell(row=row, column=2).border = self.thin_border
-        row += 1
-        
-        # STCG row
-        ws.cell(row=row, column=1, value=2)
-        ws.cell(row=row, column=2, value="Short Term Capital Gain (STCG)")
-        for i, q in enumerate(quarters, 3):
-            ws.cell(row=row, column=i, value=data[q]['stcg'])
-            ws.cell(row=row, column=i).number_format = '₹#,##0.00'
-            ws.cell(row=row, column=i).fill = self.stcg_fill
-            ws.cell(row=row, column=i).border = self.thin_border
-        ws.cell(row=row, column=1).border = self.thin_border
-        ws.cell(row=row, column=2).border = self.thin_border
-        row += 1
+        # LTCG and STCG rows
+        for sl, (label, key, fill) in enumerate((
+            ("Long Term Capital Gain (LTCG)", 'ltcg', self.ltcg_fill),
+            ("Short Term Capital Gain (STCG)", 'stcg', self.stcg_fill),
+        ), 1):
+            self._write(ws, row, 1, sl, self.thin_border)
+            self._write(ws, row, 2, label, self.thin_border)
+            for i, q in enumerate(quarters, 3):
+                self._write(ws, row, i, getattr(data[q], key), INR_FORMAT, fill, self.thin_border)
+            row += 1
         
         # Total row
-        ws.cell(row=row, column=2, value="TOTAL").font = Font(bold=True)
+        self._write(ws, row, 1, "", self.thin_border)
+        self._write(ws, row, 2, "TOTAL", self.bold, self.thin_border)
         for i, q in enumerate(quarters, 3):
-            total = data[q]['ltcg'] + data[q]['stcg']
-            ws.cell(row=row, column=i, value=total)
-            ws.cell(row=row, column=i).number_format = '₹#,##0.00'
-            ws.cell(row=row, column=i).font = Font(bold=True)
-            ws.cell(row=row, column=i).border = self.thin_border
-        ws.cell(row=row, column=1).border = self.thin_border
-        ws.cell(row=row, column=2).border = self.thin_border
+            self._write(ws, row, i, data[q].total, INR_FORMAT, self.bold, self.thin_border)
         
         # Column widths
-        ws.column_dimensions['A'].width = 6
-        ws.column_dimensions['B'].width = 32
-        for i in range(3, 8):
-            ws.column_dimensions[get_column_letter(i)].width = 16
+        ws.set_column('A:A', 6)
+        ws.set_column('B:B', 32)
+        ws.set_column('C:G', 16)
         
         return row + 2
     
@@ -450,109 +398,78 @@ class ExcelReporter:
         for gains in indian_gains:
             display_name = self._get_indian_source_display_name(gains.source)
             sheet_name = display_name[:31]  # Excel sheet names max 31 chars
+            suffix = 0
+            while wb.get_worksheet_by_name(sheet_name) is not None:
+                # Repeated source: number it instead of failing the export
+                suffix += 1
+                sheet_name = f"{display_name[:31 - len(str(suffix))]}{suffix}"
             
-            ws = wb.create_sheet(sheet_name)
+            ws = wb.add_worksheet(sheet_name)
             
             # Title
             title = f"{display_name.upper()} - CAPITAL GAINS"
-            ws.cell(row=1, column=1, value=title).font = Font(bold=True, size=14)
-            ws.merge_cells('A1:D1')
+            self._merge(ws, 1, 1, 4, title, {'bold': True, 'font_size': 14})
             
             # Summary section
-            ws.cell(row=3, column=1, value="Category")
-            ws.cell(row=3, column=2, value="Amount (INR)")
-            ws.cell(row=3, column=1).font = Font(bold=True)
-            ws.cell(row=3, column=2).font = Font(bold=True)
-            ws.cell(row=3, column=1).fill = self.header_fill
-            ws.cell(row=3, column=2).fill = self.header_fill
-            ws.cell(row=3, column=1).font = self.header_font
-            ws.cell(row=3, column=2).font = self.header_font
+            self._write(ws, 3, 1, "Category", self.header_font, self.header_fill)
+            self._write(ws, 3, 2, "Amount (INR)", self.header_font, self.header_fill)
             
             # LTCG row
-            ws.cell(row=4, column=1, value="Long Term Capital Gain (LTCG)")
-            ws.cell(row=4, column=2, value=gains.ltcg)
-            ws.cell(row=4, column=2).number_format = '₹#,##0.00'
-            ws.cell(row=4, column=2).fill = self.ltcg_fill if gains.ltcg >= 0 else self.loss_fill
-            ws.cell(row=4, column=1).border = self.thin_border
-            ws.cell(row=4, column=2).border = self.thin_border
+            self._write(ws, 4, 1, "Long Term Capital Gain (LTCG)", self.thin_border)
+            self._write(ws, 4, 2, gains.ltcg, INR_FORMAT, self.thin_border,
+                        self.ltcg_fill if gains.ltcg >= 0 else self.loss_fill)
             
             # STCG row
-            ws.cell(row=5, column=1, value="Short Term Capital Gain (STCG)")
-            ws.cell(row=5, column=2, value=gains.stcg)
-            ws.cell(row=5, column=2).number_format = '₹#,##0.00'
-            ws.cell(row=5, column=2).fill = self.stcg_fill if gains.stcg >= 0 else self.loss_fill
-            ws.cell(row=5, column=1).border = self.thin_border
-            ws.cell(row=5, column=2).border = self.thin_border
+            self._write(ws, 5, 1, "Short Term Capital Gain (STCG)", self.thin_border)
+            self._write(ws, 5, 2, gains.stcg, INR_FORMAT, self.thin_border,
+                        self.stcg_fill if gains.stcg >= 0 else self.loss_fill)
             
             # Total row
-            ws.cell(row=6, column=1, value="TOTAL").font = Font(bold=True)
-            ws.cell(row=6, column=2, value=gains.total).font = Font(bold=True)
-            ws.cell(row=6, column=2).number_format = '₹#,##0.00'
-            ws.cell(row=6, column=1).border = self.thin_border
-            ws.cell(row=6, column=2).border = self.thin_border
             total_fill = self.ltcg_fill if gains.total >= 0 else self.loss_fill
-            ws.cell(row=6, column=2).fill = total_fill
+            self._write(ws, 6, 1, "TOTAL", self.bold, self.thin_border)
+            self._write(ws, 6, 2, gains.total, INR_FORMAT, self.bold, self.thin_border, total_fill)
             
             # Charges section (if available)
             if gains.charges:
                 row = 8
-                ws.cell(row=row, column=1, value="CHARGES BREAKDOWN").font = Font(bold=True, size=12)
-                ws.cell(row=row, column=1).fill = self.summary_fill
-                ws.merge_cells(f'A{row}:B{row}')
+                self._merge(ws, row, 1, 2, "CHARGES BREAKDOWN", {'bold': True, 'font_size': 12}, self.summary_fill)
                 row += 1
                 
-                ws.cell(row=row, column=1, value="Charge Type").font = Font(bold=True)
-                ws.cell(row=row, column=2, value="Amount (INR)").font = Font(bold=True)
-                ws.cell(row=row, column=1).fill = self.header_fill
-                ws.cell(row=row, column=2).fill = self.header_fill
-                ws.cell(row=row, column=1).font = self.header_font
-                ws.cell(row=row, column=2).font = self.header_font
+                self._write(ws, row, 1, "Charge Type", self.header_font, self.header_fill)
+                self._write(ws, row, 2, "Amount (INR)", self.header_font, self.header_fill)
                 row += 1
                 
                 total_charges = 0.0
                 for charge_name, charge_value in gains.charges.items():
                     if charge_value > 0:
-                        ws.cell(row=row, column=1, value=charge_name)
-                        ws.cell(row=row, column=2, value=charge_value)
-                        ws.cell(row=row, column=2).number_format = '₹#,##0.00'
-                        ws.cell(row=row, column=1).border = self.thin_border
-                        ws.cell(row=row, column=2).border = self.thin_border
+                        self._write(ws, row, 1, charge_name, self.thin_border)
+                        self._write(ws, row, 2, charge_value, INR_FORMAT, self.thin_border)
                         total_charges += charge_value
                         row += 1
                 
-                ws.cell(row=row, column=1, value="TOTAL CHARGES").font = Font(bold=True)
-                ws.cell(row=row, column=2, value=total_charges).font = Font(bold=True)
-                ws.cell(row=row, column=2).number_format = '₹#,##0.00'
-                ws.cell(row=row, column=1).border = self.thin_border
-                ws.cell(row=row, column=2).border = self.thin_border
+                self._write(ws, row, 1, "TOTAL CHARGES", self.bold, self.thin_border)
+                self._write(ws, row, 2, total_charges, INR_FORMAT, self.bold, self.thin_border)
             
             # Transactions section (if available)
             if gains.transactions:
                 self._add_indian_transactions_table(ws, gains)
             
-            ws.column_dimensions['A'].width = 35
-            ws.column_dimensions['B'].width = 20
+            ws.set_column('A:A', 35)
+            ws.set_column('B:B', 20)
     
     def _add_indian_transactions_table(self, ws, gains):
         """Add transactions table for Indian investments."""
         # Find the starting row (after charges or summary)
         start_row = 8 if not gains.charges else 8 + len([c for c in gains.charges.values() if c > 0]) + 4
         
-        ws.cell(row=start_row, column=1, value="TRANSACTIONS DETAIL").font = Font(bold=True, size=12)
-        ws.cell(row=start_row, column=1).fill = self.summary_fill
+        self._write(ws, start_row, 1, "TRANSACTIONS DETAIL", {'bold': True, 'font_size': 12}, self.summary_fill)
         
         # Determine columns based on source type
         if 'Zerodha' in gains.source:
             headers = ['Symbol', 'ISIN', 'Quantity', 'Buy Value', 'Sell Value', 'Realized P&L', 'P&L %']
-            start_row += 1
-            for col, header in enumerate(headers, 1):
-                ws.cell(row=start_row, column=col, value=header)
-                ws.cell(row=start_row, column=col).font = self.header_font
-                ws.cell(row=start_row, column=col).fill = self.header_fill
-                ws.cell(row=start_row, column=col).border = self.thin_border
-            
-            for i, txn in enumerate(gains.transactions, start_row + 1):
-                row_data = [
+            column_formats = {4: INR_FORMAT, 5: INR_FORMAT, 6: INR_FORMAT, 7: PERCENT_FORMAT}
+            rows = (
+                ([
                     txn.get('symbol', ''),
                     txn.get('isin', ''),
                     txn.get('quantity', 0),
@@ -560,38 +477,15 @@ class ExcelReporter:
                     txn.get('sell_value', 0),
                     txn.get('realized_pnl', 0),
                     txn.get('realized_pnl_pct', 0),
-                ]
-                for col, value in enumerate(row_data, 1):
-                    ws.cell(row=i, column=col, value=value)
-                    ws.cell(row=i, column=col).border = self.thin_border
-                    if col in [4, 5, 6]:
-                        ws.cell(row=i, column=col).number_format = '₹#,##0.00'
-                    elif col == 7:
-                        ws.cell(row=i, column=col).number_format = '0.00%'
-                
-                # Color code based on P&L
-                pnl = txn.get('realized_pnl', 0)
-                fill = self.ltcg_fill if pnl >= 0 else self.loss_fill
-                ws.cell(row=i, column=6).fill = fill
-            
-            # Expand columns for transaction detail
-            ws.column_dimensions['C'].width = 12
-            ws.column_dimensions['D'].width = 18
-            ws.column_dimensions['E'].width = 18
-            ws.column_dimensions['F'].width = 18
-            ws.column_dimensions['G'].width = 12
+                ], 6, txn.get('realized_pnl', 0))
+                for txn in gains.transactions
+            )
         
         elif 'Mutual Funds' in gains.source:
             headers = ['Scheme Name', 'Category', 'Folio', 'Purchase Date', 'Redeem Date', 'STCG', 'LTCG']
-            start_row += 1
-            for col, header in enumerate(headers, 1):
-                ws.cell(row=start_row, column=col, value=header)
-                ws.cell(row=start_row, column=col).font = self.header_font
-                ws.cell(row=start_row, column=col).fill = self.header_fill
-                ws.cell(row=start_row, column=col).border = self.thin_border
-            
-            for i, txn in enumerate(gains.transactions, start_row + 1):
-                row_data = [
+            column_formats = {6: INR_FORMAT, 7: INR_FORMAT}
+            rows = (
+                ([
                     txn.get('scheme_name', ''),
                     txn.get('category', ''),
                     txn.get('folio', ''),
@@ -599,31 +493,15 @@ class ExcelReporter:
                     txn.get('redeem_date', ''),
                     txn.get('stcg', 0),
                     txn.get('ltcg', 0),
-                ]
-                for col, value in enumerate(row_data, 1):
-                    ws.cell(row=i, column=col, value=value)
-                    ws.cell(row=i, column=col).border = self.thin_border
-                    if col in [6, 7]:
-                        ws.cell(row=i, column=col).number_format = '₹#,##0.00'
-            
-            ws.column_dimensions['A'].width = 40
-            ws.column_dimensions['C'].width = 12
-            ws.column_dimensions['D'].width = 14
-            ws.column_dimensions['E'].width = 14
-            ws.column_dimensions['F'].width = 16
-            ws.column_dimensions['G'].width = 16
+                ], None, 0)
+                for txn in gains.transactions
+            )
         
         else:  # Indian Stocks (Groww)
             headers = ['Stock Name', 'ISIN', 'Section', 'Buy Date', 'Sell Date', 'Quantity', 'P&L']
-            start_row += 1
-            for col, header in enumerate(headers, 1):
-                ws.cell(row=start_row, column=col, value=header)
-                ws.cell(row=start_row, column=col).font = self.header_font
-                ws.cell(row=start_row, column=col).fill = self.header_fill
-                ws.cell(row=start_row, column=col).border = self.thin_border
-            
-            for i, txn in enumerate(gains.transactions, start_row + 1):
-                row_data = [
+            column_formats = {7: INR_FORMAT}
+            rows = (
+                ([
                     txn.get('stock_name', ''),
                     txn.get('isin', ''),
                     txn.get('section', ''),
@@ -631,32 +509,49 @@ class ExcelReporter:
                     txn.get('sell_date', ''),
                     txn.get('quantity', 0),
                     txn.get('pnl', 0),
-                ]
-                for col, value in enumerate(row_data, 1):
-                    ws.cell(row=i, column=col, value=value)
-                    ws.cell(row=i, column=col).border = self.thin_border
-                    if col == 7:
-                        ws.cell(row=i, column=col).number_format = '₹#,##0.00'
-                        pnl = txn.get('pnl', 0)
-                        fill = self.ltcg_fill if pnl >= 0 else self.loss_fill
-                        ws.cell(row=i, column=col).fill = fill
-            
-            ws.column_dimensions['A'].width = 30
-            ws.column_dimensions['D'].width = 14
-            ws.column_dimensions['E'].width = 14
-            ws.column_dimensions['G'].width = 16
+                ], 7, txn.get('pnl', 0))
+                for txn in gains.transactions
+            )
+        
+        start_row += 1
+        for col, header in enumerate(headers, 1):
+            self._write(ws, start_row, col, header, self.header_font, self.header_fill, self.thin_border)
+        
+        # Rows carry the column to color code and the P&L deciding its color
+        for i, (row_data, pnl_col, pnl) in enumerate(rows, start_row + 1):
+            pnl_fill = self.ltcg_fill if pnl >= 0 else self.loss_fill
+            for col, value in enumerate(row_data, 1):
+                self._write(ws, i, col, value, column_formats.get(col, {}),
+                            pnl_fill if col == pnl_col else {}, self.thin_border)
+        
+        # Expand columns for transaction detail
+        if 'Zerodha' in gains.source:
+            ws.set_column('C:C', 12)
+            ws.set_column('D:D', 18)
+            ws.set_column('E:E', 18)
+            ws.set_column('F:F', 18)
+            ws.set_column('G:G', 12)
+        elif 'Mutual Funds' in gains.source:
+            ws.set_column('A:A', 40)
+            ws.set_column('C:C', 12)
+            ws.set_column('D:D', 14)
+            ws.set_column('E:E', 14)
+            ws.set_column('F:F', 16)
+            ws.set_column('G:G', 16)
+        else:
+            ws.set_column('A:A', 30)
+            ws.set_column('D:D', 14)
+            ws.set_column('E:E', 14)
+            ws.set_column('G:G', 16)
     
     def _create_tax_sheet(self, wb, tax_data: TaxData, indian_gains):
         """Create tax calculation sheet."""
-        ws = wb.create_sheet("Tax Calculation")
+        ws = wb.add_worksheet("Tax Calculation")
         
-        ws.cell(row=1, column=1, value="TAX LIABILITY CALCULATION").font = Font(bold=True, size=14)
-        ws.merge_cells('A1:C1')
+        self._merge(ws, 1, 1, 3, "TAX LIABILITY CALCULATION", {'bold': True, 'font_size': 14})
         
         # Tax rates
-        ws.cell(row=3, column=1, value="Tax Rates Applied").font = self.summary_font
-        ws.cell(row=3, column=1).fill = self.summary_fill
-        ws.merge_cells('A3:C3')
+        self._merge(ws, 3, 1, 3, "Tax Rates Applied", self.summary_font, self.summary_fill)
         
         rates = [
             ("Indian LTCG Rate (12.5% + 15% SC + 4% Cess)", "14.95%"),
@@ -667,14 +562,12 @@ class ExcelReporter:
         ]
         
         for i, (desc, value) in enumerate(rates, 4):
-            ws.cell(row=i, column=1, value=desc)
-            ws.cell(row=i, column=2, value=value)
+            self._write(ws, i, 1, desc)
+            self._write(ws, i, 2, value)
         
         # Step 1: LTCG Exemption
         row = 10
-        ws.cell(row=row, column=1, value="Step 1: LTCG Exemption (Section 112A)").font = self.summary_font
-        ws.cell(row=row, column=1).fill = self.summary_fill
-        ws.merge_cells(f'A{row}:C{row}')
+        self._merge(ws, row, 1, 3, "Step 1: LTCG Exemption (Section 112A)", self.summary_font, self.summary_fill)
         row += 1
         
         exemption_items = [
@@ -684,23 +577,20 @@ class ExcelReporter:
         ]
         
         for desc, value in exemption_items:
-            ws.cell(row=row, column=1, value=desc)
-            ws.cell(row=row, column=2, value=value)
-            ws.cell(row=row, column=2).number_format = '₹#,##0.00'
-            ws.cell(row=row, column=1).border = self.thin_border
-            ws.cell(row=row, column=2).border = self.thin_border
+            self._write(ws, row, 1, desc, self.thin_border)
+            self._write(ws, row, 2, value, INR_FORMAT, self.thin_border)
             row += 1
         
         row += 1
         
         # Step 2: Loss Set-off
-        ws.cell(row=row, column=1, value="Step 2: Loss Set-off").font = self.summary_font
-        ws.cell(row=row, column=1).fill = self.summary_fill
-        ws.merge_cells(f'A{row}:C{row}')
+        self._merge(ws, row, 1, 3, "Step 2: Loss Set-off", self.summary_font, self.summary_fill)
         row += 1
         
+        subheading = {'bold': True, 'italic': True}
+        
         # Gains before set-off
-        ws.cell(row=row, column=1, value="Gains Before Set-off:").font = Font(bold=True, italic=True)
+        self._write(ws, row, 1, "Gains Before Set-off:", subheading)
         row += 1
         
         gains_items = [
@@ -711,13 +601,9 @@ class ExcelReporter:
         ]
         
         for desc, value in gains_items:
-            ws.cell(row=row, column=1, value=desc)
-            ws.cell(row=row, column=2, value=value)
-            ws.cell(row=row, column=2).number_format = '₹#,##0.00'
-            if value > 0:
-                ws.cell(row=row, column=2).fill = self.ltcg_fill
-            ws.cell(row=row, column=1).border = self.thin_border
-            ws.cell(row=row, column=2).border = self.thin_border
+            self._write(ws, row, 1, desc, self.thin_border)
+            self._write(ws, row, 2, value, INR_FORMAT, self.thin_border,
+                        self.ltcg_fill if value > 0 else {})
             row += 1
         
         row += 1
@@ -727,7 +613,7 @@ class ExcelReporter:
         total_stcg_loss = tax_data.foreign_stcg_loss + tax_data.indian_stcg_loss
         
         if total_ltcg_loss > 0 or total_stcg_loss > 0:
-            ws.cell(row=row, column=1, value="Losses Before Set-off:").font = Font(bold=True, italic=True)
+            self._write(ws, row, 1, "Losses Before Set-off:", subheading)
             row += 1
             
             losses_items = []
@@ -741,24 +627,20 @@ class ExcelReporter:
                 losses_items.append(("  Indian STCG Loss", -tax_data.indian_stcg_loss))
             
             for desc, value in losses_items:
-                ws.cell(row=row, column=1, value=desc)
-                ws.cell(row=row, column=2, value=value)
-                ws.cell(row=row, column=2).number_format = '₹#,##0.00'
-                ws.cell(row=row, column=2).fill = self.loss_fill
-                ws.cell(row=row, column=1).border = self.thin_border
-                ws.cell(row=row, column=2).border = self.thin_border
+                self._write(ws, row, 1, desc, self.thin_border)
+                self._write(ws, row, 2, value, INR_FORMAT, self.loss_fill, self.thin_border)
                 row += 1
             
             row += 1
         
         # Set-offs applied
-        has_setoffs = (tax_data.stcg_loss_vs_foreign_stcg > 0 or 
-                       tax_data.stcg_loss_vs_indian_stcg > 0 or 
-                       tax_data.stcg_loss_vs_ltcg > 0 or 
+        has_setoffs = (tax_data.stcg_loss_vs_foreign_stcg > 0 or
+                       tax_data.stcg_loss_vs_indian_stcg > 0 or
+                       tax_data.stcg_loss_vs_ltcg > 0 or
                        tax_data.ltcg_loss_vs_ltcg > 0)
         
         if has_setoffs:
-            ws.cell(row=row, column=1, value="Set-offs Applied:").font = Font(bold=True, italic=True)
+            self._write(ws, row, 1, "Set-offs Applied:", subheading)
             row += 1
             
             setoff_items = []
@@ -771,19 +653,16 @@ class ExcelReporter:
             if tax_data.ltcg_loss_vs_ltcg > 0:
                 setoff_items.append(("  LTCG Loss → LTCG Gain", -tax_data.ltcg_loss_vs_ltcg))
             
+            setoff_fill = {'bg_color': '#FCE4D6'}
             for desc, value in setoff_items:
-                ws.cell(row=row, column=1, value=desc)
-                ws.cell(row=row, column=2, value=value)
-                ws.cell(row=row, column=2).number_format = '₹#,##0.00'
-                ws.cell(row=row, column=2).fill = PatternFill(start_color="FCE4D6", end_color="FCE4D6", fill_type="solid")
-                ws.cell(row=row, column=1).border = self.thin_border
-                ws.cell(row=row, column=2).border = self.thin_border
+                self._write(ws, row, 1, desc, self.thin_border)
+                self._write(ws, row, 2, value, INR_FORMAT, setoff_fill, self.thin_border)
                 row += 1
             
             row += 1
         
         # Net taxable amounts
-        ws.cell(row=row, column=1, value="Net Taxable Amounts:").font = Font(bold=True, italic=True)
+        self._write(ws, row, 1, "Net Taxable Amounts:", subheading)
         row += 1
         
         net_items = [
@@ -792,19 +671,14 @@ class ExcelReporter:
         ]
         
         for desc, value in net_items:
-            ws.cell(row=row, column=1, value=desc).font = Font(bold=True)
-            ws.cell(row=row, column=2, value=value).font = Font(bold=True)
-            ws.cell(row=row, column=2).number_format = '₹#,##0.00'
-            ws.cell(row=row, column=1).border = self.thin_border
-            ws.cell(row=row, column=2).border = self.thin_border
+            self._write(ws, row, 1, desc, self.bold, self.thin_border)
+            self._write(ws, row, 2, value, INR_FORMAT, self.bold, self.thin_border)
             row += 1
         
         row += 1
         
         # Step 3: Tax calculation
-        ws.cell(row=row, column=1, value="Step 3: Tax Calculation").font = self.summary_font
-        ws.cell(row=row, column=1).fill = self.summary_fill
-        ws.merge_cells(f'A{row}:C{row}')
+        self._merge(ws, row, 1, 3, "Step 3: Tax Calculation", self.summary_font, self.summary_fill)
         row += 1
         
         calc_items = [
@@ -822,22 +696,19 @@ class ExcelReporter:
         ]
         
         for desc, value in calc_items:
-            ws.cell(row=row, column=1, value=desc)
+            self._write(ws, row, 1, desc, self.thin_border)
             if value != "":
-                ws.cell(row=row, column=2, value=value)
-                ws.cell(row=row, column=2).number_format = '₹#,##0.00'
-            ws.cell(row=row, column=1).border = self.thin_border
-            ws.cell(row=row, column=2).border = self.thin_border
+                self._write(ws, row, 2, value, INR_FORMAT, self.thin_border)
+            else:
+                self._write(ws, row, 2, "", self.thin_border)
             row += 1
         
         # Final liability
         label = "TAX PAYABLE" if tax_data.tax_liability > 0 else "TAX REFUND DUE"
-        ws.cell(row=row, column=1, value=label).font = Font(bold=True, size=12)
-        ws.cell(row=row, column=2, value=abs(tax_data.tax_liability)).font = Font(bold=True, size=12)
-        ws.cell(row=row, column=2).number_format = '₹#,##0.00'
+        liability_font = {'bold': True, 'font_size': 12}
         fill = self.loss_fill if tax_data.tax_liability > 0 else self.ltcg_fill
-        ws.cell(row=row, column=2).fill = fill
+        self._write(ws, row, 1, label, liability_font)
+        self._write(ws, row, 2, abs(tax_data.tax_liability), INR_FORMAT, liability_font, fill)
         
-        ws.column_dimensions['A'].width = 40
-        ws.column_dimensions['B'].width = 20
-
+        ws.set_column('A:A', 40)
+        ws.set_column('B:B', 20)
@@ -1,12 +1,21 @@
 """
 Persistent cache for stock metadata and prices.
-Stores data in a JSON file for reuse across runs.
+Stores data in a JSON file for reuse across runs (via orjson when installed).
 """
 
 import json
 from pathlib import Path
 from typing import Optional, Dict, Any, Tuple
 
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+    # Match json.dump(indent=2, default=str): datetimes go through str()
+    _ORJSON_OPTIONS = (orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS |
+                       orjson.OPT_PASSTHROUGH_DATETIME | orjson.OPT_SERIALIZE_NUMPY)
+except ImportError:
+    ORJSON_AVAILABLE = False
+
 
 class StockDataCache:
     """
@@ -31,17 +40,25 @@ class StockDataCache:
         """Load cache from file."""
         if self.cache_file.exists():
             try:
-                with open(self.cache_file, 'r') as f:
-                    loaded = json.load(f)
-                    self._data.update(loaded)
+                if ORJSON_AVAILABLE:
+                    loaded = orjson.loads(self.cache_file.read_bytes())
+                else:
+                    with open(self.cache_file, 'r') as f:
+                        loaded = json.load(f)
+                self._data.update(loaded)
             except Exception:
                 pass  # Use empty cache if load fails
     
     def save_cache(self):
         """Save cache to file."""
         try:
-            with open(self.cache_file, 'w') as f:
-                json.dump(self._data, f, indent=2, default=str)
+            if ORJSON_AVAILABLE:
+                self.cache_file.write_bytes(
+                    orjson.dumps(self._data, default=str, option=_ORJSON_OPTIONS)
+                )
+            else:
+                with open(self.cache_file, 'w') as f:
+                    json.dump(self._data, f, indent=2, default=str)
         except Exception as e:
             print(f"Warning: Could not save cache: {e}")
     
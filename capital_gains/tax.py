@@ -105,13 +105,15 @@ class TaxCalculator:
         tax_data.indian_stcg_rate = self.rates.INDIAN_STCG
         tax_data.foreign_stcg_rate = self.rates.FOREIGN_STCG
         
-        # Calculate Schwab gains
-        tax_data.schwab_ltcg = sum(
-            t.capital_gain_inr for t in transactions if t.is_long_term
-        )
-        tax_data.schwab_stcg = sum(
-            t.capital_gain_inr for t in transactions if not t.is_long_term
-        )
+        # Calculate Schwab gains (single pass, summed in transaction order)
+        schwab_ltcg = schwab_stcg = 0
+        for t in transactions:
+            if t.is_long_term:
+                schwab_ltcg += t.capital_gain_inr
+            else:
+                schwab_stcg += t.capital_gain_inr
+        tax_data.schwab_ltcg = schwab_ltcg
+        tax_data.schwab_stcg = schwab_stcg
         
         # Calculate Indian gains
         tax_data.indian_ltcg = sum(g.ltcg for g in indian_gains)
@@ -5,18 +5,31 @@ This module contains helper functions for parsing, file handling,
 and other common operations.
 """
 
-import glob
+import fnmatch
 import os
+import re
+import sys
+from bisect import bisect_left
 from datetime import datetime
-from typing import Optional
+from functools import lru_cache
+from typing import Dict, Iterable, List, Optional, Union
 
+from .models import QuarterlyData, SaleTransaction
 
-def parse_currency(value: str) -> float:
+
+# Translation table that strips currency symbols, thousand separators and signs
+_CURRENCY_STRIP = str.maketrans("", "", "$,-")
+
+
+def parse_currency(value: Union[str, float, None]) -> float:
     """
     Parse currency string like '$123.45' to float.
     
+    Values that are already numeric (e.g. from a JSON number) skip the
+    string handling; like strings, their sign is dropped.
+    
     Args:
-        value: Currency string (e.g., '$1,234.56', '-$100.00', '')
+        value: Currency string (e.g., '$1,234.56', '-$100.00', '') or number
         
     Returns:
         Float value extracted from the string
@@ -28,16 +41,54 @@ def parse_currency(value: str) -> float:
         100.0
         >>> parse_currency('')
         0.0
+        >>> parse_currency(-12.5)
+        12.5
     """
-    if not value or str(value).strip() == "":
+    if isinstance(value, (int, float)):
+        return abs(float(value))
+    if not value:
+        return 0.0
+    if not isinstance(value, str):
+        value = str(value)
+    if not value.strip():
         return 0.0
-    return float(str(value).replace("$", "").replace(",", "").replace("-", ""))
+    return float(value.translate(_CURRENCY_STRIP))
+
+
+def _parse_mdy(date_str: str) -> Optional[datetime]:
+    """Fast path for zero-padded MM/DD/YYYY strings; None if not in that shape."""
+    if len(date_str) == 10 and date_str[2] == "/" and date_str[5] == "/":
+        month, day, year = date_str[0:2], date_str[3:5], date_str[6:10]
+        if month.isdigit() and day.isdigit() and year.isdigit():
+            return datetime(int(year), int(month), int(day))
+    return None
+
+
+def _parse_ymd(date_str: str) -> Optional[datetime]:
+    """Fast path for zero-padded YYYY-MM-DD strings; None if not in that shape."""
+    if len(date_str) == 10 and date_str[4] == "-" and date_str[7] == "-":
+        year, month, day = date_str[0:4], date_str[5:7], date_str[8:10]
+        if month.isdigit() and day.isdigit() and year.isdigit():
+            return datetime(int(year), int(month), int(day))
+    return None
 
 
+# Hand-written parsers for the formats used by the broker exports
+_FAST_DATE_PARSERS = {
+    "%m/%d/%Y": _parse_mdy,
+    "%Y-%m-%d": _parse_ymd,
+}
+
+
+@lru_cache(maxsize=4096)
 def parse_date(date_str: str, date_format: str = "%m/%d/%Y") -> datetime:
     """
     Parse date string to datetime object.
     
+    Results are memoized on (date_str, date_format); many transactions
+    share the same sale/vest dates, and datetime objects are immutable
+    so the cached instances are safe to share.
+    
     Args:
         date_str: Date string (e.g., '12/31/2024')
         date_format: Expected format (default: MM/DD/YYYY)
@@ -54,16 +105,134 @@ def parse_date(date_str: str, date_format: str = "%m/%d/%Y") -> datetime:
         >>> parse_date('2024-12-31', '%Y-%m-%d')
         datetime(2024, 12, 31)
     """
+    fast_parser = _FAST_DATE_PARSERS.get(date_format)
+    if fast_parser is not None:
+        result = fast_parser(date_str)
+        if result is not None:
+            return result
     return datetime.strptime(date_str, date_format)
 
 
-def find_file_in_statements(pattern: str, statements_dir: str) -> Optional[str]:
+def parse_currency_series(values):
+    """
+    Parse a whole column of currency strings in one vectorized pass.
+    
+    Column-level counterpart of parse_currency() for tabular inputs
+    loaded with pandas. Missing and blank cells become 0.0.
+    
+    Args:
+        values: pandas Series of currency strings (e.g., '$1,234.56')
+        
+    Returns:
+        pandas Series of float64 values
+        
+    Examples:
+        >>> list(parse_currency_series(pd.Series(['$1,234.56', '-$100.00', None])))
+        [1234.56, 100.0, 0.0]
+    """
+    cleaned = values.fillna("").astype(str).str.translate(_CURRENCY_STRIP).str.strip()
+    return cleaned.mask(cleaned == "", "0").astype("float64")
+
+
+def parse_date_series(values, date_format: str = "%m/%d/%Y"):
+    """
+    Parse a whole column of date strings in one vectorized pass.
+    
+    Column-level counterpart of parse_date(); repeated date strings are
+    converted once thanks to pandas' conversion cache.
+    
+    Args:
+        values: pandas Series of date strings (e.g., '12/31/2024')
+        date_format: Expected format (default: MM/DD/YYYY)
+        
+    Returns:
+        pandas Series of datetime64 values
+        
+    Raises:
+        ValueError: If any value doesn't match the expected format
+    """
+    import pandas as pd
+    return pd.to_datetime(values, format=date_format, cache=True)
+
+
+def list_statements_dir(statements_dir: str) -> List[os.DirEntry]:
+    """
+    List the entries of the statements directory once for repeated lookups.
+    
+    Only matching entries are stat'ed later, by
+    find_file_in_statements_compiled(); DirEntry caches that result.
+    
+    Args:
+        statements_dir: Path to the statements directory
+        
+    Returns:
+        List of directory entries, or an empty list if the directory is missing
+    """
+    try:
+        with os.scandir(statements_dir) as it:
+            return list(it)
+    except OSError:
+        return []
+
+
+def compile_file_pattern(pattern: str) -> "re.Pattern[str]":
+    """
+    Compile a glob pattern into a regex for repeated file name matching.
+    
+    Matching follows the platform's file name case rules, as glob does.
+    
+    Args:
+        pattern: Glob pattern (e.g., 'pnl-*.xlsx')
+        
+    Returns:
+        Compiled regular expression matching whole file names
+    """
+    flags = re.IGNORECASE if os.path.normcase("A") == "a" else 0
+    return re.compile(fnmatch.translate(pattern), flags)
+
+
+def find_file_in_statements_compiled(
+    compiled_pattern: "re.Pattern[str]",
+    entries: List[os.DirEntry],
+) -> Optional[str]:
+    """
+    Find the newest entry whose name matches a precompiled pattern.
+    
+    Args:
+        compiled_pattern: Pattern from compile_file_pattern()
+        entries: Directory listing from list_statements_dir()
+        
+    Returns:
+        Path to the most recently modified matching file, or None if not found
+    """
+    newest_path = None
+    newest_mtime = None
+    for entry in entries:
+        if not compiled_pattern.match(entry.name):
+            continue
+        try:
+            mtime = entry.stat().st_mtime
+        except OSError:
+            # Dangling symlink, or removed since the directory was listed
+            continue
+        if newest_mtime is None or mtime > newest_mtime:
+            newest_path, newest_mtime = entry.path, mtime
+    return newest_path
+
+
+def find_file_in_statements(
+    pattern: str,
+    statements_dir: str,
+    entries: Optional[List[os.DirEntry]] = None,
+) -> Optional[str]:
     """
     Find a file matching pattern in the statements directory.
     
     Args:
         pattern: Glob pattern to match (e.g., 'EquityAwardsCenter_*.json')
         statements_dir: Path to the statements directory
+        entries: Optional pre-built listing from list_statements_dir(),
+            reused across lookups to avoid re-scanning the directory
         
     Returns:
         Path to the most recently modified matching file, or None if not found
@@ -72,12 +241,27 @@ def find_file_in_statements(pattern: str, statements_dir: str) -> Optional[str]:
         >>> find_file_in_statements('*.json', '/path/to/statements')
         '/path/to/statements/file.json'
     """
-    search_pattern = os.path.join(statements_dir, pattern)
-    matches = glob.glob(search_pattern)
-    if matches:
-        # Return the most recently modified file if multiple matches
-        return max(matches, key=os.path.getmtime)
-    return None
+    compiled_pattern = compile_file_pattern(pattern)
+    if entries is None:
+        # Single scandir pass; only matching entries are stat'ed afterwards
+        try:
+            with os.scandir(statements_dir) as it:
+                entries = [entry for entry in it if compiled_pattern.match(entry.name)]
+        except OSError:
+            return None
+    # Return the most recently modified file if multiple matches
+    return find_file_in_statements_compiled(compiled_pattern, entries)
+
+
+@lru_cache(maxsize=8192)
+def _format_amount(amount: float) -> str:
+    """Memoized thousands-separated 2dp formatting shared by the currency formatters."""
+    return f"{amount:,.2f}"
+
+
+def _format_amount_cached(amount: float) -> str:
+    """Format via the cache, except zero: 0.0 and -0.0 share a cache key but format differently."""
+    return _format_amount(amount) if amount else f"{amount:,.2f}"
 
 
 def format_currency_inr(amount: float, include_symbol: bool = True) -> str:
@@ -95,7 +279,7 @@ def format_currency_inr(amount: float, include_symbol: bool = True) -> str:
         >>> format_currency_inr(123456.78)
         '₹1,23,456.78'
     """
-    formatted = f"{amount:,.2f}"
+    formatted = _format_amount_cached(amount)
     return f"₹{formatted}" if include_symbol else formatted
 
 
@@ -110,10 +294,24 @@ def format_currency_usd(amount: float, include_symbol: bool = True) -> str:
     Returns:
         Formatted string (e.g., '$1,234.56')
     """
-    formatted = f"{amount:,.2f}"
+    formatted = _format_amount_cached(amount)
     return f"${formatted}" if include_symbol else formatted
 
 
+# Constants for advance tax quarters (interned: used as dict keys by the reports)
+ADVANCE_TAX_QUARTERS = tuple(sys.intern(q) for q in (
+    "Upto 15 Jun",
+    "16 Jun-15 Sep",
+    "16 Sep-15 Dec",
+    "16 Dec-15 Mar",
+    "16 Mar-31 Mar",
+))
+
+# Last day of each quarter but the final one, as fiscal-year keys
+# ((month - 4) % 12) * 32 + day, so April 1 is the smallest key
+_QUARTER_END_KEYS = (2 * 32 + 15, 5 * 32 + 15, 8 * 32 + 15, 11 * 32 + 15)
+
+
 def get_advance_tax_quarter(sale_date: datetime) -> str:
     """
     Get the advance tax quarter for a sale date.
@@ -131,39 +329,32 @@ def get_advance_tax_quarter(sale_date: datetime) -> str:
     Returns:
         Quarter name string
     """
-    month = sale_date.month
-    day = sale_date.day
-    
-    if month >= 4 and month <= 6:
-        if month < 6 or (month == 6 and day <= 15):
-            return "Upto 15 Jun"
-        else:
-            return "16 Jun-15 Sep"
-    elif month >= 7 and month <= 9:
-        if month < 9 or (month == 9 and day <= 15):
-            return "16 Jun-15 Sep"
-        else:
-            return "16 Sep-15 Dec"
-    elif month >= 10 and month <= 12:
-        if month < 12 or (month == 12 and day <= 15):
-            return "16 Sep-15 Dec"
-        else:
-            return "16 Dec-15 Mar"
-    elif month >= 1 and month <= 3:
-        if month < 3 or (month == 3 and day <= 15):
-            return "16 Dec-15 Mar"
-        else:
-            return "16 Mar-31 Mar"
-    
-    return "Unknown"
-
-
-# Constants for advance tax quarters
-ADVANCE_TAX_QUARTERS = [
-    "Upto 15 Jun",
-    "16 Jun-15 Sep", 
-    "16 Sep-15 Dec",
-    "16 Dec-15 Mar",
-    "16 Mar-31 Mar"
-]
+    return _advance_tax_quarter(sale_date.month, sale_date.day)
+
 
+@lru_cache(maxsize=512)
+def _advance_tax_quarter(month: int, day: int) -> str:
+    """Memoized quarter lookup; keyed on (month, day) so every year shares entries."""
+    return ADVANCE_TAX_QUARTERS[bisect_left(_QUARTER_END_KEYS, ((month - 4) % 12) * 32 + day)]
+
+
+def bucket_by_quarter(transactions: Iterable[SaleTransaction]) -> Dict[str, QuarterlyData]:
+    """
+    Sum capital gains (INR) into advance tax quarters by sale date.
+    
+    Args:
+        transactions: Sale transactions with INR gains calculated
+        
+    Returns:
+        Dictionary mapping every ADVANCE_TAX_QUARTERS label to its
+        LTCG/STCG totals (zero for quarters without sales)
+    """
+    data = {q: QuarterlyData() for q in ADVANCE_TAX_QUARTERS}
+    for txn in transactions:
+        quarter = get_advance_tax_quarter(txn.sale_date)
+        if quarter in data:
+            if txn.is_long_term:
+                data[quarter].ltcg += txn.capital_gain_inr
+            else:
+                data[quarter].stcg += txn.capital_gain_inr
+    return data
@@ -12,35 +12,33 @@ Usage:
 """
 
 import argparse
-import json
+import io
 import os
 import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
+from functools import lru_cache
 from pathlib import Path
+from typing import Callable, List, Optional, TextIO
 
 # Set UTF-8 encoding for console output (fixes Windows encoding issues)
 if sys.platform == 'win32':
     sys.stdout.reconfigure(encoding='utf-8')
 
-from capital_gains import (
-    CapitalGainsCalculator,
-    TaxCalculator,
-    TaxRates,
-    IndianGains,
+from capital_gains.utils import (
+    compile_file_pattern,
+    find_file_in_statements_compiled,
+    list_statements_dir,
 )
-from capital_gains.parsers import (
-    SchwabEACParser,
-    SchwabIndividualParser,
-    IndianStocksParser,
-    IndianMutualFundsParser,
-    ZerodhaPnLParser,
-)
-from capital_gains.reports import ConsoleReporter, ExcelReporter
-from capital_gains.utils import find_file_in_statements
+
+# Exports larger than this are streamed (when ijson is available) rather than loaded whole
+JSON_STREAMING_THRESHOLD_BYTES = 64 * 1024 * 1024
 
 
 # EULA configuration
 EULA_CONFIG_FILE = Path.home() / ".capital_gains_calculator" / "eula_accepted"
+EULA_ACCEPTED_MARKER = b"accepted=1\n"
 
 EULA_TEXT = """
 ================================================================================
@@ -83,16 +81,43 @@ Please read the following terms carefully before using the Capital Gains Calcula
 ================================================================================
 """
 
+# Default input files in the statements folder: key -> (CLI argument, glob pattern)
+STATEMENT_FILE_PATTERNS = {
+    'eac': ('eac_file', "EquityAwardsCenter_Transactions*.json"),
+    'individual': ('individual_file', "Individual_*_Transactions*.json"),
+    'mf': ('mf_file', "Mutual_Funds_Capital_Gains_Report*.xlsx"),
+    'stocks': ('stocks_file', "Stocks_Capital_Gains_Report*.xlsx"),
+    'zerodha': ('zerodha_file', "pnl-*.xlsx"),
+    'sbi_rates': ('sbi_rates_file', "sbi_reference_rates.json"),
+}
+
+_COMPILED_FILE_PATTERNS = {
+    key: compile_file_pattern(pattern)
+    for key, (_, pattern) in STATEMENT_FILE_PATTERNS.items()
+}
+
+
+@lru_cache(maxsize=None)
+def _eula_file_exists(config_file: Path) -> bool:
+    """Memoized existence check; cleared whenever the file is written or removed."""
+    return config_file.exists()
+
 
 def check_eula_accepted() -> bool:
     """Check if EULA has been previously accepted."""
-    return EULA_CONFIG_FILE.exists()
+    return _eula_file_exists(EULA_CONFIG_FILE)
 
 
 def save_eula_acceptance():
     """Save EULA acceptance to config file."""
     EULA_CONFIG_FILE.parent.mkdir(parents=True, exist_ok=True)
-    EULA_CONFIG_FILE.write_text(f"accepted={datetime.now().isoformat()}")
+    # Only the file's existence is checked, so a fixed marker is enough
+    fd = os.open(EULA_CONFIG_FILE, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o644)
+    try:
+        os.write(fd, EULA_ACCEPTED_MARKER)
+    finally:
+        os.close(fd)
+    _eula_file_exists.cache_clear()
 
 
 def prompt_eula_acceptance() -> bool:
@@ -165,38 +190,101 @@ Examples:
 
 def find_input_files(args, statements_folder: str) -> dict:
     """Find all input files based on arguments or defaults."""
-    files = {
-        'eac': args.eac_file or find_file_in_statements(
-            "EquityAwardsCenter_Transactions*.json", statements_folder),
-        'individual': args.individual_file or find_file_in_statements(
-            "Individual_*_Transactions*.json", statements_folder),
-        'mf': args.mf_file or find_file_in_statements(
-            "Mutual_Funds_Capital_Gains_Report*.xlsx", statements_folder),
-        'stocks': args.stocks_file or find_file_in_statements(
-            "Stocks_Capital_Gains_Report*.xlsx", statements_folder),
-        'zerodha': args.zerodha_file or find_file_in_statements(
-            "pnl-*.xlsx", statements_folder),
-        'sbi_rates': args.sbi_rates_file or find_file_in_statements(
-            "sbi_reference_rates.json", statements_folder),
-    }
+    # Scan the statements folder once and reuse the listing for every pattern
+    entries = list_statements_dir(statements_folder)
+    files = {}
+    for key, (arg_name, _) in STATEMENT_FILE_PATTERNS.items():
+        files[key] = getattr(args, arg_name) or find_file_in_statements_compiled(
+            _COMPILED_FILE_PATTERNS[key], entries)
     return files
 
 
 def print_header(start_date: datetime, files: dict, taxes_paid: float):
     """Print the application header."""
-    print("=" * 80)
-    print("  CAPITAL GAINS CALCULATOR")
-    print("=" * 80)
-    print(f"\n[*] Calculating gains from: {start_date.strftime('%d %B %Y')}")
+    lines = [
+        "=" * 80,
+        "  CAPITAL GAINS CALCULATOR",
+        "=" * 80,
+        f"\n[*] Calculating gains from: {start_date.strftime('%d %B %Y')}",
+        "\n[*] Input Files:",
+        f"   EAC Transactions:        {files['eac'] or 'Not found'}",
+        f"   Individual Transactions: {files['individual'] or 'Not found'}",
+        f"   Groww Mutual Funds:      {files['mf'] or 'Not found'}",
+        f"   Groww Stocks:            {files['stocks'] or 'Not found'}",
+        f"   Zerodha P&L:             {files['zerodha'] or 'Not found'}",
+        f"   SBI USD-INR Rates:       {files['sbi_rates'] or 'Not found'}",
+        f"\n[*] Taxes Already Paid:      Rs.{taxes_paid:,.2f}",
+    ]
+    sys.stdout.write("\n".join(lines) + "\n")
+
+
+def _load_if_present(path: Optional[str], label: str, loader: Callable,
+                     out: Optional[TextIO] = None):
+    """Open an input file and pass it to loader; warn and return None if it's missing."""
+    if not path:
+        return None
+    try:
+        with open(path, 'rb') as f:
+            return loader(f)
+    except FileNotFoundError:
+        print(f"\n[WARN] {label} file not found: {path}", file=out)
+        return None
+
+
+def load_schwab_transactions(path: Optional[str], label: str, parser,
+                             start_date: datetime, out: Optional[TextIO] = None) -> list:
+    """Load a Schwab JSON export and return its sale transactions."""
+    def load(f) -> list:
+        print(f"\n[+] Loading {label} transactions from: {os.path.basename(path)}", file=out)
+        stream = os.fstat(f.fileno()).st_size > JSON_STREAMING_THRESHOLD_BYTES
+        total = 0
+        
+        def counted(records):
+            nonlocal total
+            for record in records:
+                total += 1
+                yield record
+        
+        sales = parser.parse(counted(parser.read_transactions(f, stream=stream)), start_date)
+        
+        print(f"    Total transactions in file: {total}", file=out)
+        print(f"    Sale transactions from {start_date.strftime('%d-%b-%Y')}: {len(sales)}", file=out)
+        return sales
     
-    print("\n[*] Input Files:")
-    print(f"   EAC Transactions:        {files['eac'] or 'Not found'}")
-    print(f"   Individual Transactions: {files['individual'] or 'Not found'}")
-    print(f"   Groww Mutual Funds:      {files['mf'] or 'Not found'}")
-    print(f"   Groww Stocks:            {files['stocks'] or 'Not found'}")
-    print(f"   Zerodha P&L:             {files['zerodha'] or 'Not found'}")
-    print(f"   SBI USD-INR Rates:       {files['sbi_rates'] or 'Not found'}")
-    print(f"\n[*] Taxes Already Paid:      Rs.{taxes_paid:,.2f}")
+    return _load_if_present(path, label, load, out) or []
+
+
+def load_indian_gains(path: Optional[str], label: str, parser,
+                      out: Optional[TextIO] = None):
+    """Load an Indian broker report, or return None if it isn't available."""
+    def load(f):
+        print(f"\n[+] Loading {label} from: {os.path.basename(path)}", file=out)
+        return parser.parse(f)
+    
+    return _load_if_present(path, label, load, out)
+
+
+def run_loaders_in_parallel(loaders: List[Callable[[TextIO], object]]) -> list:
+    """
+    Run independent file loaders on a thread pool.
+    
+    Each loader is called with its own text buffer to write its console
+    output to. The buffers are replayed in submission order once all
+    loaders finish, so the log reads the same as a sequential run. If a
+    loader raises, the output of every loader (including the failing
+    one) is still replayed before the exception propagates.
+    """
+    outputs = [io.StringIO() for _ in loaders]
+    try:
+        with ThreadPoolExecutor(max_workers=len(loaders)) as executor:
+            futures = [
+                executor.submit(loader, output)
+                for loader, output in zip(loaders, outputs)
+            ]
+            return [future.result() for future in futures]
+    finally:
+        for output in outputs:
+            sys.stdout.write(output.getvalue())
 
 
 def main():
@@ -214,6 +302,7 @@ def main():
     if args.reset_eula:
         if EULA_CONFIG_FILE.exists():
             EULA_CONFIG_FILE.unlink()
+            _eula_file_exists.cache_clear()
             print("[✓] EULA acceptance has been reset.")
             print("    You will be prompted to accept the EULA on next run.")
         else:
@@ -225,6 +314,13 @@ def main():
         if not prompt_eula_acceptance():
             return
     
+    # Parse start date before touching the file system
+    try:
+        start_date = datetime.strptime(args.start_date, '%Y-%m-%d')
+    except ValueError:
+        print(f"[ERROR] Invalid date format: {args.start_date}. Use YYYY-MM-DD format.")
+        return
+    
     # Setup directories
     script_dir = os.path.dirname(os.path.abspath(__file__))
     statements_folder = os.path.join(script_dir, "statements")
@@ -233,82 +329,41 @@ def main():
         os.makedirs(statements_folder)
         print(f"[+] Created statements folder: {statements_folder}")
     
-    # Parse start date
-    try:
-        start_date = datetime.strptime(args.start_date, '%Y-%m-%d')
-    except ValueError:
-        print(f"[ERROR] Invalid date format: {args.start_date}. Use YYYY-MM-DD format.")
-        return
-    
     # Find input files
     files = find_input_files(args, statements_folder)
     
     # Print header
     print_header(start_date, files, args.taxes_paid)
     
-    # Initialize parsers
-    eac_parser = SchwabEACParser()
-    individual_parser = SchwabIndividualParser()
-    stocks_parser = IndianStocksParser()
-    mf_parser = IndianMutualFundsParser()
-    zerodha_parser = ZerodhaPnLParser()
-    
-    all_transactions = []
-    indian_gains = []
-    
-    # Process EAC file
-    if files['eac'] and os.path.exists(files['eac']):
-        print(f"\n[+] Loading EAC transactions from: {os.path.basename(files['eac'])}")
-        with open(files['eac'], 'r') as f:
-            eac_data = json.load(f)
-        
-        eac_transactions = eac_data.get("Transactions", [])
-        print(f"    Total transactions in file: {len(eac_transactions)}")
-        
-        eac_sales = eac_parser.parse(eac_transactions, start_date)
-        print(f"    Sale transactions from {start_date.strftime('%d-%b-%Y')}: {len(eac_sales)}")
-        all_transactions.extend(eac_sales)
-    elif files['eac']:
-        print(f"\n[WARN] EAC file not found: {files['eac']}")
-    
-    # Process Individual file
-    if files['individual'] and os.path.exists(files['individual']):
-        print(f"\n[+] Loading Individual transactions from: {os.path.basename(files['individual'])}")
-        with open(files['individual'], 'r') as f:
-            individual_data = json.load(f)
-        
-        individual_transactions = individual_data.get("BrokerageTransactions", [])
-        print(f"    Total transactions in file: {len(individual_transactions)}")
-        
-        individual_sales = individual_parser.parse(individual_transactions, start_date)
-        print(f"    Sale transactions from {start_date.strftime('%d-%b-%Y')}: {len(individual_sales)}")
-        all_transactions.extend(individual_sales)
-    elif files['individual']:
-        print(f"\n[WARN] Individual file not found: {files['individual']}")
-    
-    # Process Indian Stocks file
-    if files['stocks'] and os.path.exists(files['stocks']):
-        print(f"\n[+] Loading Indian Stocks from: {os.path.basename(files['stocks'])}")
-        indian_stocks = stocks_parser.parse(files['stocks'])
-        indian_gains.append(indian_stocks)
-    elif files['stocks']:
-        print(f"\n[WARN] Indian Stocks file not found: {files['stocks']}")
-    
-    # Process Indian MF file
-    if files['mf'] and os.path.exists(files['mf']):
-        print(f"\n[+] Loading Indian Mutual Funds from: {os.path.basename(files['mf'])}")
-        indian_mf = mf_parser.parse(files['mf'])
-        indian_gains.append(indian_mf)
-    elif files['mf']:
-        print(f"\n[WARN] Indian Mutual Funds file not found: {files['mf']}")
-    
-    # Process Zerodha P&L file
-    if files['zerodha'] and os.path.exists(files['zerodha']):
-        print(f"\n[+] Loading Zerodha P&L from: {os.path.basename(files['zerodha'])}")
-        zerodha_gains = zerodha_parser.parse(files['zerodha'])
-        indian_gains.append(zerodha_gains)
-    elif files['zerodha']:
-        print(f"\n[WARN] Zerodha P&L file not found: {files['zerodha']}")
+    # Heavy parser/reporter modules (openpyxl, xlsxwriter) are only needed
+    # for a real run, so keep them off the --help/--show-eula/--reset-eula path
+    from capital_gains import CapitalGainsCalculator, TaxCalculator
+    from capital_gains.parsers import (
+        SchwabEACParser,
+        SchwabIndividualParser,
+        IndianStocksParser,
+        IndianMutualFundsParser,
+        ZerodhaPnLParser,
+    )
+    from capital_gains.reports import ConsoleReporter, ExcelReporter
+    
+    # Input files are independent, so load them concurrently; each loader
+    # and its parser write their messages to the buffer they are handed
+    eac_sales, individual_sales, indian_stocks, indian_mf, zerodha_gains = run_loaders_in_parallel([
+        lambda out: load_schwab_transactions(
+            files['eac'], "EAC", SchwabEACParser(out), start_date, out),
+        lambda out: load_schwab_transactions(
+            files['individual'], "Individual", SchwabIndividualParser(out), start_date, out),
+        lambda out: load_indian_gains(
+            files['stocks'], "Indian Stocks", IndianStocksParser(out), out),
+        lambda out: load_indian_gains(
+            files['mf'], "Indian Mutual Funds", IndianMutualFundsParser(out), out),
+        lambda out: load_indian_gains(
+            files['zerodha'], "Zerodha P&L", ZerodhaPnLParser(out), out),
+    ])
+    
+    all_transactions = eac_sales + individual_sales
+    indian_gains = [g for g in (indian_stocks, indian_mf, zerodha_gains) if g is not None]
     
     # Check if we have any data
     if not all_transactions and not indian_gains:
@@ -352,7 +407,9 @@ def main():
     tax_calculator.print_calculation(tax_data)
     
     # Export to Excel
-    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+    lt = time.localtime()
+    timestamp = (f"{lt.tm_year:04d}{lt.tm_mon:02d}{lt.tm_mday:02d}_"
+                 f"{lt.tm_hour:02d}{lt.tm_min:02d}{lt.tm_sec:02d}")
     excel_path = os.path.join(script_dir, f"capital_gains_report_{timestamp}.xlsx")
     
     if all_transactions:
@@ -369,9 +426,7 @@ def main():
     calculator.save_exchange_rates(rates_path)
     print(f"\n[+] Exchange rates saved to: {rates_path}")
     
-    print("\n" + "=" * 80)
-    print("  CALCULATION COMPLETE")
-    print("=" * 80)
+    sys.stdout.write("\n" + "=" * 80 + "\n  CALCULATION COMPLETE\n" + "=" * 80 + "\n")
 
 
 if __name__ == "__main__":
@@ -13,17 +13,42 @@ Usage:
 """
 
 import argparse
-import base64
 import csv
+import email
+import email.policy
+import io
 import json
 import os
 import re
 import urllib.request
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
 from datetime import datetime
+from functools import lru_cache
 from html.parser import HTMLParser
-from io import StringIO
 from pathlib import Path
 
+# Optional: pandas parses the SBI CSV in C; falls back to the csv module otherwise
+try:
+    import pandas as pd
+    PANDAS_AVAILABLE = True
+except ImportError:
+    PANDAS_AVAILABLE = False
+
+# Optional: orjson speeds up loading/saving the rates JSON; falls back to json otherwise
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+# Optional: lxml parses HTML tables in C; falls back to html.parser otherwise
+try:
+    import lxml.html
+    LXML_AVAILABLE = True
+except ImportError:
+    LXML_AVAILABLE = False
+
 
 # SBI FX RateKeeper (2020-present)
 SBI_CSV_URL = "https://raw.githubusercontent.com/sahilgupta/sbi-fx-ratekeeper/main/csv_files/SBI_REFERENCE_RATES_USD.csv"
@@ -32,47 +57,61 @@ SBI_CSV_URL = "https://raw.githubusercontent.com/sahilgupta/sbi-fx-ratekeeper/ma
 SCRIPT_DIR = Path(__file__).parent
 OUTPUT_FILE = SCRIPT_DIR / "sbi_reference_rates.json"
 PERQUISITES_DIR = SCRIPT_DIR / "perquisites"
+PERQUISITES_CACHE_FILE = SCRIPT_DIR / ".cache" / "perquisites.json"
+# Bump when the email extractors change, so rates cached by older code are re-extracted
+PERQUISITES_CACHE_VERSION = 1
 
 
-def download_csv(url: str) -> str:
-    """Download CSV content from URL."""
+def parse_sbi_csv(url: str) -> dict[str, float]:
+    """
+    Download SBI FX RateKeeper CSV and extract date -> TT BUY rate mapping.
+    Available from 2020 onwards.
+    
+    Rows are parsed as they arrive instead of buffering the whole download.
+    """
     print(f"[*] Downloading CSV from {url}...")
     with urllib.request.urlopen(url) as response:
-        return response.read().decode("utf-8")
+        if PANDAS_AVAILABLE:
+            return _parse_sbi_csv_pandas(response)
+        return _parse_sbi_csv_rows(
+            csv.reader(io.TextIOWrapper(response, encoding="utf-8", newline="")))
 
 
-def parse_sbi_csv(csv_content: str) -> dict[str, float]:
-    """
-    Parse SBI FX RateKeeper CSV and extract date -> TT BUY rate mapping.
-    Available from 2020 onwards.
-    """
-    rates = {}
-    reader = csv.reader(StringIO(csv_content))
-    
+def _parse_sbi_csv_pandas(stream) -> dict[str, float]:
+    """Parse the CSV with pandas' C tokenizer (DATE and TT BUY columns only)."""
+    df = pd.read_csv(stream, usecols=[0, 2], dtype=str, keep_default_na=False)
+    print(f"   CSV columns: {list(df.columns)}...")
+    
+    # "2020-01-06 09:00" -> "2020-01-06"
+    dates = df.iloc[:, 0].str.split().str[0]
+    tt_buy = pd.to_numeric(df.iloc[:, 1], errors="coerce")
+    
+    # Skip unparseable and zero rates
+    valid = tt_buy.notna() & (tt_buy != 0.0)
+    return dict(zip(dates[valid].tolist(), tt_buy[valid].tolist()))
+
+
+def _safe_float(value: str) -> float | None:
+    """Convert to float, or None if the value isn't numeric."""
+    try:
+        return float(value)
+    except ValueError:
+        return None
+
+
+def _parse_sbi_csv_rows(reader) -> dict[str, float]:
+    """Parse the CSV row by row with the csv module."""
     # Skip header row
     header = next(reader)
     print(f"   CSV columns: {header[:4]}...")
     
-    for row in reader:
-        if len(row) < 3:
-            continue
-        
-        # Extract date (YYYY-MM-DD) from datetime string
-        date_str = row[0].split()[0]  # "2020-01-06 09:00" -> "2020-01-06"
-        
-        # Extract TT BUY rate
-        try:
-            tt_buy = float(row[2])
-        except ValueError:
-            continue
-        
-        # Skip zero rates
-        if tt_buy == 0.0:
-            continue
-        
-        rates[date_str] = tt_buy
-    
-    return rates
+    # "2020-01-06 09:00" -> "2020-01-06"; unparseable (None) and zero TT BUY
+    # rates are both falsy, so one condition skips them
+    return {
+        row[0].split()[0]: tt_buy
+        for row in reader
+        if len(row) >= 3 and (tt_buy := _safe_float(row[2]))
+    }
 
 
 class TableDataExtractor(HTMLParser):
@@ -119,36 +158,125 @@ class TableDataExtractor(HTMLParser):
     
     def get_data_table(self) -> list:
         """Return the largest table (most likely the data table)."""
-        if not self.tables:
-            return []
-        # Find table with most columns (the data table)
-        return max(self.tables, key=lambda t: max(len(row) for row in t) if t else 0)
+        return get_data_table(self.tables)
+
+
+def extract_tables(html_content: str) -> list[list[list[str]]]:
+    """Extract all non-empty tables as lists of rows of cell text."""
+    if not LXML_AVAILABLE:
+        parser = TableDataExtractor()
+        parser.feed(html_content)
+        return parser.tables
+    
+    try:
+        doc = lxml.html.fromstring(html_content)
+    except (lxml.etree.ParserError, ValueError):
+        return []
+    
+    tables = []
+    for table in doc.iter("table"):
+        rows = []
+        for tr in table.iter("tr"):
+            row = ["".join(td.itertext()).strip() for td in tr.findall("td")]
+            if row:
+                rows.append(row)
+        if rows:
+            tables.append(rows)
+    return tables
+
+
+def get_data_table(tables: list) -> list:
+    """Return the largest table (most likely the data table)."""
+    if not tables:
+        return []
+    # Find table with most columns (the data table)
+    return max(tables, key=lambda t: max(len(row) for row in t) if t else 0)
+
+
+# Date formats seen in perquisite emails and the SBI CSV
+DATE_FORMATS = [
+    "%d-%b-%y",      # 21-Jun-23
+    "%d-%b-%Y",      # 21-Jun-2023
+    "%d-%m-%Y",      # 31-08-2023
+    "%d/%m/%Y",      # 31/08/2023
+    "%d-%m-%y",      # 31-08-23
+    "%Y-%m-%d",      # 2023-08-31
+]
+
+# Numbered RBI rate column headers like "11.RBI" or "13.RBI" (matched lowercased)
+_RBI_COLUMN_RE = re.compile(r'\d+\.rbi')
+
+# Perquisite email type, from the file name
+_EMAIL_TYPE_RE = re.compile(r'RSU|ESPP', re.IGNORECASE)
+
+# Cheap shape check so header/total cells skip the strptime attempts entirely
+_DATE_SHAPE_RE = re.compile(r'^\d{1,4}[-/]\w{1,4}[-/]\d{1,4}$')
 
 
+@lru_cache(maxsize=4096)
 def parse_date_flexible(date_str: str) -> str | None:
     """Parse various date formats to YYYY-MM-DD."""
     date_str = date_str.strip()
     
-    # Try different formats
-    formats = [
-        "%d-%b-%y",      # 21-Jun-23
-        "%d-%b-%Y",      # 21-Jun-2023
-        "%d-%m-%Y",      # 31-08-2023
-        "%d/%m/%Y",      # 31/08/2023
-        "%d-%m-%y",      # 31-08-23
-        "%Y-%m-%d",      # 2023-08-31
-    ]
-    
-    for fmt in formats:
+    # Already ISO (YYYY-MM-DD): validate in C and return as is
+    if len(date_str) == 10 and date_str[4] == "-" and date_str[7] == "-":
+        try:
+            datetime.fromisoformat(date_str)
+            return date_str
+        except ValueError:
+            pass
+    
+    if not _DATE_SHAPE_RE.match(date_str):
+        return None
+    
+    for fmt in DATE_FORMATS:
         try:
             dt = datetime.strptime(date_str, fmt)
-            return dt.strftime("%Y-%m-%d")
         except ValueError:
             continue
+        return dt.strftime("%Y-%m-%d")
     
     return None
 
 
+def normalize_header(header_row: list[str]) -> list[str]:
+    """Lowercase header cells and drop spaces once, for substring matching."""
+    return [cell.lower().replace(" ", "") for cell in header_row]
+
+
+def extract_rates_from_rows(rows: list, date_col: int | None, rate_col: int | None) -> dict[str, float]:
+    """
+    Collect date -> rate pairs from perquisite table data rows.
+    
+    The rate cell is checked first; dates are only parsed for rows whose
+    rate passes the USD/INR sanity range, which skips totals and filler rows.
+    """
+    rates = {}
+    if date_col is None or rate_col is None:
+        return rates
+    
+    min_len = max(date_col, rate_col) + 1
+    for row in rows:
+        if len(row) < min_len:
+            continue
+        
+        rate_str = row[rate_col].replace(",", "").strip()
+        if not rate_str or rate_str == "-":
+            continue
+        try:
+            rate = float(rate_str)
+        except ValueError:
+            continue
+        if not 40 <= rate <= 100:  # Sanity check for USD/INR range
+            continue
+        
+        date_str = parse_date_flexible(row[date_col])
+        if date_str:
+            rates[date_str] = rate
+    
+    return rates
+
+
 def extract_rates_from_rsu_email(html_content: str) -> dict[str, float]:
     """
     Extract exchange rates from RSU perquisite email.
@@ -159,10 +287,7 @@ def extract_rates_from_rsu_email(html_content: str) -> dict[str, float]:
     """
     rates = {}
     
-    parser = TableDataExtractor()
-    parser.feed(html_content)
-    
-    rows = parser.get_data_table()
+    rows = get_data_table(extract_tables(html_content))
     if not rows:
         return rates
     
@@ -173,8 +298,7 @@ def extract_rates_from_rsu_email(html_content: str) -> dict[str, float]:
     date_col = None
     rate_col = None
     
-    for i, cell in enumerate(header_row):
-        cell_lower = cell.lower().replace(" ", "")
+    for i, cell_lower in enumerate(normalize_header(header_row)):
         # Look for transaction date column
         if "transactiondate" in cell_lower or "4.transaction" in cell_lower:
             date_col = i
@@ -182,7 +306,7 @@ def extract_rates_from_rsu_email(html_content: str) -> dict[str, float]:
         if "rbiexchangerate" in cell_lower or "rbiexchange" in cell_lower:
             rate_col = i
         # Also check numbered columns like "11.RBI" or "13.RBI"
-        if re.match(r'\d+\.rbi', cell_lower):
+        if _RBI_COLUMN_RE.match(cell_lower):
             rate_col = i
     
     # If header detection failed, try positional approach based on row length
@@ -210,25 +334,8 @@ def extract_rates_from_rsu_email(html_content: str) -> dict[str, float]:
                         except:
                             pass
     
-    # Extract rates from data rows
-    for row in rows[1:]:  # Skip header
-        if date_col is None or rate_col is None:
-            continue
-        if len(row) <= max(date_col, rate_col):
-            continue
-        
-        try:
-            date_str = parse_date_flexible(row[date_col])
-            rate_str = row[rate_col].replace(",", "").strip()
-            
-            if date_str and rate_str and rate_str != "-":
-                rate = float(rate_str)
-                if 40 <= rate <= 100:  # Sanity check for USD/INR range
-                    rates[date_str] = rate
-        except (ValueError, IndexError):
-            continue
-    
-    return rates
+    # Extract rates from data rows (skip header)
+    return extract_rates_from_rows(rows[1:], date_col, rate_col)
 
 
 def extract_rates_from_espp_email(html_content: str) -> dict[str, float]:
@@ -241,10 +348,7 @@ def extract_rates_from_espp_email(html_content: str) -> dict[str, float]:
     """
     rates = {}
     
-    parser = TableDataExtractor()
-    parser.feed(html_content)
-    
-    rows = parser.get_data_table()
+    rows = get_data_table(extract_tables(html_content))
     if not rows:
         return rates
     
@@ -255,8 +359,7 @@ def extract_rates_from_espp_email(html_content: str) -> dict[str, float]:
     date_col = None
     rate_col = None
     
-    for i, cell in enumerate(header_row):
-        cell_lower = cell.lower().replace(" ", "")
+    for i, cell_lower in enumerate(normalize_header(header_row)):
         # Look for purchase date column
         if "purchasedate" in cell_lower or "7.purchase" in cell_lower:
             date_col = i
@@ -287,95 +390,125 @@ def extract_rates_from_espp_email(html_content: str) -> dict[str, float]:
                             pass
     
     # Extract rates
-    for row in rows[1:]:
-        if date_col is None or rate_col is None:
-            continue
-        if len(row) <= max(date_col, rate_col):
-            continue
-        
-        try:
-            date_str = parse_date_flexible(row[date_col])
-            rate_str = row[rate_col].replace(",", "").strip()
-            
-            if date_str and rate_str and rate_str != "-":
-                rate = float(rate_str)
-                if 40 <= rate <= 100:
-                    rates[date_str] = rate
-        except (ValueError, IndexError):
-            continue
-    
-    return rates
+    return extract_rates_from_rows(rows[1:], date_col, rate_col)
 
 
 def decode_eml_content(eml_path: Path) -> str | None:
     """Decode HTML content from .eml file."""
-    with open(eml_path, 'r', encoding='utf-8', errors='ignore') as f:
-        content = f.read()
-    
-    # Parse line by line to find HTML base64 block
-    lines = content.split('\n')
-    in_html_section = False
-    found_base64 = False
-    base64_lines = []
+    with open(eml_path, 'rb') as f:
+        msg = email.message_from_binary_file(f, policy=email.policy.default)
     
-    for line in lines:
-        line_lower = line.lower()
-        
-        if 'content-type:' in line_lower and 'text/html' in line_lower:
-            in_html_section = True
-            found_base64 = False
-            base64_lines = []
-        elif in_html_section and 'content-transfer-encoding:' in line_lower and 'base64' in line_lower:
-            found_base64 = True
-        elif in_html_section and found_base64:
-            # Check for boundary (end of section)
-            if line.startswith('--'):
-                break
-            # Skip empty lines at the start
-            stripped = line.strip()
-            if stripped and not stripped.startswith('Content-'):
-                base64_lines.append(stripped)
-    
-    if base64_lines:
+    for part in msg.walk():
+        if part.get_content_type() != 'text/html':
+            continue
         try:
-            full_b64 = ''.join(base64_lines)
-            decoded = base64.b64decode(full_b64).decode('utf-8')
-            return decoded
+            return part.get_content()
         except Exception as e:
             print(f"   [!] Failed to decode {eml_path.name}: {e}")
+            return None
     
     return None
 
 
-def extract_rates_from_perquisites(perquisites_dir: Path) -> dict[str, float]:
-    """Extract exchange rates from all perquisite emails."""
+def load_perquisites_cache(cache_file: Path) -> dict[str, dict[str, float]]:
+    """Load per-email extracted rates from a previous run (empty if stale or unreadable)."""
+    try:
+        with open(cache_file, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+    except (OSError, ValueError):
+        return {}
+    if not isinstance(data, dict) or data.get("version") != PERQUISITES_CACHE_VERSION:
+        return {}
+    return data.get("emails", {})
+
+
+def save_perquisites_cache(cache: dict[str, dict[str, float]], cache_file: Path) -> None:
+    """Persist per-email extracted rates for the next run."""
+    cache_file.parent.mkdir(parents=True, exist_ok=True)
+    with open(cache_file, 'w', encoding='utf-8') as f:
+        json.dump({"version": PERQUISITES_CACHE_VERSION, "emails": cache}, f, indent=2, sort_keys=True)
+
+
+def get_email_extractor(filename: str):
+    """Pick the rate extractor for a perquisite email by file name (RSU wins over ESPP)."""
+    found = {match.upper() for match in _EMAIL_TYPE_RE.findall(filename)}
+    if "RSU" in found:
+        return extract_rates_from_rsu_email
+    if "ESPP" in found:
+        return extract_rates_from_espp_email
+    return None
+
+
+def parse_perquisite_email(eml_file: Path) -> dict[str, float] | None:
+    """Decode one perquisite email and extract its rates; None if not applicable."""
+    extractor = get_email_extractor(eml_file.name)
+    if extractor is None:
+        return None
+    
+    html_content = decode_eml_content(eml_file)
+    if not html_content:
+        return None
+    return extractor(html_content)
+
+
+def extract_rates_from_perquisites(
+    perquisites_dir: Path, cache_file: Path | None = PERQUISITES_CACHE_FILE
+) -> dict[str, float]:
+    """
+    Extract exchange rates from all perquisite emails.
+    
+    Emails never change once received, so rates extracted from each file are
+    cached by (name, mtime, size) and reused on later runs. Uncached emails
+    are parsed in parallel worker processes.
+    """
     rates = {}
     
     if not perquisites_dir.exists():
         print(f"[!] Perquisites directory not found: {perquisites_dir}")
         return rates
     
-    eml_files = list(perquisites_dir.glob("*.eml"))
-    print(f"[*] Found {len(eml_files)} perquisite email(s)")
-    
-    for eml_file in sorted(eml_files):
-        html_content = decode_eml_content(eml_file)
-        if not html_content:
+    # One scandir pass; DirEntry.stat() reuses the directory listing where the OS allows
+    with os.scandir(perquisites_dir) as it:
+        entries = sorted(
+            (entry for entry in it if entry.name.endswith(".eml") and entry.is_file()),
+            key=lambda entry: entry.name,
+        )
+    print(f"[*] Found {len(entries)} perquisite email(s)")
+    
+    cache = load_perquisites_cache(cache_file) if cache_file else {}
+    updated_cache = {}
+    
+    eml_files = []
+    cache_keys = {}
+    for entry in entries:
+        stat = entry.stat()
+        eml_file = Path(entry.path)
+        eml_files.append(eml_file)
+        cache_keys[eml_file] = f"{entry.name}:{stat.st_mtime_ns}:{stat.st_size}"
+    
+    # Decoding and HTML parsing are CPU-bound, so spread misses over processes;
+    # emails that aren't RSU/ESPP perquisites are never decoded
+    misses = [f for f in eml_files
+              if cache_keys[f] not in cache and get_email_extractor(f.name)]
+    if len(misses) > 1:
+        with ProcessPoolExecutor() as executor:
+            parsed = dict(zip(misses, executor.map(parse_perquisite_email, misses)))
+    else:
+        parsed = {f: parse_perquisite_email(f) for f in misses}
+    
+    for eml_file in eml_files:
+        cache_key = cache_keys[eml_file]
+        file_rates = cache[cache_key] if cache_key in cache else parsed.get(eml_file)
+        if file_rates is None:
             continue
         
-        # Determine email type from filename
-        filename = eml_file.name.upper()
-        
-        if "RSU" in filename:
-            file_rates = extract_rates_from_rsu_email(html_content)
-            rates.update(file_rates)
-            if file_rates:
-                print(f"   [+] {eml_file.name}: {len(file_rates)} rate(s)")
-        elif "ESPP" in filename:
-            file_rates = extract_rates_from_espp_email(html_content)
-            rates.update(file_rates)
-            if file_rates:
-                print(f"   [+] {eml_file.name}: {len(file_rates)} rate(s)")
+        updated_cache[cache_key] = file_rates
+        rates.update(file_rates)
+        if file_rates:
+            print(f"   [+] {eml_file.name}: {len(file_rates)} rate(s)")
+    
+    if cache_file and updated_cache != cache:
+        save_perquisites_cache(updated_cache, cache_file)
     
     return rates
 
@@ -385,10 +518,10 @@ def load_existing_rates(filepath: Path) -> dict[str, float]:
     if filepath.exists():
         try:
             with open(filepath, 'r', encoding='utf-8') as f:
-                existing = json.load(f)
+                existing = orjson.loads(f.read()) if ORJSON_AVAILABLE else json.load(f)
                 print(f"[*] Loaded {len(existing)} existing rate(s)")
                 return existing
-        except (json.JSONDecodeError, IOError) as e:
+        except (ValueError, IOError) as e:
             print(f"   [!] Could not load existing file: {e}")
     return {}
 
@@ -398,7 +531,11 @@ def save_json(rates: dict[str, float], output_path: Path) -> None:
     sorted_rates = dict(sorted(rates.items()))
     
     with open(output_path, "w", encoding="utf-8") as f:
-        json.dump(sorted_rates, f, indent=2)
+        if ORJSON_AVAILABLE:
+            # Same layout as json.dump(indent=2); written in text mode for native newlines
+            f.write(orjson.dumps(sorted_rates, option=orjson.OPT_INDENT_2).decode("utf-8"))
+        else:
+            json.dump(sorted_rates, f, indent=2)
     
     print(f"[OK] Saved {len(sorted_rates)} rate(s) to {output_path}")
 
@@ -434,16 +571,13 @@ def main():
     if not args.sbi_only:
         perquisite_rates = extract_rates_from_perquisites(PERQUISITES_DIR)
         # Perquisite rates are used as fallback (don't overwrite SBI rates)
-        for date, rate in perquisite_rates.items():
-            if date not in all_rates:
-                all_rates[date] = rate
+        all_rates = {**perquisite_rates, **all_rates}
         print(f"   Total from perquisites: {len(perquisite_rates)} unique rate(s)")
     
     # Step 3: Fetch SBI rates (2020+) - these are most accurate
     if not args.perquisites_only:
         try:
-            csv_content = download_csv(SBI_CSV_URL)
-            sbi_rates = parse_sbi_csv(csv_content)
+            sbi_rates = parse_sbi_csv(SBI_CSV_URL)
             # SBI rates take precedence
             all_rates.update(sbi_rates)
             print(f"   Total from SBI: {len(sbi_rates)} rate(s)")
@@ -461,10 +595,7 @@ def main():
         print(f"   Date range:  {dates[0]} to {dates[-1]}")
         
         # Count by year
-        year_counts = {}
-        for d in dates:
-            year = d[:4]
-            year_counts[year] = year_counts.get(year, 0) + 1
+        year_counts = Counter(d[:4] for d in dates)
         
         print(f"   By year:")
         for year in sorted(year_counts.keys()):
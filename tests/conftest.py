@@ -11,6 +11,8 @@ import pytest
 # Add parent directory to path for imports
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
+from capital_gains.models import SaleTransaction
+
 
 @pytest.fixture
 def sample_sale_date():
@@ -24,6 +26,46 @@ def sample_acquisition_date():
     return datetime(2023, 1, 15)
 
 
+@pytest.fixture(scope="session")
+def sample_sale_transaction():
+    """
+    Canonical AAPL RSU sale shared by all tests.
+    
+    Shared across the session, so tests must not mutate it; derive
+    variants with dataclasses.replace() instead.
+    """
+    return SaleTransaction(
+        sale_date=datetime(2025, 4, 15),
+        acquisition_date=datetime(2023, 1, 15),
+        stock_type="RS",
+        symbol="AAPL",
+        shares=100,
+        sale_price_usd=150.0,
+        acquisition_price_usd=120.0,
+        gross_proceeds_usd=15000.0,
+    )
+
+
+@pytest.fixture
+def assert_subdict():
+    """
+    Assert that every key/value pair of expected appears in actual.
+    
+    Compares item views in one C-level check and only walks the keys
+    to name the mismatches when it fails.
+    """
+    def check(actual, expected):
+        if expected.items() <= actual.items():
+            return
+        mismatched = {
+            key: (actual.get(key, "<missing>"), value)
+            for key, value in expected.items()
+            if key not in actual or actual[key] != value
+        }
+        pytest.fail(f"Mismatched keys (actual, expected): {mismatched}")
+    return check
+
+
 @pytest.fixture
 def sample_sbi_rates():
     """Sample SBI rates for testing."""
@@ -3,22 +3,20 @@ Unit tests for EULA functionality in main.py.
 """
 
 import pytest
-import tempfile
 import os
-from pathlib import Path
 from unittest.mock import patch
 from datetime import datetime
 
 
+@pytest.fixture
+def temp_eula_dir(tmp_path):
+    """EULA acceptance file path inside a not-yet-created temp config folder."""
+    return tmp_path / "config" / "eula_accepted"
+
+
 class TestEULAFunctions:
     """Tests for EULA acceptance functions."""
     
-    @pytest.fixture
-    def temp_eula_dir(self):
-        """Create a temporary directory for EULA config."""
-        with tempfile.TemporaryDirectory() as tmpdir:
-            yield Path(tmpdir) / "eula_accepted"
-    
     def test_check_eula_not_accepted(self, temp_eula_dir):
         """Test EULA check when not accepted."""
         from main import check_eula_accepted, EULA_CONFIG_FILE
@@ -49,6 +47,27 @@ class TestEULAFunctions:
             content = temp_eula_dir.read_text()
             assert "accepted=" in content
     
+    def test_check_eula_cache_cleared_on_save(self, temp_eula_dir):
+        """Test that saving acceptance invalidates the cached check."""
+        from main import check_eula_accepted, save_eula_acceptance
+        
+        with patch('main.EULA_CONFIG_FILE', temp_eula_dir):
+            assert check_eula_accepted() is False
+            save_eula_acceptance()
+            assert check_eula_accepted() is True
+    
+    def test_reset_eula_clears_cache(self, temp_eula_dir, capsys):
+        """Test that --reset-eula invalidates the cached check."""
+        import main
+        
+        with patch('main.EULA_CONFIG_FILE', temp_eula_dir), \
+                patch('sys.argv', ['main.py', '--reset-eula']):
+            main.save_eula_acceptance()
+            assert main.check_eula_accepted() is True
+            main.main()
+            assert main.check_eula_accepted() is False
+            assert "has been reset" in capsys.readouterr().out
+    
     def test_prompt_eula_acceptance_accept(self, temp_eula_dir, capsys):
         """Test EULA prompt when user accepts."""
         from main import prompt_eula_acceptance
@@ -143,3 +162,34 @@ class TestCommandLineFlags:
         assert args.show_eula is False
         assert args.reset_eula is False
 
+
+class TestNoSideEffects:
+    """Tests that non-run invocations don't touch the file system."""
+    
+    def test_help_does_not_touch_disk(self, temp_eula_dir, capsys):
+        """Test --help exits before any EULA or statements folder work."""
+        import main
+        
+        with patch('main.EULA_CONFIG_FILE', temp_eula_dir), \
+                patch('sys.argv', ['main.py', '--help']), \
+                patch('main.os.makedirs') as makedirs:
+            with pytest.raises(SystemExit):
+                main.main()
+            
+            makedirs.assert_not_called()
+            assert not temp_eula_dir.parent.exists()
+    
+    def test_invalid_start_date_skips_statements_folder(self, temp_eula_dir, capsys):
+        """Test an invalid --start-date aborts before creating folders."""
+        import main
+        
+        temp_eula_dir.parent.mkdir(parents=True)
+        temp_eula_dir.write_text("accepted=1")
+        
+        with patch('main.EULA_CONFIG_FILE', temp_eula_dir), \
+                patch('sys.argv', ['main.py', '--start-date', '2025/04/01']), \
+                patch('main.os.makedirs') as makedirs:
+            main.main()
+            
+            makedirs.assert_not_called()
+            assert "Invalid date format" in capsys.readouterr().out
@@ -3,10 +3,10 @@ Unit tests for exchange rate handling.
 """
 
 import pytest
+import io
 import json
-import tempfile
-import os
 from datetime import datetime
+from unittest.mock import patch
 
 from capital_gains.exchange_rates import ExchangeRateService
 
@@ -19,9 +19,9 @@ class TestExchangeRateService:
         """Create a fresh service for each test."""
         return ExchangeRateService()
     
-    @pytest.fixture
-    def sample_rates_file(self):
-        """Create a temporary rates file."""
+    @pytest.fixture(scope="session")
+    def sample_rates_file(self, tmp_path_factory):
+        """Create a rates file shared by all tests (read-only)."""
         rates = {
             "2025-04-01": 85.0,
             "2025-04-02": 85.1,
@@ -29,14 +29,9 @@ class TestExchangeRateService:
             "2025-04-07": 85.3,  # Skip weekend
         }
         
-        with tempfile.NamedTemporaryFile(mode='w', suffix='.json', delete=False) as f:
-            json.dump(rates, f)
-            filepath = f.name
-        
-        yield filepath
-        
-        # Cleanup
-        os.unlink(filepath)
+        filepath = tmp_path_factory.mktemp("rates") / "rates.json"
+        filepath.write_text(json.dumps(rates))
+        return str(filepath)
     
     def test_load_sbi_rates(self, service, sample_rates_file):
         """Test loading rates from file."""
@@ -46,6 +41,50 @@ class TestExchangeRateService:
         assert len(service.sbi_rates) == 4
         assert service.sbi_rates["2025-04-01"] == 85.0
     
+    @pytest.mark.parametrize("use_orjson", [True, False])
+    def test_load_sbi_rates_backends(self, service, sample_rates_file, use_orjson):
+        """Test that the orjson and stdlib json loaders agree."""
+        from capital_gains import exchange_rates
+        if use_orjson and not exchange_rates.ORJSON_AVAILABLE:
+            pytest.skip("orjson not installed")
+        
+        with patch.object(exchange_rates, 'ORJSON_AVAILABLE', use_orjson):
+            result = service.load_sbi_rates(sample_rates_file)
+        
+        assert result is True
+        assert service.sbi_rates == {
+            "2025-04-01": 85.0,
+            "2025-04-02": 85.1,
+            "2025-04-03": 85.2,
+            "2025-04-07": 85.3,
+        }
+    
+    def test_load_sbi_rates_from_stream(self, service):
+        """Test loading rates from an in-memory file object."""
+        stream = io.BytesIO(b'{"2025-04-01": 85.0, "2025-04-02": 85.1}')
+        
+        result = service.load_sbi_rates(stream)
+        
+        assert result is True
+        assert service.get_rate(datetime(2025, 4, 2)) == 85.1
+    
+    def test_load_sbi_rates_invalid_stream(self, service):
+        """Test that a malformed stream is reported, not raised."""
+        result = service.load_sbi_rates(io.BytesIO(b'{"2025-04-01": '))
+        
+        assert result is False
+        assert len(service.sbi_rates) == 0
+    
+    def test_load_sbi_rates_empty_file(self, service, tmp_path):
+        """Test that an empty rates file is reported, not mapped."""
+        filepath = tmp_path / "rates.json"
+        filepath.write_bytes(b"")
+        
+        result = service.load_sbi_rates(str(filepath))
+        
+        assert result is False
+        assert len(service.sbi_rates) == 0
+    
     def test_load_sbi_rates_missing_file(self, service):
         """Test loading from non-existent file."""
         result = service.load_sbi_rates("/nonexistent/file.json")
@@ -68,6 +107,31 @@ class TestExchangeRateService:
         rate = service.get_rate(datetime(2025, 4, 5))
         assert rate == 85.3  # April 7 rate
     
+    def test_get_rate_backward_fallback(self, service, sample_rates_file):
+        """Test falling back to the previous rate when none follows."""
+        service.load_sbi_rates(sample_rates_file)
+        
+        # Nothing after April 7, so April 10 uses the April 7 rate
+        assert service.get_rate(datetime(2025, 4, 10)) == 85.3
+    
+    def test_get_rate_outside_window(self, service, sample_rates_file):
+        """Test that rates more than 7 days away are not used."""
+        service.load_sbi_rates(sample_rates_file)
+        
+        # March 20 is 12 days before the first rate; April 20 is 13 after the last
+        assert service.get_rate(datetime(2025, 3, 20)) == 85.5  # 2025 Q1 approximate
+        assert service.get_rate(datetime(2025, 4, 20)) == 85.0  # 2025 Q2 approximate
+    
+    def test_get_rate_after_rates_replaced(self, service, sample_rates_file):
+        """Test that assigning new rates is picked up by the lookup."""
+        service.load_sbi_rates(sample_rates_file)
+        service.get_rate(datetime(2025, 4, 5))
+        
+        service.sbi_rates = {"2025-04-04": 86.0}
+        service.clear_cache()
+        
+        assert service.get_rate(datetime(2025, 4, 5)) == 86.0
+    
     def test_get_rate_cached(self, service, sample_rates_file):
         """Test that rates are cached."""
         service.load_sbi_rates(sample_rates_file)
@@ -80,6 +144,29 @@ class TestExchangeRateService:
         assert rate1 == rate2
         assert "2025-04-01" in service.cache
     
+    def test_get_rate_cache_replaced(self, service, sample_rates_file):
+        """Test that clearing or replacing the cache drops earlier lookups."""
+        service.load_sbi_rates(sample_rates_file)
+        assert service.get_rate(datetime(2025, 4, 1)) == 85.0
+        
+        service.cache = {"2025-04-01": 90.0}
+        assert service.get_rate(datetime(2025, 4, 1)) == 90.0
+        
+        service.clear_cache()
+        assert service.get_rate(datetime(2025, 4, 1)) == 85.0
+    
+    def test_get_rate_reads_cache_edits(self, service, sample_rates_file):
+        """Test that direct writes to the public cache are honoured."""
+        service.load_sbi_rates(sample_rates_file)
+        assert service.get_rate(datetime(2025, 4, 1)) == 85.0
+        
+        service.cache["2025-04-01"] = 99.0
+        assert service.get_rate(datetime(2025, 4, 1)) == 99.0
+        
+        service.cache.clear()
+        assert service.get_rate(datetime(2025, 4, 1)) == 85.0
+        assert service.cache == {"2025-04-01": 85.0}
+    
     def test_get_rate_approximate_fallback(self, service):
         """Test approximate rate fallback."""
         # No SBI rates loaded
@@ -95,6 +182,31 @@ class TestExchangeRateService:
         # Should use approximate rate for 2024 Q2
         assert rate == 83.5
     
+    def test_get_rate_outside_approximate_years(self, service):
+        """Test that years without approximate rates use the default rate."""
+        assert service.get_rate(datetime(2019, 3, 1), use_sbi=False) == service.DEFAULT_RATE
+        assert service.get_rate(datetime(2030, 12, 1), use_sbi=False) == service.DEFAULT_RATE
+    
+    def test_approximate_rates_overridable(self, service):
+        """Test that subclasses and patches of APPROXIMATE_RATES are used."""
+        class FlatRateService(ExchangeRateService):
+            APPROXIMATE_RATES = {(2024, 2): 1.0}
+        
+        assert FlatRateService().get_rate(datetime(2024, 6, 15), use_sbi=False) == 1.0
+        assert service.get_rate(datetime(2024, 6, 15), use_sbi=False) == 83.5
+        
+        with patch.object(ExchangeRateService, 'APPROXIMATE_RATES', {(2024, 3): 2.0}):
+            assert ExchangeRateService().get_rate(datetime(2024, 8, 1), use_sbi=False) == 2.0
+        assert ExchangeRateService().get_rate(datetime(2024, 8, 1), use_sbi=False) == 83.5
+    
+    def test_empty_approximate_rates_use_default(self):
+        """Test that an empty APPROXIMATE_RATES falls back to DEFAULT_RATE."""
+        class NoApproxService(ExchangeRateService):
+            APPROXIMATE_RATES = {}
+        
+        assert NoApproxService().get_rate(datetime(2024, 6, 15), use_sbi=False) == NoApproxService.DEFAULT_RATE
+        assert "_approx_table" not in vars(ExchangeRateService)
+    
     def test_get_rates_for_dates(self, service, sample_rates_file):
         """Test getting rates for multiple dates."""
         service.load_sbi_rates(sample_rates_file)
@@ -105,26 +217,70 @@ class TestExchangeRateService:
         assert rates["2025-04-01"] == 85.0
         assert rates["2025-04-02"] == 85.1
     
-    def test_save_and_load_cache(self, service):
+    def test_get_rates_for_dates_any_iterable(self, service, sample_rates_file):
+        """Test that lists, tuples and generators are accepted."""
+        service.load_sbi_rates(sample_rates_file)
+        
+        dates = [datetime(2025, 4, 2), datetime(2025, 4, 1), datetime(2025, 4, 2)]
+        expected = {"2025-04-01": 85.0, "2025-04-02": 85.1}
+        
+        assert service.get_rates_for_dates(dates) == expected
+        assert service.get_rates_for_dates(tuple(dates)) == expected
+        assert service.get_rates_for_dates(d for d in dates) == expected
+    
+    @pytest.mark.parametrize("use_numpy", [True, False])
+    def test_get_rates_for_dates_matches_get_rate(self, service, sample_rates_file, use_numpy):
+        """Test that batched lookups agree with single-date lookups."""
+        from datetime import timedelta
+        from capital_gains import exchange_rates
+        if use_numpy and not exchange_rates.NUMPY_AVAILABLE:
+            pytest.skip("numpy not installed")
+        
+        service.load_sbi_rates(sample_rates_file)
+        dates = {datetime(2025, 3, 15) + timedelta(days=i) for i in range(40)}
+        
+        with patch.object(exchange_rates, 'NUMPY_AVAILABLE', use_numpy):
+            rates = service.get_rates_for_dates(dates)
+        
+        reference = ExchangeRateService()
+        reference.load_sbi_rates(sample_rates_file)
+        for date in dates:
+            assert rates[date.strftime("%Y-%m-%d")] == reference.get_rate(date)
+    
+    def test_get_rates_for_dates_ignores_non_date_keys(self, service):
+        """Test that metadata entries in the rates file don't break batch lookups."""
+        service.sbi_rates = {"2025-04-01": 85.0, "2025-04-02": 85.1, "last_updated": "2025-04-02"}
+        
+        rates = service.get_rates_for_dates([datetime(2025, 4, 1), datetime(2025, 4, 3)])
+        
+        assert rates == {"2025-04-01": 85.0, "2025-04-03": 85.1}
+    
+    def test_sorted_dates_follow_rate_assignment(self, service):
+        """Test that assigning new sbi_rates reaches the nearest-date search."""
+        service.sbi_rates = {"2025-04-01": 85.0}
+        assert service.get_rates_for_dates([datetime(2025, 4, 1), datetime(2025, 4, 10)]) == \
+            {"2025-04-01": 85.0, "2025-04-10": 85.0}
+        
+        # Same size, different key: the sorted arrays must be rebuilt
+        service.sbi_rates = {"2025-04-20": 86.0}
+        service.clear_cache()
+        assert service.get_rates_for_dates([datetime(2025, 4, 15), datetime(2025, 4, 20)]) == \
+            {"2025-04-15": 86.0, "2025-04-20": 86.0}
+    
+    def test_save_and_load_cache(self, service, tmp_path):
         """Test saving cache to file."""
         service.cache = {
             "2025-04-01": 85.0,
             "2025-04-02": 85.1,
         }
         
-        with tempfile.NamedTemporaryFile(mode='w', suffix='.json', delete=False) as f:
-            filepath = f.name
+        filepath = tmp_path / "cache.json"
+        service.save_cache_to_file(str(filepath))
         
-        try:
-            service.save_cache_to_file(filepath)
-            
-            with open(filepath, 'r') as f:
-                saved = json.load(f)
-            
-            assert saved["2025-04-01"] == 85.0
-            assert saved["2025-04-02"] == 85.1
-        finally:
-            os.unlink(filepath)
+        saved = json.loads(filepath.read_text())
+        
+        assert saved["2025-04-01"] == 85.0
+        assert saved["2025-04-02"] == 85.1
     
     def test_clear_cache(self, service):
         """Test clearing the cache."""
@@ -135,12 +291,17 @@ class TestExchangeRateService:
         assert len(service.cache) == 0
     
     def test_get_cached_rates_copy(self, service):
-        """Test that get_cached_rates returns a copy."""
+        """Test that get_cached_rates returns a read-only view."""
         service.cache = {"2025-04-01": 85.0}
         
         cached = service.get_cached_rates()
-        cached["2025-04-02"] = 86.0  # Modify the copy
+        with pytest.raises(TypeError):
+            cached["2025-04-02"] = 86.0
         
         # Original should be unchanged
         assert "2025-04-02" not in service.cache
+        
+        # The view tracks later lookups without another call
+        service.cache["2025-04-03"] = 85.2
+        assert cached["2025-04-03"] == 85.2
 
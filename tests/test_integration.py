@@ -9,6 +9,7 @@ import pytest
 import json
 import tempfile
 import os
+import sys
 from datetime import datetime
 
 from capital_gains import (
@@ -374,7 +375,7 @@ class TestEndToEndReporting:
             
             # Verify Excel structure
             from openpyxl import load_workbook
-            wb = load_workbook(filepath)
+            wb = load_workbook(filepath, read_only=True, data_only=True, keep_links=False)
             
             # All expected sheets should exist
             # Note: "Indian Stocks" is mapped to "Groww Stocks" for display
@@ -429,7 +430,7 @@ class TestInterfaceCompliance:
 class TestFileBasedWorkflow:
     """Integration tests using actual file I/O."""
     
-    def test_sbi_rates_file_loading(self):
+    def test_sbi_rates_file_loading(self, tmp_path):
         """Test loading SBI rates from a temp file."""
         rates_data = {
             "2025-04-01": 85.0,
@@ -437,24 +438,20 @@ class TestFileBasedWorkflow:
             "2025-04-03": 85.2,
         }
         
-        with tempfile.NamedTemporaryFile(mode='w', suffix='.json', delete=False) as f:
-            json.dump(rates_data, f)
-            filepath = f.name
+        filepath = tmp_path / "rates.json"
+        filepath.write_text(json.dumps(rates_data))
         
-        try:
-            service = ExchangeRateService()
-            result = service.load_sbi_rates(filepath)
-            
-            assert result is True
-            assert len(service.sbi_rates) == 3
-            
-            # Test rate retrieval
-            rate = service.get_rate(datetime(2025, 4, 1))
-            assert rate == 85.0
-        finally:
-            os.unlink(filepath)
+        service = ExchangeRateService()
+        result = service.load_sbi_rates(str(filepath))
+        
+        assert result is True
+        assert len(service.sbi_rates) == 3
+        
+        # Test rate retrieval
+        rate = service.get_rate(datetime(2025, 4, 1))
+        assert rate == 85.0
     
-    def test_json_transaction_file_processing(self):
+    def test_json_transaction_file_processing(self, tmp_path):
         """Test processing EAC JSON file."""
         json_data = {
             "Transactions": [
@@ -480,22 +477,125 @@ class TestFileBasedWorkflow:
             ]
         }
         
-        with tempfile.NamedTemporaryFile(mode='w', suffix='.json', delete=False) as f:
-            json.dump(json_data, f)
-            filepath = f.name
+        filepath = tmp_path / "eac.json"
+        filepath.write_text(json.dumps(json_data))
         
-        try:
-            # Load and parse
-            with open(filepath, 'r') as f:
-                data = json.load(f)
-            
-            parser = SchwabEACParser()
-            transactions = parser.parse(data["Transactions"], datetime(2025, 4, 1))
-            
-            assert len(transactions) == 1
-            assert transactions[0].symbol == "AAPL"
-            assert transactions[0].grant_id == "TEST-001"
-        finally:
-            os.unlink(filepath)
+        # Load and parse
+        data = json.loads(filepath.read_text())
+        
+        parser = SchwabEACParser()
+        transactions = parser.parse(data["Transactions"], datetime(2025, 4, 1))
+        
+        assert len(transactions) == 1
+        assert transactions[0].symbol == "AAPL"
+        assert transactions[0].grant_id == "TEST-001"
+    
+    @pytest.mark.parametrize("backend", ["ijson", "orjson", "json"])
+    def test_main_schwab_loader(self, backend, capsys, tmp_path):
+        """Test main's Schwab loader with each JSON decoding backend."""
+        import main
+        from unittest.mock import patch
+        from capital_gains.parsers import schwab
+        
+        if backend == "ijson" and not schwab.IJSON_AVAILABLE:
+            pytest.skip("ijson not installed")
+        if backend == "orjson" and not schwab.ORJSON_AVAILABLE:
+            pytest.skip("orjson not installed")
+        
+        # EAC exports are the ones that get streamed (its parse() is lazy)
+        json_data = {
+            "Transactions": [
+                {"Action": "Deposit", "Date": "01/15/2025", "Symbol": "AAPL"},
+                {
+                    "Action": "Sale",
+                    "Date": "05/01/2025",
+                    "Symbol": "AAPL",
+                    "FeesAndCommissions": "$1.00",
+                    "TransactionDetails": [
+                        {
+                            "Details": {
+                                "Type": "RS",
+                                "Shares": "10",
+                                "SalePrice": "$250.00",
+                                "GrossProceeds": "$2500.00",
+                                "VestDate": "01/15/2023",
+                                "VestFairMarketValue": "$200.00",
+                                "GrantId": "TEST-001"
+                            }
+                        }
+                    ]
+                },
+            ]
+        }
+        
+        filepath = tmp_path / "eac.json"
+        filepath.write_text(json.dumps(json_data))
+        
+        with patch.object(schwab, 'IJSON_AVAILABLE', backend == "ijson"), \
+                patch.object(schwab, 'ORJSON_AVAILABLE', backend == "orjson"), \
+                patch('main.JSON_STREAMING_THRESHOLD_BYTES', 0):
+            sales = main.load_schwab_transactions(
+                str(filepath), "EAC", SchwabEACParser(), datetime(2025, 4, 1))
+        
+        assert len(sales) == 1
+        assert sales[0].shares == 10
+        assert sales[0].sale_price_usd == 250.0
+        assert "Total transactions in file: 2" in capsys.readouterr().out
 
 
+class TestParallelLoaders:
+    """Tests for main's parallel file loading."""
+    
+    @staticmethod
+    def _loader(name, delay, fail=False):
+        """Loader that logs, waits, then returns its name or raises."""
+        import time
+        
+        def load(out):
+            print(f"[+] Loading {name}", file=out)
+            time.sleep(delay)
+            if fail:
+                raise ValueError(f"bad {name}")
+            print(f"    done {name}", file=out)
+            return name
+        return load
+    
+    def test_output_replayed_in_submission_order(self, capsys):
+        """Test that results and log lines follow loader order, not finish order."""
+        import main
+        
+        loaders = [self._loader("a", 0.05), self._loader("b", 0.0), self._loader("c", 0.02)]
+        
+        assert main.run_loaders_in_parallel(loaders) == ["a", "b", "c"]
+        assert capsys.readouterr().out == (
+            "[+] Loading a\n    done a\n"
+            "[+] Loading b\n    done b\n"
+            "[+] Loading c\n    done c\n"
+        )
+    
+    def test_output_replayed_when_loader_raises(self, capsys):
+        """Test that a failing loader's log lines are printed before the error propagates."""
+        import main
+        
+        stdout = sys.stdout
+        loaders = [self._loader("a", 0.02), self._loader("b", 0.0, fail=True)]
+        
+        with pytest.raises(ValueError, match="bad b"):
+            main.run_loaders_in_parallel(loaders)
+        
+        assert sys.stdout is stdout
+        assert capsys.readouterr().out == "[+] Loading a\n    done a\n[+] Loading b\n"
+    
+    def test_parser_messages_follow_their_loader(self, capsys):
+        """Test that warnings from a parser go to the buffer of the loader that built it."""
+        import main
+        
+        def load(out):
+            parser = SchwabIndividualParser(out)
+            sale = {"Action": "Sell", "Date": "05/01/2025", "Symbol": "VTI",
+                    "Quantity": "1", "Price": "$1.00"}
+            return parser.parse([sale], datetime(2025, 4, 1))
+        
+        assert main.run_loaders_in_parallel([self._loader("a", 0.05), load]) == ["a", []]
+        output = capsys.readouterr().out
+        assert output.index("done a") < output.index("have no matching purchase")
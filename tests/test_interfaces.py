@@ -4,34 +4,38 @@ Unit tests for interface definitions.
 
 import pytest
 from datetime import datetime
-from typing import List, Dict
+from types import MappingProxyType
+from typing import List, Dict, Mapping, NamedTuple
 
 from capital_gains.interfaces import (
     IExchangeRateProvider,
     ITransactionParser,
-    IIndianGainsParser,
-    IGainsCalculator,
-    ITaxCalculator,
-    IReporter,
     BaseTransactionParser,
     BaseReporter,
 )
-from capital_gains.models import SaleTransaction, IndianGains, TaxData
+from capital_gains.models import SaleTransaction
+
+# datetimes are immutable, so tests can share these
+SALE_DATE = datetime(2025, 4, 15)
+START_DATE = datetime(2025, 4, 1)
+
+# Shared read-only default for providers built without rates
+_NO_RATES: Mapping[str, float] = MappingProxyType({})
 
 
 class MockExchangeRateProvider:
     """Mock implementation of IExchangeRateProvider for testing."""
     
     def __init__(self, rates: Dict[str, float] = None):
-        self.rates = rates or {}
+        self.rates = rates if rates is not None else _NO_RATES
     
     def get_rate(self, date: datetime, use_sbi: bool = True) -> float:
-        date_str = date.strftime("%Y-%m-%d")
+        date_str = date.date().isoformat()
         return self.rates.get(date_str, 85.0)
     
     def get_rates_for_dates(self, dates: set, use_sbi: bool = True) -> Dict[str, float]:
         return {
-            date.strftime("%Y-%m-%d"): self.get_rate(date, use_sbi)
+            (date_str := date.date().isoformat()): self.rates.get(date_str, 85.0)
             for date in dates
         }
 
@@ -43,11 +47,17 @@ class MockTransactionParser(BaseTransactionParser):
         return []
 
 
+class MockReport(NamedTuple):
+    """Report returned by MockReporter."""
+    report: str
+    txn_count: int
+
+
 class MockReporter(BaseReporter):
     """Mock implementation of BaseReporter for testing."""
     
     def generate(self, transactions, indian_gains=None, tax_data=None, **kwargs):
-        return {"report": "generated", "txn_count": len(transactions)}
+        return MockReport("generated", len(transactions))
 
 
 class TestProtocolCompliance:
@@ -59,11 +69,11 @@ class TestProtocolCompliance:
         
         assert isinstance(provider, IExchangeRateProvider)
         
-        rate = provider.get_rate(datetime(2025, 4, 15))
+        rate = provider.get_rate(SALE_DATE)
         assert rate == 85.5
         
-        rates = provider.get_rates_for_dates({datetime(2025, 4, 15)})
-        assert "2025-04-15" in rates
+        rates = provider.get_rates_for_dates({SALE_DATE})
+        assert list(rates) == [SALE_DATE.strftime("%Y-%m-%d")]
     
     def test_mock_parser_is_compliant(self):
         """Test that mock parser implements ITransactionParser protocol."""
@@ -71,7 +81,7 @@ class TestProtocolCompliance:
         
         assert isinstance(parser, ITransactionParser)
         
-        result = parser.parse([], datetime(2025, 4, 1))
+        result = parser.parse([], START_DATE)
         assert isinstance(result, list)
     
     def test_base_transaction_parser_long_term_check(self):
@@ -91,27 +101,16 @@ class TestBaseClasses:
         """Test BaseTransactionParser default constants."""
         assert BaseTransactionParser.LONG_TERM_DAYS == 730
     
-    def test_mock_reporter_implements_generate(self):
+    def test_mock_reporter_implements_generate(self, sample_sale_transaction):
         """Test that mock reporter implements generate method."""
         reporter = MockReporter()
         
-        transactions = [
-            SaleTransaction(
-                sale_date=datetime(2025, 4, 15),
-                acquisition_date=datetime(2023, 1, 15),
-                stock_type="RS",
-                symbol="AAPL",
-                shares=100,
-                sale_price_usd=150.0,
-                acquisition_price_usd=120.0,
-                gross_proceeds_usd=15000.0,
-            )
-        ]
+        transactions = [sample_sale_transaction]
         
         result = reporter.generate(transactions)
         
-        assert result["report"] == "generated"
-        assert result["txn_count"] == 1
+        assert result.report == "generated"
+        assert result.txn_count == 1
 
 
 class TestInterfaceUsability:
@@ -129,7 +128,7 @@ class TestInterfaceUsability:
         
         # Can use mock provider
         mock_provider = MockExchangeRateProvider({"2025-04-15": 86.0})
-        rate = calculate_with_provider(mock_provider, datetime(2025, 4, 15))
+        rate = calculate_with_provider(mock_provider, SALE_DATE)
         
         assert rate == 86.0
     
@@ -145,29 +144,49 @@ class TestInterfaceUsability:
             return parser.parse(data, start_date)
         
         parser = MockTransactionParser()
-        result = process_transactions(parser, [], datetime(2025, 4, 1))
+        result = process_transactions(parser, [], START_DATE)
         
         assert isinstance(result, list)
 
 
+class FixedRateProvider:
+    """Custom exchange rate provider that always returns a fixed rate."""
+    
+    def __init__(self, fixed_rate: float = 85.0):
+        self.fixed_rate = fixed_rate
+    
+    def get_rate(self, date: datetime, use_sbi: bool = True) -> float:
+        return self.fixed_rate
+    
+    def get_rates_for_dates(self, dates: set, use_sbi: bool = True) -> Dict[str, float]:
+        return {d.date().isoformat(): self.fixed_rate for d in dates}
+
+
+class SimpleParser(BaseTransactionParser):
+    """Custom parser that creates a transaction from each item."""
+    
+    def parse(self, data: list, start_date: datetime) -> List[SaleTransaction]:
+        items = [item for item in data if item.get("date") >= start_date]
+        return [
+            SaleTransaction(
+                sale_date=item["date"],
+                acquisition_date=item.get("acq_date", start_date),
+                stock_type="TRADE",
+                symbol=item.get("symbol", "UNKNOWN"),
+                shares=item.get("shares", 0),
+                sale_price_usd=item.get("price", 0.0),
+                acquisition_price_usd=item.get("cost", 0.0),
+                gross_proceeds_usd=item.get("proceeds", 0.0),
+            )
+            for item in items
+        ]
+
+
 class TestCustomImplementations:
     """Tests for creating custom implementations of interfaces."""
     
     def test_custom_exchange_rate_provider(self):
         """Test creating a custom exchange rate provider."""
-        
-        class FixedRateProvider:
-            """Always returns a fixed rate."""
-            
-            def __init__(self, fixed_rate: float = 85.0):
-                self.fixed_rate = fixed_rate
-            
-            def get_rate(self, date: datetime, use_sbi: bool = True) -> float:
-                return self.fixed_rate
-            
-            def get_rates_for_dates(self, dates: set, use_sbi: bool = True) -> Dict[str, float]:
-                return {d.strftime("%Y-%m-%d"): self.fixed_rate for d in dates}
-        
         provider = FixedRateProvider(90.0)
         
         # Should implement the protocol
@@ -179,31 +198,11 @@ class TestCustomImplementations:
     
     def test_custom_transaction_parser(self):
         """Test creating a custom transaction parser."""
-        
-        class SimpleParser(BaseTransactionParser):
-            """Simple parser that creates a transaction from each item."""
-            
-            def parse(self, data: list, start_date: datetime) -> List[SaleTransaction]:
-                transactions = []
-                for item in data:
-                    if item.get("date") >= start_date:
-                        transactions.append(SaleTransaction(
-                            sale_date=item["date"],
-                            acquisition_date=item.get("acq_date", start_date),
-                            stock_type="TRADE",
-                            symbol=item.get("symbol", "UNKNOWN"),
-                            shares=item.get("shares", 0),
-                            sale_price_usd=item.get("price", 0.0),
-                            acquisition_price_usd=item.get("cost", 0.0),
-                            gross_proceeds_usd=item.get("proceeds", 0.0),
-                        ))
-                return transactions
-        
         parser = SimpleParser()
         
         data = [
             {
-                "date": datetime(2025, 4, 15),
+                "date": SALE_DATE,
                 "symbol": "TEST",
                 "shares": 10,
                 "price": 100.0,
@@ -212,7 +211,7 @@ class TestCustomImplementations:
             }
         ]
         
-        result = parser.parse(data, datetime(2025, 4, 1))
+        result = parser.parse(data, START_DATE)
         
         assert len(result) == 1
         assert result[0].symbol == "TEST"
@@ -3,94 +3,63 @@ Unit tests for data models.
 """
 
 import pytest
+from dataclasses import replace
 from datetime import datetime
 
 from capital_gains.models import (
-    SaleTransaction,
     StockLot,
     IndianGains,
     TaxData,
     QuarterlyData,
 )
 
+# datetimes are immutable, so tests can share this
+ACQ_DATE = datetime(2023, 1, 15)
+
 
 class TestSaleTransaction:
     """Tests for SaleTransaction dataclass."""
     
-    def test_creation(self):
+    def test_creation(self, sample_sale_transaction):
         """Test basic transaction creation."""
-        txn = SaleTransaction(
-            sale_date=datetime(2025, 4, 15),
-            acquisition_date=datetime(2023, 1, 15),
-            stock_type="RS",
-            symbol="AAPL",
-            shares=100,
-            sale_price_usd=150.0,
-            acquisition_price_usd=120.0,
-            gross_proceeds_usd=15000.0,
-            grant_id="G12345",
-            source="EAC"
-        )
+        txn = replace(sample_sale_transaction, grant_id="G12345", source="EAC")
         
         assert txn.symbol == "AAPL"
         assert txn.shares == 100
         assert txn.sale_price_usd == 150.0
+        assert txn.grant_id == "G12345"
         assert txn.source == "EAC"
     
-    def test_get_type_label(self):
+    @pytest.mark.parametrize("stock_type,label", [
+        ("RS", "RSU"),
+        ("ESPP", "ESPP"),
+        ("TRADE", "Trade"),
+    ])
+    def test_get_type_label(self, sample_sale_transaction, stock_type, label):
         """Test stock type label conversion."""
-        txn = SaleTransaction(
-            sale_date=datetime(2025, 4, 15),
-            acquisition_date=datetime(2023, 1, 15),
-            stock_type="RS",
-            symbol="AAPL",
-            shares=100,
-            sale_price_usd=150.0,
-            acquisition_price_usd=120.0,
-            gross_proceeds_usd=15000.0,
-        )
-        
-        assert txn.get_type_label() == "RSU"
+        txn = replace(sample_sale_transaction, stock_type=stock_type)
         
-        txn.stock_type = "ESPP"
-        assert txn.get_type_label() == "ESPP"
-        
-        txn.stock_type = "TRADE"
-        assert txn.get_type_label() == "Trade"
+        assert txn.get_type_label() == label
     
-    def test_holding_period_str(self):
+    def test_holding_period_str(self, sample_sale_transaction):
         """Test holding period string formatting."""
-        txn = SaleTransaction(
-            sale_date=datetime(2025, 4, 15),
-            acquisition_date=datetime(2023, 1, 15),
-            stock_type="RS",
-            symbol="AAPL",
-            shares=100,
-            sale_price_usd=150.0,
-            acquisition_price_usd=120.0,
-            gross_proceeds_usd=15000.0,
+        txn = replace(
+            sample_sale_transaction,
             holding_period_days=820  # ~2 years 3 months
         )
         
         assert txn.get_holding_period_str() == "2y 3m"
     
-    def test_total_properties(self):
+    def test_total_properties(self, sample_sale_transaction):
         """Test total INR calculation properties."""
-        txn = SaleTransaction(
-            sale_date=datetime(2025, 4, 15),
-            acquisition_date=datetime(2023, 1, 15),
-            stock_type="RS",
-            symbol="AAPL",
-            shares=100,
-            sale_price_usd=150.0,
-            acquisition_price_usd=120.0,
-            gross_proceeds_usd=15000.0,
+        txn = replace(
+            sample_sale_transaction,
             sale_price_inr=12750.0,  # 150 * 85
             acquisition_price_inr=9840.0,  # 120 * 82
         )
         
-        assert txn.total_sale_inr == 1275000.0  # 100 * 12750
-        assert txn.total_acquisition_inr == 984000.0  # 100 * 9840
+        assert txn.total_sale_inr == pytest.approx(1275000.0, rel=1e-9)  # 100 * 12750
+        assert txn.total_acquisition_inr == pytest.approx(984000.0, rel=1e-9)  # 100 * 9840
 
 
 class TestStockLot:
@@ -99,7 +68,7 @@ class TestStockLot:
     def test_creation(self):
         """Test stock lot creation with auto-remaining."""
         lot = StockLot(
-            purchase_date=datetime(2023, 1, 15),
+            purchase_date=ACQ_DATE,
             symbol="VTI",
             quantity=50,
             price=200.0
@@ -112,7 +81,7 @@ class TestStockLot:
     def test_remaining_updates(self):
         """Test that remaining can be updated."""
         lot = StockLot(
-            purchase_date=datetime(2023, 1, 15),
+            purchase_date=ACQ_DATE,
             symbol="VTI",
             quantity=50,
             price=200.0
@@ -145,19 +114,6 @@ class TestIndianGains:
         )
         
         assert gains.total == 75000.0
-    
-    def test_to_dict(self):
-        """Test dictionary conversion."""
-        gains = IndianGains(
-            source="Indian Stocks",
-            ltcg=50000.0,
-            stcg=25000.0
-        )
-        
-        d = gains.to_dict()
-        assert d['source'] == "Indian Stocks"
-        assert d['ltcg'] == 50000.0
-        assert d['stcg'] == 25000.0
 
 
 class TestTaxData:
@@ -171,19 +127,18 @@ class TestTaxData:
         assert tax.ltcg_rebate == 125000.0
         assert tax.indian_ltcg_rate == 0.1495
         assert tax.foreign_stcg_rate == 0.39
+
+
+class TestToDict:
+    """Tests for to_dict() on the summary dataclasses."""
     
-    def test_to_dict(self):
-        """Test dictionary conversion."""
-        tax = TaxData(
-            schwab_ltcg=100000.0,
-            schwab_stcg=50000.0,
-            total_tax=25000.0
-        )
-        
-        d = tax.to_dict()
-        assert d['schwab_ltcg'] == 100000.0
-        assert d['schwab_stcg'] == 50000.0
-        assert d['total_tax'] == 25000.0
+    @pytest.mark.parametrize("cls,kwargs", [
+        (IndianGains, {"source": "Indian Stocks", "ltcg": 50000.0, "stcg": 25000.0}),
+        (TaxData, {"schwab_ltcg": 100000.0, "schwab_stcg": 50000.0, "total_tax": 25000.0}),
+    ])
+    def test_to_dict(self, cls, kwargs, assert_subdict):
+        """Test that constructor fields come back out of to_dict()."""
+        assert_subdict(cls(**kwargs).to_dict(), kwargs)
 
 
 class TestQuarterlyData:
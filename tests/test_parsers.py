@@ -1,190 +1,276 @@
 """
 Unit tests for transaction parsers.
+
+The tests share no mutable state and only write files under pytest's
+tmp_path/tmp_path_factory directories, which are per worker, so the
+module can run with pytest-xdist (pytest -n auto).
 """
 
 import pytest
-import os
-import tempfile
-from datetime import datetime
+import functools
+import io
+import json
+from datetime import datetime, timedelta
+from typing import Any, Dict, List, Tuple
 
 from capital_gains.parsers.schwab import SchwabEACParser, SchwabIndividualParser
-from capital_gains.parsers.indian import ZerodhaPnLParser
+from capital_gains.parsers.indian import ZerodhaPnLParser, OPENPYXL_AVAILABLE
+from capital_gains.reports.excel import XLSXWRITER_AVAILABLE
+
+# Statement start date shared by the Schwab parser tests
+START_DATE = datetime(2025, 4, 1)
+
+# Single EAC sales shared by the parametrized parse test
+EAC_RSU_SALE = {
+    "Action": "Sale",
+    "Date": "04/15/2025",
+    "Symbol": "AAPL",
+    "FeesAndCommissions": "$10.00",
+    "TransactionDetails": [
+        {
+            "Details": {
+                "Type": "RS",
+                "Shares": "100",
+                "SalePrice": "$150.00",
+                "GrossProceeds": "$15000.00",
+                "VestDate": "01/15/2023",
+                "VestFairMarketValue": "$120.00",
+                "GrantId": "G12345"
+            }
+        }
+    ]
+}
+
+EAC_ESPP_SALE = {
+    "Action": "Sale",
+    "Date": "04/15/2025",
+    "Symbol": "AAPL",
+    "FeesAndCommissions": "$5.00",
+    "TransactionDetails": [
+        {
+            "Details": {
+                "Type": "ESPP",
+                "Shares": "50",
+                "SalePrice": "$150.00",
+                "GrossProceeds": "$7500.00",
+                "PurchaseDate": "01/15/2024",
+                "PurchaseFairMarketValue": "$130.00"
+            }
+        }
+    ]
+}
+
+
+# One sale split across two vest lots (100 + 200 shares) for fee proration
+EAC_TWO_LOT_SALE = {
+    **EAC_RSU_SALE,
+    "FeesAndCommissions": "$30.00",
+    "TransactionDetails": [
+        EAC_RSU_SALE["TransactionDetails"][0],
+        {
+            "Details": {
+                "Type": "RS",
+                "Shares": "200",
+                "SalePrice": "$150.00",
+                "GrossProceeds": "$30000.00",
+                "VestDate": "01/15/2022",
+                "VestFairMarketValue": "$100.00"
+            }
+        }
+    ]
+}
+
+
+def _gen_fifo_transactions(n_lots: int, lot_size: int, base_price: float) -> List[Dict[str, str]]:
+    """
+    Daily VTI buys of lot_size shares at rising prices, then one sale of all of them.
+    
+    Used by the FIFO scaling test; prices step by $0.25 so each lot's
+    cost basis identifies it.
+    """
+    first_buy = datetime(1995, 1, 2)
+    buys = [
+        {
+            "Action": "Buy",
+            "Date": (first_buy + timedelta(days=i)).strftime("%m/%d/%Y"),
+            "Symbol": "VTI",
+            "Quantity": str(lot_size),
+            "Price": f"${base_price + i * 0.25:.2f}",
+        }
+        for i in range(n_lots)
+    ]
+    sale = {
+        "Action": "Sell",
+        "Date": "04/15/2025",
+        "Symbol": "VTI",
+        "Quantity": str(n_lots * lot_size),
+        "Price": "$250.00",
+        "Fees & Comm": "$10.00",
+    }
+    return buys + [sale]
+
 
-# Check if openpyxl is available for Zerodha tests
-try:
-    from openpyxl import Workbook
-    OPENPYXL_AVAILABLE = True
-except ImportError:
-    OPENPYXL_AVAILABLE = False
+# Sample Zerodha P&L sheet as {(row, first column): row values}, 1-based like Excel
+ZERODHA_SAMPLE_ROWS = {
+    # Row 11: Statement title
+    (11, 2): ["P&L Statement for Equity from 2025-04-01 to 2025-12-15"],
+    
+    # Row 13: Summary header
+    (13, 2): ["Summary"],
+    
+    # Row 15-18: Summary values
+    (15, 2): ["Charges", 1000.50],
+    (16, 2): ["Other Credit & Debit", -100.25],
+    (17, 2): ["Realized P&L", 50000.75],
+    (18, 2): ["Unrealized P&L", -10000.00],
+    
+    # Row 21: Charges section
+    (21, 2): ["Charges"],
+    
+    # Row 23: Account Head header
+    (23, 2): ["Account Head", "Amount"],
+    
+    # Row 24-27: Charges breakdown
+    (24, 2): ["Brokerage - Z", 250.50],
+    (25, 2): ["Exchange Transaction Charges - Z", 150.25],
+    (26, 2): ["Securities Transaction Tax - Z", 500.00],
+    (27, 2): ["Stamp Duty - Z", 100.00],
+    
+    # Row 38: Transaction header
+    (38, 2): [
+        "Symbol", "ISIN", "Quantity", "Buy Value", "Sell Value",
+        "Realized P&L", "Realized P&L Pct.", "Previous Closing Price",
+        "Open Quantity", "Open Quantity Type", "Open Value",
+        "Unrealized P&L", "Unrealized P&L Pct.",
+    ],
+    
+    # Row 39-40: Transaction data
+    (39, 2): ["RELIANCE", "INE002A01018", 100, 250000.00, 280000.00, 30000.00, 12.0, 0, 0],
+    (40, 2): ["TCS", "INE467B01029", 50, 200000.00, 220000.75, 20000.75, 10.0, 0, 0],
+}
+
+
+def _build_xlsx(rows: Dict[Tuple[int, int], List[Any]]) -> bytes:
+    """Write {(row, first column): values} (1-based) to in-memory .xlsx bytes."""
+    import xlsxwriter
+    
+    buffer = io.BytesIO()
+    wb = xlsxwriter.Workbook(buffer, {'in_memory': True})
+    ws = wb.add_worksheet()
+    for (row, col), values in rows.items():
+        ws.write_row(row - 1, col - 1, values)
+    wb.close()
+    return buffer.getvalue()
+
+
+@functools.lru_cache(maxsize=None)
+def _sample_zerodha_xlsx() -> bytes:
+    """Sample Zerodha workbook bytes, built once per session."""
+    return _build_xlsx(ZERODHA_SAMPLE_ROWS)
 
 
 class TestSchwabEACParser:
     """Tests for SchwabEACParser class."""
     
-    @pytest.fixture
+    @pytest.fixture(scope="class")
     def parser(self):
-        """Create parser instance."""
+        """Create parser instance (stateless, shared by the class)."""
         return SchwabEACParser()
     
-    def test_parse_rsu_sale(self, parser):
-        """Test parsing RSU sale transaction."""
-        transactions = [
-            {
-                "Action": "Sale",
-                "Date": "04/15/2025",
-                "Symbol": "AAPL",
-                "FeesAndCommissions": "$10.00",
-                "TransactionDetails": [
-                    {
-                        "Details": {
-                            "Type": "RS",
-                            "Shares": "100",
-                            "SalePrice": "$150.00",
-                            "GrossProceeds": "$15000.00",
-                            "VestDate": "01/15/2023",
-                            "VestFairMarketValue": "$120.00",
-                            "GrantId": "G12345"
-                        }
-                    }
-                ]
-            }
-        ]
-        
-        start_date = datetime(2025, 4, 1)
-        result = parser.parse(transactions, start_date)
-        
-        assert len(result) == 1
-        txn = result[0]
-        assert txn.symbol == "AAPL"
-        assert txn.shares == 100
-        assert txn.sale_price_usd == 150.0
-        assert txn.acquisition_price_usd == 120.0
-        assert txn.stock_type == "RS"
-        assert txn.source == "EAC"
-        assert txn.grant_id == "G12345"
-        assert txn.is_long_term  # >2 years
-    
-    def test_parse_espp_sale(self, parser):
-        """Test parsing ESPP sale transaction."""
-        transactions = [
-            {
-                "Action": "Sale",
-                "Date": "04/15/2025",
-                "Symbol": "AAPL",
-                "FeesAndCommissions": "$5.00",
-                "TransactionDetails": [
-                    {
-                        "Details": {
-                            "Type": "ESPP",
-                            "Shares": "50",
-                            "SalePrice": "$150.00",
-                            "GrossProceeds": "$7500.00",
-                            "PurchaseDate": "01/15/2024",
-                            "PurchaseFairMarketValue": "$130.00"
-                        }
-                    }
-                ]
-            }
-        ]
-        
-        start_date = datetime(2025, 4, 1)
-        result = parser.parse(transactions, start_date)
-        
-        assert len(result) == 1
-        txn = result[0]
-        assert txn.stock_type == "ESPP"
-        assert txn.acquisition_price_usd == 130.0
-        assert not txn.is_long_term  # <2 years
-    
-    def test_skip_non_sale_transactions(self, parser):
-        """Test that non-sale transactions are skipped."""
-        transactions = [
+    @pytest.mark.parametrize("txns, expected_len, expected", [
+        pytest.param([EAC_RSU_SALE], 1, {
+            "symbol": "AAPL",
+            "shares": 100,
+            "sale_price_usd": 150.0,
+            "acquisition_price_usd": 120.0,
+            "stock_type": "RS",
+            "source": "EAC",
+            "grant_id": "G12345",
+            "is_long_term": True,  # >2 years
+        }, id="rsu_sale"),
+        pytest.param([EAC_ESPP_SALE], 1, {
+            "stock_type": "ESPP",
+            "acquisition_price_usd": 130.0,
+            "is_long_term": False,  # <2 years
+        }, id="espp_sale"),
+        pytest.param([
             {"Action": "Deposit", "Date": "04/15/2025"},
             {"Action": "Dividend", "Date": "04/15/2025"},
-        ]
-        
-        start_date = datetime(2025, 4, 1)
-        result = parser.parse(transactions, start_date)
-        
-        assert len(result) == 0
+        ], 0, None, id="non_sale"),
+        pytest.param(
+            [{**EAC_RSU_SALE, "Date": "03/15/2025"}],  # Before start date
+            0,
+            None,
+            id="before_start_date",
+        ),
+    ])
+    def test_parse(self, parser, txns, expected_len, expected):
+        """Test which transactions become sales and the fields they carry."""
+        result = parser.parse(txns, START_DATE)
+        
+        assert len(result) == expected_len
+        if expected:
+            txn = result[0]
+            for attr, value in expected.items():
+                assert getattr(txn, attr) == value, attr
     
-    def test_skip_transactions_before_start_date(self, parser):
-        """Test filtering by start date."""
-        transactions = [
-            {
-                "Action": "Sale",
-                "Date": "03/15/2025",  # Before start date
-                "Symbol": "AAPL",
-                "FeesAndCommissions": "$10.00",
-                "TransactionDetails": [
-                    {
-                        "Details": {
-                            "Type": "RS",
-                            "Shares": "100",
-                            "SalePrice": "$150.00",
-                            "GrossProceeds": "$15000.00",
-                            "VestDate": "01/15/2023",
-                            "VestFairMarketValue": "$120.00"
-                        }
-                    }
-                ]
-            }
-        ]
-        
-        start_date = datetime(2025, 4, 1)
-        result = parser.parse(transactions, start_date)
-        
-        assert len(result) == 0
+    def test_numeric_amounts(self, parser):
+        """Test that numeric amounts parse the same as '$' strings."""
+        numeric_sale = {
+            **EAC_RSU_SALE,
+            "FeesAndCommissions": 10.0,
+            "TransactionDetails": [{"Details": {
+                **EAC_RSU_SALE["TransactionDetails"][0]["Details"],
+                "Shares": 100,
+                "SalePrice": 150.0,
+                "GrossProceeds": 15000.0,
+                "VestFairMarketValue": 120.0,
+            }}],
+        }
+        as_strings = parser.parse([EAC_RSU_SALE], START_DATE)
+        as_numbers = parser.parse([numeric_sale], START_DATE)
+        
+        assert as_numbers == as_strings
+        assert as_numbers[0].sale_price_usd == 150.0
     
     def test_proportional_fee_distribution(self, parser):
         """Test that fees are distributed proportionally across lots."""
-        transactions = [
-            {
-                "Action": "Sale",
-                "Date": "04/15/2025",
-                "Symbol": "AAPL",
-                "FeesAndCommissions": "$30.00",
-                "TransactionDetails": [
-                    {
-                        "Details": {
-                            "Type": "RS",
-                            "Shares": "100",
-                            "SalePrice": "$150.00",
-                            "GrossProceeds": "$15000.00",
-                            "VestDate": "01/15/2023",
-                            "VestFairMarketValue": "$120.00"
-                        }
-                    },
-                    {
-                        "Details": {
-                            "Type": "RS",
-                            "Shares": "200",
-                            "SalePrice": "$150.00",
-                            "GrossProceeds": "$30000.00",
-                            "VestDate": "01/15/2022",
-                            "VestFairMarketValue": "$100.00"
-                        }
-                    }
-                ]
-            }
-        ]
-        
-        start_date = datetime(2025, 4, 1)
-        result = parser.parse(transactions, start_date)
+        result = parser.parse([EAC_TWO_LOT_SALE], START_DATE)
         
         assert len(result) == 2
         # First lot (100 shares) should get 1/3 of fees
         assert result[0].fees_and_commissions_usd == pytest.approx(10.0)
         # Second lot (200 shares) should get 2/3 of fees
         assert result[1].fees_and_commissions_usd == pytest.approx(20.0)
+    
+    @pytest.mark.parametrize("stream", [True, False])
+    def test_read_transactions(self, parser, stream):
+        """Test parsing records read straight from an open JSON export."""
+        from capital_gains.parsers import schwab
+        if stream and not schwab.IJSON_AVAILABLE:
+            pytest.skip("ijson not installed")
+        
+        transactions = [
+            {"Action": "Deposit", "Date": "04/10/2025", "Symbol": "AAPL"},
+            EAC_RSU_SALE,
+        ]
+        export = io.BytesIO(json.dumps({"Transactions": transactions}).encode())
+        
+        records = parser.read_transactions(export, stream=stream)
+        result = parser.parse(records, START_DATE)
+        
+        # Streamed records reach parse() one at a time, never as a full list
+        assert isinstance(records, list) is not stream
+        assert result == parser.parse(transactions, START_DATE)
+        assert len(result) == 1
 
 
 class TestSchwabIndividualParser:
     """Tests for SchwabIndividualParser class."""
     
-    @pytest.fixture
+    @pytest.fixture(scope="class")
     def parser(self):
-        """Create parser instance."""
+        """Create parser instance (stateless, shared by the class)."""
         return SchwabIndividualParser()
     
     def test_parse_buy_and_sell_fifo(self, parser):
@@ -214,8 +300,7 @@ class TestSchwabIndividualParser:
             }
         ]
         
-        start_date = datetime(2025, 4, 1)
-        result = parser.parse(transactions, start_date)
+        result = parser.parse(transactions, START_DATE)
         
         assert len(result) == 1
         txn = result[0]
@@ -254,8 +339,7 @@ class TestSchwabIndividualParser:
             }
         ]
         
-        start_date = datetime(2025, 4, 1)
-        result = parser.parse(transactions, start_date)
+        result = parser.parse(transactions, START_DATE)
         
         # Should create 2 transactions (from 2 lots)
         assert len(result) == 2
@@ -268,6 +352,20 @@ class TestSchwabIndividualParser:
         assert result[1].shares == 20
         assert result[1].acquisition_price_usd == 220.0
     
+    @pytest.mark.parametrize("n_lots", [10, 1000, 10000])
+    def test_fifo_many_lots(self, parser, n_lots):
+        """Test that one sale consumes many lots oldest first."""
+        transactions = _gen_fifo_transactions(n_lots, lot_size=5, base_price=100.0)
+        
+        result = parser.parse(transactions, START_DATE)
+        
+        assert len(result) == n_lots
+        assert all(txn.shares == 5 for txn in result)
+        assert [txn.acquisition_price_usd for txn in result] == [
+            round(100.0 + i * 0.25, 2) for i in range(n_lots)
+        ]
+        assert sum(txn.fees_and_commissions_usd for txn in result) == pytest.approx(10.0)
+    
     def test_reinvest_shares_treated_as_buy(self, parser):
         """Test that dividend reinvestment is treated as purchase."""
         transactions = [
@@ -288,8 +386,7 @@ class TestSchwabIndividualParser:
             }
         ]
         
-        start_date = datetime(2025, 4, 1)
-        result = parser.parse(transactions, start_date)
+        result = parser.parse(transactions, START_DATE)
         
         assert len(result) == 1
         assert result[0].acquisition_price_usd == 200.0
@@ -320,142 +417,70 @@ class TestSchwabIndividualParser:
             }
         ]
         
-        start_date = datetime(2025, 4, 1)
-        result = parser.parse(transactions, start_date)
+        result = parser.parse(transactions, START_DATE)
         
         # Only the second sale should be returned
         assert len(result) == 1
         assert result[0].shares == 30
         # Should use remaining lot (50 shares left after first sale)
         assert result[0].acquisition_price_usd == 200.0
+    
+    def test_read_transactions_not_streamed(self, parser):
+        """Test that records are decoded whole, since parse() sorts them all anyway."""
+        transactions = [
+            {"Action": "Buy", "Date": "01/15/2023", "Symbol": "VTI",
+             "Quantity": "10", "Price": "$200.00"},
+        ]
+        export = io.BytesIO(json.dumps({"BrokerageTransactions": transactions}).encode())
+        
+        assert parser.read_transactions(export, stream=True) == transactions
 
 
+# The parser reads with openpyxl; the sample workbooks are written with xlsxwriter
 @pytest.mark.skipif(not OPENPYXL_AVAILABLE, reason="openpyxl not installed")
+@pytest.mark.skipif(not XLSXWRITER_AVAILABLE, reason="xlsxwriter not installed")
 class TestZerodhaPnLParser:
     """Tests for ZerodhaPnLParser class."""
     
-    @pytest.fixture
+    @pytest.fixture(scope="class")
     def parser(self):
-        """Create parser instance."""
+        """Create parser instance (stateless, shared by the class)."""
         return ZerodhaPnLParser()
     
-    @pytest.fixture
-    def sample_zerodha_file(self):
-        """Create a sample Zerodha P&L Excel file for testing."""
-        wb = Workbook()
-        ws = wb.active
-        
-        # Row 1-9: Empty/header rows
-        for i in range(1, 10):
-            ws.cell(row=i, column=1, value=None)
-        
-        # Row 10: Statement title
-        ws.cell(row=11, column=2, value="P&L Statement for Equity from 2025-04-01 to 2025-12-15")
-        
-        # Row 13: Summary header
-        ws.cell(row=13, column=2, value="Summary")
-        
-        # Row 15-18: Summary values
-        ws.cell(row=15, column=2, value="Charges")
-        ws.cell(row=15, column=3, value=1000.50)
-        
-        ws.cell(row=16, column=2, value="Other Credit & Debit")
-        ws.cell(row=16, column=3, value=-100.25)
-        
-        ws.cell(row=17, column=2, value="Realized P&L")
-        ws.cell(row=17, column=3, value=50000.75)
-        
-        ws.cell(row=18, column=2, value="Unrealized P&L")
-        ws.cell(row=18, column=3, value=-10000.00)
-        
-        # Row 21: Charges section
-        ws.cell(row=21, column=2, value="Charges")
-        
-        # Row 23: Account Head header
-        ws.cell(row=23, column=2, value="Account Head")
-        ws.cell(row=23, column=3, value="Amount")
-        
-        # Row 24-32: Charges breakdown
-        ws.cell(row=24, column=2, value="Brokerage - Z")
-        ws.cell(row=24, column=3, value=250.50)
-        
-        ws.cell(row=25, column=2, value="Exchange Transaction Charges - Z")
-        ws.cell(row=25, column=3, value=150.25)
-        
-        ws.cell(row=26, column=2, value="Securities Transaction Tax - Z")
-        ws.cell(row=26, column=3, value=500.00)
-        
-        ws.cell(row=27, column=2, value="Stamp Duty - Z")
-        ws.cell(row=27, column=3, value=100.00)
-        
-        # Row 38: Transaction header
-        ws.cell(row=38, column=2, value="Symbol")
-        ws.cell(row=38, column=3, value="ISIN")
-        ws.cell(row=38, column=4, value="Quantity")
-        ws.cell(row=38, column=5, value="Buy Value")
-        ws.cell(row=38, column=6, value="Sell Value")
-        ws.cell(row=38, column=7, value="Realized P&L")
-        ws.cell(row=38, column=8, value="Realized P&L Pct.")
-        ws.cell(row=38, column=9, value="Previous Closing Price")
-        ws.cell(row=38, column=10, value="Open Quantity")
-        ws.cell(row=38, column=11, value="Open Quantity Type")
-        ws.cell(row=38, column=12, value="Open Value")
-        ws.cell(row=38, column=13, value="Unrealized P&L")
-        ws.cell(row=38, column=14, value="Unrealized P&L Pct.")
-        
-        # Row 39-41: Transaction data
-        ws.cell(row=39, column=2, value="RELIANCE")
-        ws.cell(row=39, column=3, value="INE002A01018")
-        ws.cell(row=39, column=4, value=100)
-        ws.cell(row=39, column=5, value=250000.00)
-        ws.cell(row=39, column=6, value=280000.00)
-        ws.cell(row=39, column=7, value=30000.00)
-        ws.cell(row=39, column=8, value=12.0)
-        ws.cell(row=39, column=9, value=0)
-        ws.cell(row=39, column=10, value=0)
-        
-        ws.cell(row=40, column=2, value="TCS")
-        ws.cell(row=40, column=3, value="INE467B01029")
-        ws.cell(row=40, column=4, value=50)
-        ws.cell(row=40, column=5, value=200000.00)
-        ws.cell(row=40, column=6, value=220000.75)
-        ws.cell(row=40, column=7, value=20000.75)
-        ws.cell(row=40, column=8, value=10.0)
-        ws.cell(row=40, column=9, value=0)
-        ws.cell(row=40, column=10, value=0)
-        
-        # Save to temp file
-        with tempfile.NamedTemporaryFile(delete=False, suffix='.xlsx') as tmp:
-            wb.save(tmp.name)
-            tmp_path = tmp.name
-        
-        yield tmp_path
-        
-        # Cleanup
-        os.unlink(tmp_path)
+    @pytest.fixture(scope="class")
+    def sample_zerodha_file(self, tmp_path_factory):
+        """Write the sample Zerodha P&L workbook once for all tests (read-only)."""
+        filepath = tmp_path_factory.mktemp("zerodha") / "zerodha_pnl.xlsx"
+        filepath.write_bytes(_sample_zerodha_xlsx())
+        return str(filepath)
     
-    def test_parse_realized_pnl(self, parser, sample_zerodha_file):
+    @pytest.fixture(scope="class")
+    def sample_result(self, parser):
+        """Parse the in-memory sample once for the read-only assertions."""
+        return parser.parse(io.BytesIO(_sample_zerodha_xlsx()))
+    
+    def test_parse_realized_pnl(self, sample_result):
         """Test parsing realized P&L from Zerodha report."""
-        result = parser.parse(sample_zerodha_file)
+        result = sample_result
         
         assert result.source == "Zerodha Stocks"
-        assert result.stcg == pytest.approx(50000.75)
+        assert result.stcg == 50000.75
         assert result.ltcg == 0.0  # Zerodha doesn't distinguish LTCG
     
-    def test_parse_charges(self, parser, sample_zerodha_file):
+    def test_parse_charges(self, sample_result):
         """Test parsing charges from Zerodha report."""
-        result = parser.parse(sample_zerodha_file)
+        result = sample_result
         
         assert "Brokerage" in result.charges
-        assert result.charges["Brokerage"] == pytest.approx(250.50)
+        assert result.charges["Brokerage"] == 250.50
         assert "STT" in result.charges
-        assert result.charges["STT"] == pytest.approx(500.00)
+        assert result.charges["STT"] == 500.00
         assert "Stamp Duty" in result.charges
-        assert result.charges["Stamp Duty"] == pytest.approx(100.00)
+        assert result.charges["Stamp Duty"] == 100.00
     
-    def test_parse_transactions(self, parser, sample_zerodha_file):
+    def test_parse_transactions(self, sample_result):
         """Test parsing transactions from Zerodha report."""
-        result = parser.parse(sample_zerodha_file)
+        result = sample_result
         
         assert len(result.transactions) == 2
         
@@ -463,53 +488,45 @@ class TestZerodhaPnLParser:
         reliance_txn = next(t for t in result.transactions if t['symbol'] == 'RELIANCE')
         assert reliance_txn['isin'] == 'INE002A01018'
         assert reliance_txn['quantity'] == 100
-        assert reliance_txn['buy_value'] == pytest.approx(250000.00)
-        assert reliance_txn['sell_value'] == pytest.approx(280000.00)
-        assert reliance_txn['realized_pnl'] == pytest.approx(30000.00)
+        assert reliance_txn['buy_value'] == 250000.00
+        assert reliance_txn['sell_value'] == 280000.00
+        assert reliance_txn['realized_pnl'] == 30000.00
         
         # Check second transaction (TCS)
         tcs_txn = next(t for t in result.transactions if t['symbol'] == 'TCS')
         assert tcs_txn['isin'] == 'INE467B01029'
         assert tcs_txn['quantity'] == 50
-        assert tcs_txn['realized_pnl'] == pytest.approx(20000.75)
+        assert tcs_txn['realized_pnl'] == 20000.75
+    
+    @pytest.mark.parametrize("open_file", [False, True])
+    def test_parse_from_disk(self, parser, sample_zerodha_file, open_file):
+        """Test parsing from a file path and from an already opened binary file."""
+        if open_file:
+            with open(sample_zerodha_file, 'rb') as f:
+                result = parser.parse(f)
+        else:
+            result = parser.parse(sample_zerodha_file)
+        
+        assert result.stcg == 50000.75
+        assert len(result.transactions) == 2
     
     def test_parse_negative_pnl(self, parser):
         """Test parsing negative (loss) P&L."""
-        wb = Workbook()
-        ws = wb.active
-        
         # Minimal file with just realized P&L
-        ws.cell(row=17, column=2, value="Realized P&L")
-        ws.cell(row=17, column=3, value=-25000.50)
-        
-        with tempfile.NamedTemporaryFile(delete=False, suffix='.xlsx') as tmp:
-            wb.save(tmp.name)
-            tmp_path = tmp.name
+        data = io.BytesIO(_build_xlsx({(17, 2): ["Realized P&L", -25000.50]}))
         
-        try:
-            result = parser.parse(tmp_path)
-            assert result.stcg == pytest.approx(-25000.50)
-        finally:
-            os.unlink(tmp_path)
+        result = parser.parse(data)
+        assert result.stcg == -25000.50
     
     def test_parse_empty_file(self, parser):
         """Test parsing empty/invalid file returns empty result."""
-        wb = Workbook()
-        ws = wb.active
-        ws.cell(row=1, column=1, value="Invalid data")
-        
-        with tempfile.NamedTemporaryFile(delete=False, suffix='.xlsx') as tmp:
-            wb.save(tmp.name)
-            tmp_path = tmp.name
+        data = io.BytesIO(_build_xlsx({(1, 1): ["Invalid data"]}))
         
-        try:
-            result = parser.parse(tmp_path)
-            assert result.source == "Zerodha Stocks"
-            assert result.stcg == 0.0
-            assert result.ltcg == 0.0
-            assert len(result.transactions) == 0
-        finally:
-            os.unlink(tmp_path)
+        result = parser.parse(data)
+        assert result.source == "Zerodha Stocks"
+        assert result.stcg == 0.0
+        assert result.ltcg == 0.0
+        assert len(result.transactions) == 0
     
     def test_parse_nonexistent_file(self, parser):
         """Test parsing nonexistent file returns empty result."""
@@ -3,32 +3,34 @@ Unit tests for report generators.
 """
 
 import pytest
-import tempfile
 import os
 from datetime import datetime
 from io import StringIO
-import sys
 
 from capital_gains.models import SaleTransaction, IndianGains, TaxData, QuarterlyData
 from capital_gains.reports.console import ConsoleReporter
 from capital_gains.reports.excel import ExcelReporter
 
+# datetimes are immutable, so fixtures and tests can share these
+SALE_DATE = datetime(2025, 4, 15)
+ACQ_DATE = datetime(2022, 1, 15)
+
 
 class TestConsoleReporter:
     """Tests for ConsoleReporter class."""
     
-    @pytest.fixture
+    @pytest.fixture(scope="session")
     def reporter(self):
-        """Create reporter instance."""
+        """Create reporter instance (stateless between calls, so shared)."""
         return ConsoleReporter()
     
-    @pytest.fixture
+    @pytest.fixture(scope="module")
     def sample_transactions(self):
         """Create sample transactions."""
-        return [
+        return (
             SaleTransaction(
-                sale_date=datetime(2025, 4, 15),
-                acquisition_date=datetime(2022, 1, 15),
+                sale_date=SALE_DATE,
+                acquisition_date=ACQ_DATE,
                 stock_type="RS",
                 symbol="AAPL",
                 shares=100,
@@ -64,122 +66,102 @@ class TestConsoleReporter:
                 sale_exchange_rate=85.0,
                 acquisition_exchange_rate=83.0,
             ),
-        ]
+        )
     
-    @pytest.fixture
+    @pytest.fixture(scope="module")
     def sample_indian_gains(self):
         """Create sample Indian gains."""
-        return [
+        return (
             IndianGains(source="Indian Stocks", ltcg=50000.0, stcg=25000.0),
             IndianGains(source="Indian Mutual Funds", ltcg=30000.0, stcg=15000.0),
-        ]
+        )
     
-    def test_print_detailed_report(self, reporter, sample_transactions, capsys):
-        """Test detailed report output."""
-        reporter.print_detailed_report(sample_transactions)
-        
-        captured = capsys.readouterr()
-        
-        # Check title is present
-        assert "DETAILED CAPITAL GAINS REPORT" in captured.out
+    @pytest.mark.parametrize("method, with_indian_gains, expected", [
+        pytest.param("_build_detailed_report", False, {
+            # Title and transaction details
+            "DETAILED CAPITAL GAINS REPORT",
+            "AAPL", "VTI", "EAC", "Individual", "LONG TERM", "SHORT TERM",
+        }, id="detailed"),
+        pytest.param("_build_summary_report", False, {
+            # Section headers and totals
+            "CAPITAL GAINS SUMMARY", "TRANSACTION OVERVIEW",
+            "CAPITAL GAINS CLASSIFICATION",
+            "LONG TERM CAPITAL GAINS", "SHORT TERM CAPITAL GAINS",
+        }, id="summary"),
+        pytest.param("_build_grand_total", True, {
+            "GRAND TOTAL CAPITAL GAINS", "Schwab",
+            "Indian Stocks", "Indian Mutual Funds",
+        }, id="grand_total"),
+    ])
+    def test_console_output(self, reporter, sample_transactions, sample_indian_gains,
+                            method, with_indian_gains, expected):
+        """Test that each console report contains its expected text."""
+        args = (sample_transactions, sample_indian_gains) if with_indian_gains else (sample_transactions,)
+        output = getattr(reporter, method)(*args)
         
-        # Check transaction details are present
-        assert "AAPL" in captured.out
-        assert "VTI" in captured.out
-        assert "EAC" in captured.out
-        assert "Individual" in captured.out
-        assert "LONG TERM" in captured.out
-        assert "SHORT TERM" in captured.out
-    
-    def test_print_summary_report(self, reporter, sample_transactions, capsys):
-        """Test summary report output."""
-        reporter.print_summary_report(sample_transactions)
-        
-        captured = capsys.readouterr()
-        
-        # Check section headers
-        assert "CAPITAL GAINS SUMMARY" in captured.out
-        assert "TRANSACTION OVERVIEW" in captured.out
-        assert "CAPITAL GAINS CLASSIFICATION" in captured.out
-        
-        # Check totals are shown
-        assert "LONG TERM CAPITAL GAINS" in captured.out
-        assert "SHORT TERM CAPITAL GAINS" in captured.out
+        missing = {text for text in expected if text not in output}
+        assert not missing, missing
     
     def test_print_quarterly_breakdown(self, reporter, sample_transactions, sample_indian_gains, capsys):
         """Test quarterly breakdown output."""
         result = reporter.print_quarterly_breakdown(sample_transactions, sample_indian_gains)
         
-        captured = capsys.readouterr()
+        out = capsys.readouterr().out
         
         # Check quarters are shown
-        assert "Upto 15 Jun" in captured.out
-        assert "16 Jun-15 Sep" in captured.out
+        missing = [q for q in ("Upto 15 Jun", "16 Jun-15 Sep") if q not in out]
+        assert not missing, missing
         
         # Check result structure
-        assert 'foreign' in result
-        assert 'indian_stocks' in result
-        assert 'indian_mf' in result
-        assert 'combined' in result
+        assert result.keys() == {'foreign', 'indian_stocks', 'indian_mf', 'combined'}
     
-    def test_print_grand_total(self, reporter, sample_transactions, sample_indian_gains, capsys):
-        """Test grand total output."""
-        reporter.print_grand_total(sample_transactions, sample_indian_gains)
+    def test_custom_stream(self, sample_transactions, sample_indian_gains, capsys):
+        """Test that a reporter given a stream writes there, not to stdout."""
+        stream = StringIO()
+        reporter = ConsoleReporter(stream=stream)
         
-        captured = capsys.readouterr()
+        reporter.print_grand_total(sample_transactions, sample_indian_gains)
+        reporter.print_quarterly_breakdown(sample_transactions, sample_indian_gains)
         
-        assert "GRAND TOTAL CAPITAL GAINS" in captured.out
-        assert "Schwab" in captured.out
-        assert "Indian Stocks" in captured.out
-        assert "Indian Mutual Funds" in captured.out
+        assert capsys.readouterr().out == ""
+        assert "GRAND TOTAL CAPITAL GAINS" in stream.getvalue()
+        assert "COMBINED TOTAL" in stream.getvalue()
     
+    @pytest.mark.smoke
     def test_empty_transactions(self, reporter, capsys):
         """Test handling empty transaction list."""
         reporter.print_detailed_report([])
         
         captured = capsys.readouterr()
+        assert captured.out == reporter._build_detailed_report([])
         assert "DETAILED CAPITAL GAINS REPORT" in captured.out
     
-    def test_single_symbol_breakdown(self, reporter, sample_transactions, capsys):
+    def test_single_symbol_breakdown(self, reporter, sample_sale_transaction):
         """Test that single-symbol breakdown is skipped."""
-        # Create transactions with same symbol
-        same_symbol_txns = [
-            SaleTransaction(
-                sale_date=datetime(2025, 4, 15),
-                acquisition_date=datetime(2023, 1, 15),
-                stock_type="RS",
-                symbol="AAPL",
-                shares=100,
-                sale_price_usd=150.0,
-                acquisition_price_usd=120.0,
-                gross_proceeds_usd=15000.0,
-                capital_gain_inr=290000.0,
-                is_long_term=True,
-            ),
-        ]
+        # The shared AAPL sale on its own has a single symbol
+        same_symbol_txns = (sample_sale_transaction,)
         
-        reporter.print_summary_report(same_symbol_txns)
-        captured = capsys.readouterr()
+        output = reporter._build_summary_report(same_symbol_txns)
         
         # Should not show symbol breakdown for single symbol
-        assert "BREAKDOWN BY SYMBOL" not in captured.out
+        assert "BREAKDOWN BY SYMBOL" not in output
 
 
 class TestExcelReporter:
     """Tests for ExcelReporter class."""
     
-    @pytest.fixture
+    @pytest.fixture(scope="session")
     def reporter(self):
-        """Create reporter instance."""
+        """Create reporter instance (stateless between calls, so shared)."""
         return ExcelReporter()
     
-    @pytest.fixture
+    @pytest.fixture(scope="module")
     def sample_transactions(self):
         """Create sample transactions for Excel export."""
-        return [
+        return (
             SaleTransaction(
-                sale_date=datetime(2025, 4, 15),
-                acquisition_date=datetime(2022, 1, 15),
+                sale_date=SALE_DATE,
+                acquisition_date=ACQ_DATE,
                 stock_type="RS",
                 symbol="AAPL",
                 shares=100,
@@ -199,12 +181,12 @@ class TestExcelReporter:
                 fees_and_commissions_usd=10.0,
                 fees_and_commissions_inr=850.0,
             ),
-        ]
+        )
     
-    @pytest.fixture
+    @pytest.fixture(scope="module")
     def sample_indian_gains(self):
         """Create sample Indian gains for Excel export."""
-        return [
+        return (
             IndianGains(
                 source="Indian Stocks",
                 ltcg=50000.0,
@@ -217,9 +199,9 @@ class TestExcelReporter:
                 stcg=15000.0,
                 transactions=[{"scheme_name": "HDFC Equity", "stcg": 15000.0}],
             ),
-        ]
+        )
     
-    @pytest.fixture
+    @pytest.fixture(scope="module")
     def sample_tax_data(self):
         """Create sample tax data."""
         return TaxData(
@@ -236,139 +218,108 @@ class TestExcelReporter:
             tax_liability=30000.0,
         )
     
-    def test_export_creates_file(self, reporter, sample_transactions):
-        """Test that export creates an Excel file."""
-        with tempfile.NamedTemporaryFile(suffix='.xlsx', delete=False) as f:
-            filepath = f.name
+    @pytest.fixture(scope="module")
+    def exported_all_data_file(self, tmp_path_factory, reporter, sample_transactions,
+                               sample_indian_gains, sample_tax_data):
+        """Export every data type once and share the file path."""
+        filepath = str(tmp_path_factory.mktemp("xlsx") / "report.xlsx")
+        result = reporter.export(
+            filepath=filepath,
+            transactions=sample_transactions,
+            exchange_rates={
+                "2025-04-15": 85.0,
+                "2022-01-15": 82.0,
+            },
+            indian_gains=sample_indian_gains,
+            tax_data=sample_tax_data,
+        )
+        assert result is True
+        return filepath
+    
+    @pytest.fixture(scope="module")
+    def exported_all_data_workbook(self, exported_all_data_file):
+        """Read the shared export back once for all sheet checks."""
+        from openpyxl import load_workbook
         
-        try:
-            result = reporter.export(
-                filepath=filepath,
-                transactions=sample_transactions,
-            )
-            
-            assert result is True
-            assert os.path.exists(filepath)
-            assert os.path.getsize(filepath) > 0
-        finally:
-            if os.path.exists(filepath):
-                os.unlink(filepath)
+        wb = load_workbook(exported_all_data_file, read_only=True, data_only=True, keep_links=False)
+        yield wb
+        wb.close()
+    
+    def test_export_creates_file(self, exported_all_data_file):
+        """Test that export creates an Excel file."""
+        assert os.path.exists(exported_all_data_file)
+        assert os.path.getsize(exported_all_data_file) > 0
     
-    def test_export_with_exchange_rates(self, reporter, sample_transactions):
-        """Test export with exchange rates data."""
-        with tempfile.NamedTemporaryFile(suffix='.xlsx', delete=False) as f:
-            filepath = f.name
+    @pytest.mark.parametrize("sheet_name", [
+        "Summary",
+        "Schwab Foreign Stocks",
+        "Exchange Rates",
+        "Quarterly Breakdown",
+        "Tax Calculation",
+        # Note: Source names are mapped to display names (Indian X → Groww X)
+        "Groww Mutual Funds",
+        "Groww Stocks",
+    ])
+    def test_export_sheets(self, exported_all_data_workbook, sheet_name):
+        """Test that the full export contains each expected sheet."""
+        assert sheet_name in exported_all_data_workbook.sheetnames
+    
+    def test_export_repeated_indian_source(self, reporter, sample_transactions, tmp_path):
+        """Test that two gains from the same source get separate sheets."""
+        filepath = str(tmp_path / "report.xlsx")
         
-        exchange_rates = {
-            "2025-04-15": 85.0,
-            "2022-01-15": 82.0,
-        }
+        result = reporter.export(
+            filepath=filepath,
+            transactions=sample_transactions,
+            indian_gains=[
+                IndianGains(source="Indian Stocks", ltcg=100.0),
+                IndianGains(source="Indian Stocks", stcg=-50.0),
+            ],
+        )
         
-        try:
-            result = reporter.export(
-                filepath=filepath,
-                transactions=sample_transactions,
-                exchange_rates=exchange_rates,
-            )
-            
-            assert result is True
-            
-            # Verify file can be read back
-            from openpyxl import load_workbook
-            wb = load_workbook(filepath)
-            
-            # Check sheets exist
-            assert "Summary" in wb.sheetnames
-            assert "Schwab Foreign Stocks" in wb.sheetnames
-            assert "Exchange Rates" in wb.sheetnames
-            assert "Quarterly Breakdown" in wb.sheetnames
-            
-            wb.close()
-        finally:
-            if os.path.exists(filepath):
-                os.unlink(filepath)
-    
-    def test_export_with_all_data(self, reporter, sample_transactions, 
-                                   sample_indian_gains, sample_tax_data):
-        """Test export with all data types."""
-        with tempfile.NamedTemporaryFile(suffix='.xlsx', delete=False) as f:
-            filepath = f.name
+        assert result is True
         
-        try:
-            result = reporter.export(
-                filepath=filepath,
-                transactions=sample_transactions,
-                exchange_rates={"2025-04-15": 85.0},
-                indian_gains=sample_indian_gains,
-                tax_data=sample_tax_data,
-            )
-            
-            assert result is True
-            
-            from openpyxl import load_workbook
-            wb = load_workbook(filepath)
-            
-            # Check all sheets exist
-            assert "Tax Calculation" in wb.sheetnames
-            # Note: Source names are mapped to display names (Indian X → Groww X)
-            assert "Groww Mutual Funds" in wb.sheetnames
-            assert "Groww Stocks" in wb.sheetnames
-            
-            wb.close()
-        finally:
-            if os.path.exists(filepath):
-                os.unlink(filepath)
+        from openpyxl import load_workbook
+        wb = load_workbook(filepath, read_only=True, data_only=True, keep_links=False)
+        assert "Groww Stocks" in wb.sheetnames
+        assert "Groww Stocks1" in wb.sheetnames
+        wb.close()
     
-    def test_export_empty_transactions(self, reporter):
+    @pytest.mark.smoke
+    def test_export_empty_transactions(self, reporter, tmp_path):
         """Test export with empty transactions."""
-        with tempfile.NamedTemporaryFile(suffix='.xlsx', delete=False) as f:
-            filepath = f.name
+        filepath = str(tmp_path / "report.xlsx")
         
-        try:
-            result = reporter.export(
-                filepath=filepath,
-                transactions=[],
-            )
-            
-            assert result is True
-            assert os.path.exists(filepath)
-        finally:
-            if os.path.exists(filepath):
-                os.unlink(filepath)
+        result = reporter.export(
+            filepath=filepath,
+            transactions=[],
+        )
+        
+        assert result is True
+        assert os.path.exists(filepath)
     
-    def test_transaction_sheet_columns(self, reporter, sample_transactions):
+    def test_transaction_sheet_columns(self, exported_all_data_workbook):
         """Test that transaction sheet has correct columns."""
-        with tempfile.NamedTemporaryFile(suffix='.xlsx', delete=False) as f:
-            filepath = f.name
+        ws = exported_all_data_workbook["Schwab Foreign Stocks"]
+        
+        # Check header row
+        headers = next(ws.iter_rows(min_row=1, max_row=1, values_only=True))
         
-        try:
-            reporter.export(filepath=filepath, transactions=sample_transactions)
-            
-            from openpyxl import load_workbook
-            wb = load_workbook(filepath)
-            ws = wb["Schwab Foreign Stocks"]
-            
-            # Check header row
-            headers = [cell.value for cell in ws[1]]
-            
-            assert "S.No" in headers
-            assert "Source" in headers
-            assert "Sale Date" in headers
-            assert "Symbol" in headers
-            assert "Capital Gain (INR)" in headers
-            
-            wb.close()
-        finally:
-            if os.path.exists(filepath):
-                os.unlink(filepath)
+        assert "S.No" in headers
+        assert "Source" in headers
+        assert "Sale Date" in headers
+        assert "Symbol" in headers
+        assert "Capital Gain (INR)" in headers
 
 
 class TestQuarterlyDataCalculation:
     """Tests for quarterly data calculation in ConsoleReporter."""
     
-    @pytest.fixture
+    @pytest.fixture(scope="class")
     def reporter(self):
-        return ConsoleReporter()
+        """Reporter that discards its output; only return values are checked."""
+        with open(os.devnull, "w", encoding="utf-8") as devnull:
+            yield ConsoleReporter(stream=devnull)
     
     def test_quarterly_data_foreign(self, reporter):
         """Test foreign stocks are correctly categorized by quarter."""
@@ -399,16 +350,7 @@ class TestQuarterlyDataCalculation:
             ),
         ]
         
-        # Capture output but focus on return value
-        import io
-        import sys
-        captured = io.StringIO()
-        sys.stdout = captured
-        
-        try:
-            result = reporter.print_quarterly_breakdown(transactions)
-        finally:
-            sys.stdout = sys.__stdout__
+        result = reporter.print_quarterly_breakdown(transactions)
         
         # Check Q1 LTCG
         assert result['foreign']["Upto 15 Jun"].ltcg == 50000.0
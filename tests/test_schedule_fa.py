@@ -4,10 +4,9 @@ Unit tests for Schedule FA (Foreign Assets) functionality.
 
 import pytest
 import json
-import tempfile
 from datetime import datetime
 from pathlib import Path
-from unittest.mock import Mock, patch, MagicMock
+from unittest.mock import Mock, patch
 
 from capital_gains.schedule_fa.models import (
     ScheduleFAConfig,
@@ -21,6 +20,22 @@ from capital_gains.schedule_fa.price_fetcher import StockPriceFetcher
 from capital_gains.schedule_fa.generator import ScheduleFAGenerator, ExchangeRateHandler
 from capital_gains.parsers.foreign_assets import ForeignAssetsParser
 
+# datetimes are immutable, so tests can share these
+CY_START = datetime(2025, 1, 1)
+CY_END = datetime(2025, 12, 31)
+
+
+@pytest.fixture(autouse=True)
+def _no_yfinance(monkeypatch):
+    """Keep every test here offline, whether or not yfinance is installed."""
+    monkeypatch.setattr('capital_gains.schedule_fa.price_fetcher._get_yfinance', lambda: None)
+
+
+@pytest.fixture(scope="module")
+def config_2025():
+    """Default CY 2025 config shared by the module; tests must not mutate it."""
+    return ScheduleFAConfig(2025)
+
 
 class TestScheduleFAConfig:
     """Tests for ScheduleFAConfig."""
@@ -31,16 +46,19 @@ class TestScheduleFAConfig:
         
         assert config.calendar_year == 2025
         assert config.assessment_year == "2026-27"
-        assert config.cy_start == datetime(2025, 1, 1)
-        assert config.cy_end == datetime(2025, 12, 31)
+        assert config.cy_start == CY_START
+        assert config.cy_end == CY_END
         assert config.fy_start == datetime(2025, 4, 1)
         assert config.fy_end == datetime(2026, 3, 31)
     
-    def test_config_assessment_year_format(self):
+    @pytest.mark.parametrize("calendar_year, assessment_year", [
+        (2020, "2021-22"),
+        (2025, "2026-27"),
+        (2030, "2031-32"),
+    ])
+    def test_config_assessment_year_format(self, calendar_year, assessment_year):
         """Test assessment year format for different years."""
-        assert ScheduleFAConfig(2020).assessment_year == "2021-22"
-        assert ScheduleFAConfig(2025).assessment_year == "2026-27"
-        assert ScheduleFAConfig(2030).assessment_year == "2031-32"
+        assert ScheduleFAConfig(calendar_year).assessment_year == assessment_year
 
 
 class TestForeignAssetEntry:
@@ -123,35 +141,35 @@ class TestDividendEntry:
 class TestScheduleFAReport:
     """Tests for ScheduleFAReport."""
     
-    def test_report_creation(self):
+    def test_report_creation(self, config_2025):
         """Test creating a report."""
-        config = ScheduleFAConfig(2025)
-        report = ScheduleFAReport(config=config)
+        report = ScheduleFAReport(config=config_2025)
         
         assert report.config.calendar_year == 2025
         assert len(report.equity_entries) == 0
         assert len(report.custodial_accounts) == 0
     
-    def test_report_calculate_totals(self):
+    def test_report_calculate_totals(self, config_2025):
         """Test calculating report totals."""
-        config = ScheduleFAConfig(2025)
-        report = ScheduleFAReport(config=config)
+        report = ScheduleFAReport(config=config_2025)
         
         # Add entries
-        report.equity_entries.append(ForeignAssetEntry(
-            serial_no=1,
-            initial_value_inr=100000.0,
-            peak_value_inr=150000.0,
-            closing_value_inr=120000.0,
-            sale_proceeds_inr=0.0,
-        ))
-        report.equity_entries.append(ForeignAssetEntry(
-            serial_no=2,
-            initial_value_inr=200000.0,
-            peak_value_inr=250000.0,
-            closing_value_inr=0.0,
-            sale_proceeds_inr=220000.0,
-        ))
+        report.equity_entries.extend([
+            ForeignAssetEntry(
+                serial_no=1,
+                initial_value_inr=100000.0,
+                peak_value_inr=150000.0,
+                closing_value_inr=120000.0,
+                sale_proceeds_inr=0.0,
+            ),
+            ForeignAssetEntry(
+                serial_no=2,
+                initial_value_inr=200000.0,
+                peak_value_inr=250000.0,
+                closing_value_inr=0.0,
+                sale_proceeds_inr=220000.0,
+            ),
+        ])
         
         report.calculate_totals()
         
@@ -160,15 +178,13 @@ class TestScheduleFAReport:
         assert report.total_closing_value_inr == 120000.0
         assert report.total_sale_proceeds_inr == 220000.0
     
-    def test_report_entry_count(self):
+    def test_report_entry_count(self, config_2025):
         """Test getting entry count."""
-        config = ScheduleFAConfig(2025)
-        report = ScheduleFAReport(config=config)
+        report = ScheduleFAReport(config=config_2025)
         
         assert report.get_entry_count() == 0
         
-        report.equity_entries.append(ForeignAssetEntry(serial_no=1))
-        report.equity_entries.append(ForeignAssetEntry(serial_no=2))
+        report.equity_entries.extend(ForeignAssetEntry(serial_no=n) for n in (1, 2))
         
         assert report.get_entry_count() == 2
 
@@ -176,57 +192,55 @@ class TestScheduleFAReport:
 class TestStockDataCache:
     """Tests for StockDataCache."""
     
-    def test_cache_initialization(self):
+    @pytest.fixture
+    def cache_file(self, tmp_path):
+        """Path for a cache file that pytest cleans up."""
+        return str(tmp_path / "stock_cache.json")
+    
+    def test_cache_initialization(self, cache_file):
         """Test cache initializes correctly."""
-        with tempfile.NamedTemporaryFile(suffix='.json', delete=False) as f:
-            cache = StockDataCache(f.name)
-            
-            assert cache._data['metadata'] == {}
-            assert cache._data['prices'] == {}
+        cache = StockDataCache(cache_file)
+        
+        assert cache._data['metadata'] == {}
+        assert cache._data['prices'] == {}
     
-    def test_cache_metadata(self):
+    def test_cache_metadata(self, cache_file):
         """Test caching metadata."""
-        with tempfile.NamedTemporaryFile(suffix='.json', delete=False) as f:
-            cache = StockDataCache(f.name)
-            
-            metadata = {'name': 'Test Corp', 'address': 'USA'}
-            cache.set_metadata('TEST', metadata)
-            
-            assert cache.get_metadata('TEST') == metadata
-            assert cache.has_symbol('TEST')
-            assert not cache.has_symbol('OTHER')
-    
-    def test_cache_prices(self):
+        cache = StockDataCache(cache_file)
+        
+        metadata = {'name': 'Test Corp', 'address': 'USA'}
+        cache.set_metadata('TEST', metadata)
+        
+        assert cache.get_metadata('TEST') == metadata
+        assert cache.has_symbol('TEST')
+        assert not cache.has_symbol('OTHER')
+    
+    def test_cache_prices(self, cache_file):
         """Test caching prices."""
-        with tempfile.NamedTemporaryFile(suffix='.json', delete=False) as f:
-            cache = StockDataCache(f.name)
-            
-            cache.set_price('TEST', '2025-01-01', 100.0)
-            cache.set_price('TEST', '2025-01-02', 105.0)
-            
-            assert cache.get_price('TEST', '2025-01-01') == 100.0
-            assert cache.get_price('TEST', '2025-01-02') == 105.0
-            assert cache.get_price('TEST', '2025-01-03') is None
-    
-    def test_cache_peak_prices(self):
+        cache = StockDataCache(cache_file)
+        
+        cache.set_price('TEST', '2025-01-01', 100.0)
+        cache.set_price('TEST', '2025-01-02', 105.0)
+        
+        assert cache.get_price('TEST', '2025-01-01') == 100.0
+        assert cache.get_price('TEST', '2025-01-02') == 105.0
+        assert cache.get_price('TEST', '2025-01-03') is None
+    
+    def test_cache_peak_prices(self, cache_file):
         """Test caching peak prices."""
-        with tempfile.NamedTemporaryFile(suffix='.json', delete=False) as f:
-            cache = StockDataCache(f.name)
-            
-            cache.set_peak_price('TEST', '20250101_20251231', 150.0, '2025-06-15')
-            
-            price, date = cache.get_peak_price('TEST', '20250101_20251231')
-            assert price == 150.0
-            assert date == '2025-06-15'
-            
-            price, date = cache.get_peak_price('TEST', 'other_period')
-            assert price is None
-    
-    def test_cache_save_load(self):
-        """Test saving and loading cache."""
-        with tempfile.NamedTemporaryFile(suffix='.json', delete=False) as f:
-            cache_file = f.name
+        cache = StockDataCache(cache_file)
+        
+        cache.set_peak_price('TEST', '20250101_20251231', 150.0, '2025-06-15')
         
+        price, date = cache.get_peak_price('TEST', '20250101_20251231')
+        assert price == 150.0
+        assert date == '2025-06-15'
+        
+        price, date = cache.get_peak_price('TEST', 'other_period')
+        assert price is None
+    
+    def test_cache_save_load(self, cache_file):
+        """Test saving and loading cache."""
         # Create and save
         cache1 = StockDataCache(cache_file)
         cache1.set_metadata('TEST', {'name': 'Test'})
@@ -238,6 +252,21 @@ class TestStockDataCache:
         
         assert cache2.get_metadata('TEST') == {'name': 'Test'}
         assert cache2.get_price('TEST', '2025-01-01') == 100.0
+    
+    @pytest.mark.parametrize("use_orjson", [True, False])
+    def test_cache_file_format(self, cache_file, monkeypatch, use_orjson):
+        """Test the saved file is the same JSON with or without orjson."""
+        from capital_gains.schedule_fa import stock_cache
+        if use_orjson and not stock_cache.ORJSON_AVAILABLE:
+            pytest.skip("orjson not installed")
+        monkeypatch.setattr(stock_cache, "ORJSON_AVAILABLE", use_orjson)
+        cache = StockDataCache(cache_file)
+        cache.set_metadata('TEST', {'name': 'Test', 'updated': CY_START})
+        cache.set_price('TEST', '2025-01-01', 100.0)
+        cache.save_cache()
+        
+        assert Path(cache_file).read_text() == json.dumps(cache._data, indent=2, default=str)
+        assert StockDataCache(cache_file).get_price('TEST', '2025-01-01') == 100.0
 
 
 class TestExchangeRateHandler:
@@ -248,7 +277,7 @@ class TestExchangeRateHandler:
         rates = {'2025-01-01': 83.0, '2025-01-02': 83.5}
         handler = ExchangeRateHandler(rates)
         
-        rate = handler.get_rate_for_date(datetime(2025, 1, 1))
+        rate = handler.get_rate_for_date(CY_START)
         assert rate == 83.0
     
     def test_handler_fallback(self):
@@ -277,23 +306,62 @@ class TestForeignAssetsParser:
         parser = ForeignAssetsParser(2025)
         
         assert parser.calendar_year == 2025
-        assert parser.cy_start == datetime(2025, 1, 1)
-        assert parser.cy_end == datetime(2025, 12, 31)
+        assert parser.cy_start == CY_START
+        assert parser.cy_end == CY_END
+    
+    @pytest.fixture(scope="class")
+    def parser(self):
+        """Parser shared by the stateless parse_amount tests."""
+        return ForeignAssetsParser(2025)
     
-    def test_parse_date_formats(self):
+    @pytest.fixture
+    def date_parser(self):
+        """Fresh parser per test, since parse_date remembers the last format."""
+        return ForeignAssetsParser(2025)
+    
+    @pytest.mark.parametrize("date_str, expected", [
+        ('01/15/2025', datetime(2025, 1, 15)),
+        ('2025-01-15', datetime(2025, 1, 15)),
+        # Day > 12 falls through to DD/MM/YYYY, then DD-MM-YYYY
+        ('25/12/2025', datetime(2025, 12, 25)),
+        ('25-12-2025', datetime(2025, 12, 25)),
+    ])
+    def test_parse_date_formats(self, date_parser, date_str, expected):
         """Test parsing different date formats."""
+        assert date_parser.parse_date(date_str) == expected
+    
+    def test_parse_date_invalid(self, date_parser):
+        """Test that an unrecognised date raises ValueError."""
+        with pytest.raises(ValueError):
+            date_parser.parse_date('2025/13/45')
+    
+    def test_parse_date_caches_format(self):
+        """Test that the last successful format is tried first."""
         parser = ForeignAssetsParser(2025)
         
-        assert parser.parse_date('01/15/2025') == datetime(2025, 1, 15)
-        assert parser.parse_date('2025-01-15') == datetime(2025, 1, 15)
+        parser.parse_date('01/15/2025')
+        assert parser._last_fmt == '%m/%d/%Y'
+        assert parser.parse_date('02/20/2025') == datetime(2025, 2, 20)
+        
+        # Switching formats moves the cache to the new one
+        assert parser.parse_date('2025-03-10') == datetime(2025, 3, 10)
+        assert parser._last_fmt == '%Y-%m-%d'
     
-    def test_parse_amount(self):
-        """Test parsing monetary amounts."""
+    def test_parse_date_day_first_not_cached(self):
+        """Test that a day-first date doesn't flip later ambiguous dates."""
         parser = ForeignAssetsParser(2025)
         
-        assert parser.parse_amount('$1,234.56') == 1234.56
-        assert parser.parse_amount('1234.56') == 1234.56
-        assert parser.parse_amount('') == 0.0
+        assert parser.parse_date('25/12/2025') == datetime(2025, 12, 25)
+        assert parser.parse_date('05/06/2025') == datetime(2025, 5, 6)
+    
+    @pytest.mark.parametrize("amount_str, expected", [
+        ('$1,234.56', 1234.56),
+        ('1234.56', 1234.56),
+        ('', 0.0),
+    ])
+    def test_parse_amount(self, parser, amount_str, expected):
+        """Test parsing monetary amounts."""
+        assert parser.parse_amount(amount_str) == expected
     
     def test_parse_eac_transactions(self):
         """Test parsing EAC transactions."""
@@ -405,18 +473,16 @@ class TestForeignAssetsParser:
 class TestScheduleFAGenerator:
     """Tests for ScheduleFAGenerator."""
     
-    def test_generator_initialization(self):
+    def test_generator_initialization(self, config_2025):
         """Test generator initializes correctly."""
-        config = ScheduleFAConfig(2025)
         rates = {'2025-01-01': 83.0}
-        generator = ScheduleFAGenerator(config, exchange_rates=rates)
+        generator = ScheduleFAGenerator(config_2025, exchange_rates=rates)
         
         assert generator.config.calendar_year == 2025
     
-    def test_generator_load_data(self):
+    def test_generator_load_data(self, config_2025):
         """Test loading data into generator."""
-        config = ScheduleFAConfig(2025)
-        generator = ScheduleFAGenerator(config)
+        generator = ScheduleFAGenerator(config_2025)
         
         eac_data = {'sales': [], 'tax_sales': [], 'dividends': [], 'symbol': 'NVDA'}
         brokerage_data = {'holdings': {}, 'transactions': [], 'dividends': []}
@@ -428,10 +494,9 @@ class TestScheduleFAGenerator:
         assert generator.brokerage_data == brokerage_data
         assert generator.held_shares == held_shares
     
-    @patch('capital_gains.schedule_fa.price_fetcher._get_yfinance', return_value=None)
-    def test_generator_without_yfinance(self, mock_yf):
+    def test_generator_without_yfinance(self, tmp_path):
         """Test generator works without yfinance."""
-        config = ScheduleFAConfig(2025)
+        config = ScheduleFAConfig(2025, cache_file=str(tmp_path / "stock_cache.json"))
         rates = {'2025-01-01': 83.0, '2025-12-31': 85.0}
         generator = ScheduleFAGenerator(config, exchange_rates=rates)
         
@@ -446,18 +511,27 @@ class TestScheduleFAGenerator:
 class TestScheduleFAIntegration:
     """Integration tests for Schedule FA generation."""
     
-    def test_end_to_end_generation(self):
-        """Test end-to-end report generation with mock data."""
-        config = ScheduleFAConfig(2025)
+    @pytest.fixture(scope="class")
+    def generator(self, tmp_path_factory):
+        """
+        Generator shared by the scenarios below.
+        
+        load_data() replaces all input data and generate() builds a fresh
+        report, so each test only has to load its own scenario.
+        """
+        cache_file = tmp_path_factory.mktemp("schedule_fa") / "stock_cache.json"
+        config = ScheduleFAConfig(2025, cache_file=str(cache_file))
         rates = {
+            '2025-01-01': 83.0,
             '2025-01-15': 83.0,
             '2025-03-15': 84.0,
             '2025-06-15': 85.0,
             '2025-12-31': 86.0,
         }
-        
-        generator = ScheduleFAGenerator(config, exchange_rates=rates)
-        
+        return ScheduleFAGenerator(config, exchange_rates=rates)
+    
+    def test_end_to_end_generation(self, generator):
+        """Test end-to-end report generation with mock data."""
         # Mock EAC data
         eac_data = {
             'symbol': 'TEST',
@@ -481,30 +555,22 @@ class TestScheduleFAIntegration:
         }
         
         # Mock price fetcher
-        with patch.object(generator.price_fetcher, 'get_company_info') as mock_info:
-            mock_info.return_value = ('Test Corp', 'USA', '00000')
-            
-            with patch.object(generator.price_fetcher, 'get_peak_price_for_period') as mock_peak:
-                mock_peak.return_value = (160.0, datetime(2025, 3, 10))
-                
-                with patch.object(generator.price_fetcher, 'get_closing_price') as mock_close:
-                    mock_close.return_value = 145.0
-                    
-                    generator.load_data(eac_data=eac_data)
-                    report = generator.generate()
+        with patch.multiple(
+            generator.price_fetcher,
+            get_company_info=Mock(return_value=('Test Corp', 'USA', '00000')),
+            get_peak_price_for_period=Mock(return_value=(160.0, datetime(2025, 3, 10))),
+            get_closing_price=Mock(return_value=145.0),
+        ):
+            generator.load_data(eac_data=eac_data)
+            report = generator.generate()
         
         # Verify report
         assert report.get_entry_count() == 1
         assert len(report.dividends) == 1
         assert report.dividends[0].gross_amount_usd == 50.0
     
-    def test_report_with_held_shares(self):
+    def test_report_with_held_shares(self, generator):
         """Test report generation with held shares."""
-        config = ScheduleFAConfig(2025)
-        rates = {'2025-01-01': 83.0, '2025-12-31': 86.0}
-        
-        generator = ScheduleFAGenerator(config, exchange_rates=rates)
-        
         held_shares = [
             {
                 'type': 'RSU',
@@ -515,17 +581,14 @@ class TestScheduleFAIntegration:
             }
         ]
         
-        with patch.object(generator.price_fetcher, 'get_company_info') as mock_info:
-            mock_info.return_value = ('Test Corp', 'USA', '00000')
-            
-            with patch.object(generator.price_fetcher, 'get_peak_price_for_period') as mock_peak:
-                mock_peak.return_value = (120.0, datetime(2025, 6, 15))
-                
-                with patch.object(generator.price_fetcher, 'get_closing_price') as mock_close:
-                    mock_close.return_value = 110.0
-                    
-                    generator.load_data(eac_data={'sales': [], 'tax_sales': [], 'dividends': [], 'symbol': 'TEST'}, held_shares=held_shares)
-                    report = generator.generate()
+        with patch.multiple(
+            generator.price_fetcher,
+            get_company_info=Mock(return_value=('Test Corp', 'USA', '00000')),
+            get_peak_price_for_period=Mock(return_value=(120.0, datetime(2025, 6, 15))),
+            get_closing_price=Mock(return_value=110.0),
+        ):
+            generator.load_data(eac_data={'sales': [], 'tax_sales': [], 'dividends': [], 'symbol': 'TEST'}, held_shares=held_shares)
+            report = generator.generate()
         
         assert report.get_entry_count() == 1
         assert report.equity_entries[0].shares == 50
@@ -2,13 +2,24 @@
 Unit tests for utility functions.
 """
 
+import os
+
 import pytest
+from dataclasses import replace
 from datetime import datetime
 
 from capital_gains.utils import (
     parse_currency,
+    parse_currency_series,
     parse_date,
+    parse_date_series,
+    compile_file_pattern,
+    find_file_in_statements,
+    find_file_in_statements_compiled,
+    list_statements_dir,
     get_advance_tax_quarter,
+    _advance_tax_quarter,
+    bucket_by_quarter,
     format_currency_inr,
     format_currency_usd,
     ADVANCE_TAX_QUARTERS,
@@ -18,94 +29,211 @@ from capital_gains.utils import (
 class TestParseCurrency:
     """Tests for parse_currency function."""
     
-    def test_simple_amount(self):
-        """Test parsing simple dollar amount."""
-        assert parse_currency("$123.45") == 123.45
+    @pytest.mark.parametrize("raw, expected", [
+        ("$123.45", 123.45),
+        # Thousand separators
+        ("$1,234.56", 1234.56),
+        ("$12,345,678.90", 12345678.90),
+        # The negative sign is removed, alone or with separators
+        ("-$100.00", 100.0),
+        ("-$1,234.56", 1234.56),
+        ("", 0.0),
+        ("   ", 0.0),
+        (None, 0.0),
+        ("123.45", 123.45),
+        # Padding around and after the symbol; sub-cent precision is kept
+        ("  $ 1,234  ", 1234.0),
+        ("$0.0004", 0.0004),
+    ])
+    def test_parse_currency(self, raw, expected):
+        """Test parsing currency strings to float."""
+        assert parse_currency(raw) == expected
     
-    def test_amount_with_commas(self):
-        """Test parsing amount with thousand separators."""
-        assert parse_currency("$1,234.56") == 1234.56
-        assert parse_currency("$12,345,678.90") == 12345678.90
+    def test_numeric_value(self):
+        """Test that numbers are returned directly, matching the string path."""
+        assert parse_currency(1234.56) == parse_currency("$1,234.56")
+        assert parse_currency(-100) == parse_currency("-$100.00")
+        assert parse_currency(0) == 0.0
+
+
+class TestParseDate:
+    """Tests for parse_date function."""
     
-    def test_negative_amount(self):
-        """Test parsing negative amount."""
-        assert parse_currency("-$100.00") == 100.0  # Removes negative sign
+    @pytest.mark.parametrize("date_str, date_format, expected", [
+        ("12/31/2024", "%m/%d/%Y", datetime(2024, 12, 31)),
+        ("2024-12-31", "%Y-%m-%d", datetime(2024, 12, 31)),
+        # Non zero-padded dates still parse
+        ("1/5/2024", "%m/%d/%Y", datetime(2024, 1, 5)),
+    ])
+    def test_parse_date(self, date_str, date_format, expected):
+        """Test parsing dates in the default and custom formats."""
+        assert parse_date(date_str, date_format) == expected
     
-    def test_empty_string(self):
-        """Test parsing empty string."""
-        assert parse_currency("") == 0.0
-        assert parse_currency("   ") == 0.0
+    @pytest.mark.parametrize("date_str, date_format", [
+        ("31-12-2024", "%m/%d/%Y"),  # Wrong format
+        ("13/01/2024", "%m/%d/%Y"),  # Invalid month
+        ("2024-02-30", "%Y-%m-%d"),  # Invalid day
+        ("12-31-2024", "%m/%d/%Y"),  # Wrong separator
+    ])
+    def test_parse_date_invalid(self, date_str, date_format):
+        """Test that invalid dates raise ValueError."""
+        with pytest.raises(ValueError):
+            parse_date(date_str, date_format)
     
-    def test_none_value(self):
-        """Test parsing None value."""
-        assert parse_currency(None) == 0.0
+    def test_default_format(self):
+        """Test that the default format is US (MM/DD/YYYY)."""
+        assert parse_date("12/31/2024") == datetime(2024, 12, 31)
     
-    def test_without_dollar_sign(self):
-        """Test parsing amount without dollar sign."""
-        assert parse_currency("123.45") == 123.45
+    def test_repeated_dates_are_cached(self):
+        """Test that identical date strings return the cached datetime."""
+        first = parse_date("03/15/2025")
+        second = parse_date("03/15/2025")
+        assert first is second
+        assert first == datetime(2025, 3, 15)
 
 
-class TestParseDate:
-    """Tests for parse_date function."""
+class TestSeriesParsing:
+    """Tests for the vectorized column parsers."""
     
-    def test_us_format(self):
-        """Test parsing US date format (MM/DD/YYYY)."""
-        result = parse_date("12/31/2024")
-        assert result == datetime(2024, 12, 31)
+    def test_parse_currency_series(self):
+        """Test column parsing matches parse_currency row by row."""
+        pd = pytest.importorskip("pandas")
+        raw = ["$1,234.56", "-$100.00", "", None, "123.45"]
+        result = parse_currency_series(pd.Series(raw))
+        assert list(result) == [parse_currency(v) for v in raw]
     
-    def test_custom_format(self):
-        """Test parsing with custom format."""
-        result = parse_date("2024-12-31", "%Y-%m-%d")
-        assert result == datetime(2024, 12, 31)
+    def test_parse_date_series(self):
+        """Test column parsing of dates with an explicit format."""
+        pd = pytest.importorskip("pandas")
+        result = parse_date_series(pd.Series(["12/31/2024", "12/31/2024", "01/15/2023"]))
+        assert list(result) == [datetime(2024, 12, 31), datetime(2024, 12, 31), datetime(2023, 1, 15)]
     
-    def test_invalid_format(self):
-        """Test that invalid format raises ValueError."""
+    def test_parse_date_series_invalid(self):
+        """Test that a malformed date raises ValueError."""
+        pd = pytest.importorskip("pandas")
         with pytest.raises(ValueError):
-            parse_date("31-12-2024")  # Wrong format
+            parse_date_series(pd.Series(["31-12-2024"]))
 
 
 class TestGetAdvanceTaxQuarter:
     """Tests for get_advance_tax_quarter function."""
     
-    def test_q1_april(self):
-        """Test Q1 date in April."""
-        result = get_advance_tax_quarter(datetime(2025, 4, 15))
-        assert result == "Upto 15 Jun"
+    @pytest.mark.parametrize("sale_date, quarter", [
+        (datetime(2025, 4, 15), "Upto 15 Jun"),
+        (datetime(2025, 6, 10), "Upto 15 Jun"),
+        (datetime(2025, 6, 15), "Upto 15 Jun"),
+        (datetime(2025, 6, 20), "16 Jun-15 Sep"),
+        (datetime(2025, 8, 15), "16 Jun-15 Sep"),
+        (datetime(2025, 10, 15), "16 Sep-15 Dec"),
+        (datetime(2026, 1, 15), "16 Dec-15 Mar"),
+        (datetime(2026, 3, 20), "16 Mar-31 Mar"),
+        # Fiscal year edges and the remaining quarter boundaries
+        (datetime(2025, 4, 1), "Upto 15 Jun"),
+        (datetime(2025, 9, 15), "16 Jun-15 Sep"),
+        (datetime(2025, 9, 16), "16 Sep-15 Dec"),
+        (datetime(2025, 12, 15), "16 Sep-15 Dec"),
+        (datetime(2025, 12, 16), "16 Dec-15 Mar"),
+        (datetime(2026, 3, 15), "16 Dec-15 Mar"),
+        (datetime(2026, 3, 16), "16 Mar-31 Mar"),
+        (datetime(2026, 3, 31), "16 Mar-31 Mar"),
+    ])
+    def test_quarter(self, sale_date, quarter):
+        """Test that sale dates fall into the right advance tax quarter."""
+        assert get_advance_tax_quarter(sale_date) == quarter
     
-    def test_q1_june_early(self):
-        """Test Q1 date early June."""
-        result = get_advance_tax_quarter(datetime(2025, 6, 10))
-        assert result == "Upto 15 Jun"
+    def test_returns_shared_constant(self):
+        """Test that the returned label is the ADVANCE_TAX_QUARTERS entry itself."""
+        result = get_advance_tax_quarter(datetime(2025, 8, 15))
+        assert result is ADVANCE_TAX_QUARTERS[1]
     
-    def test_q1_june_15(self):
-        """Test Q1 date on June 15."""
-        result = get_advance_tax_quarter(datetime(2025, 6, 15))
-        assert result == "Upto 15 Jun"
+    def test_quarter_is_cached(self):
+        """Test that the same month/day in another year hits the cache."""
+        get_advance_tax_quarter(datetime(2025, 11, 3))
+        hits = _advance_tax_quarter.cache_info().hits
+        assert get_advance_tax_quarter(datetime(2024, 11, 3)) == "16 Sep-15 Dec"
+        assert _advance_tax_quarter.cache_info().hits == hits + 1
+
+
+class TestBucketByQuarter:
+    """Tests for bucket_by_quarter function."""
     
-    def test_q2_june_late(self):
-        """Test Q2 date late June."""
-        result = get_advance_tax_quarter(datetime(2025, 6, 20))
-        assert result == "16 Jun-15 Sep"
+    def test_buckets_ltcg_and_stcg(self, sample_sale_transaction):
+        """Test gains are summed into the quarter of their sale date."""
+        txns = [
+            replace(sample_sale_transaction, capital_gain_inr=100.0, is_long_term=True),
+            replace(sample_sale_transaction, capital_gain_inr=50.0, is_long_term=True),
+            replace(sample_sale_transaction, sale_date=datetime(2025, 7, 20),
+                    capital_gain_inr=-30.0, is_long_term=False),
+        ]
+        
+        result = bucket_by_quarter(txns)
+        
+        assert list(result) == list(ADVANCE_TAX_QUARTERS)
+        assert result["Upto 15 Jun"].ltcg == 150.0
+        assert result["Upto 15 Jun"].stcg == 0.0
+        assert result["16 Jun-15 Sep"].stcg == -30.0
+        assert result["16 Mar-31 Mar"].total == 0.0
     
-    def test_q2_august(self):
-        """Test Q2 date in August."""
-        result = get_advance_tax_quarter(datetime(2025, 8, 15))
-        assert result == "16 Jun-15 Sep"
+    def test_empty(self):
+        """Test that every quarter is present even without transactions."""
+        result = bucket_by_quarter([])
+        assert all(q.total == 0.0 for q in result.values())
+
+
+class TestFindFileInStatements:
+    """Tests for statements folder lookups."""
+    
+    @pytest.fixture
+    def statements_dir(self, tmp_path):
+        """Create a statements folder with two matching files of different age."""
+        for name, mtime in [("pnl-old.xlsx", 1000), ("pnl-new.xlsx", 2000), ("rates.json", 1500)]:
+            path = tmp_path / name
+            path.write_text("x")
+            os.utime(path, (mtime, mtime))
+        return str(tmp_path)
     
-    def test_q3_october(self):
-        """Test Q3 date in October."""
-        result = get_advance_tax_quarter(datetime(2025, 10, 15))
-        assert result == "16 Sep-15 Dec"
+    def test_returns_most_recent_match(self, statements_dir):
+        """Test that the newest matching file wins."""
+        result = find_file_in_statements("pnl-*.xlsx", statements_dir)
+        assert result == os.path.join(statements_dir, "pnl-new.xlsx")
     
-    def test_q4_january(self):
-        """Test Q4 date in January."""
-        result = get_advance_tax_quarter(datetime(2026, 1, 15))
-        assert result == "16 Dec-15 Mar"
+    def test_no_match(self, statements_dir):
+        """Test that None is returned when nothing matches."""
+        assert find_file_in_statements("*.csv", statements_dir) is None
     
-    def test_q5_march_late(self):
-        """Test Q5 date late March."""
-        result = get_advance_tax_quarter(datetime(2026, 3, 20))
-        assert result == "16 Mar-31 Mar"
+    def test_with_prebuilt_entries(self, statements_dir):
+        """Test that a shared directory listing gives the same results."""
+        entries = list_statements_dir(statements_dir)
+        assert len(entries) == 3
+        assert find_file_in_statements("pnl-*.xlsx", statements_dir, entries) == \
+            os.path.join(statements_dir, "pnl-new.xlsx")
+        assert find_file_in_statements("rates.json", statements_dir, entries) == \
+            os.path.join(statements_dir, "rates.json")
+        assert find_file_in_statements("*.csv", statements_dir, entries) is None
+    
+    def test_compiled_pattern(self, statements_dir):
+        """Test lookups with a precompiled pattern."""
+        entries = list_statements_dir(statements_dir)
+        pattern = compile_file_pattern("pnl-*.xlsx")
+        assert find_file_in_statements_compiled(pattern, entries) == \
+            os.path.join(statements_dir, "pnl-new.xlsx")
+        assert find_file_in_statements_compiled(compile_file_pattern("*.csv"), entries) is None
+    
+    def test_broken_symlink_is_skipped(self, statements_dir):
+        """Test that a dangling symlink doesn't abort the lookup."""
+        link = os.path.join(statements_dir, "pnl-broken.xlsx")
+        try:
+            os.symlink(os.path.join(statements_dir, "missing.xlsx"), link)
+        except (OSError, NotImplementedError):
+            pytest.skip("symlinks not supported")
+        entries = list_statements_dir(statements_dir)
+        assert find_file_in_statements("pnl-*.xlsx", statements_dir, entries) == \
+            os.path.join(statements_dir, "pnl-new.xlsx")
+        assert find_file_in_statements("pnl-broken.xlsx", statements_dir) is None
+    
+    def test_missing_directory(self):
+        """Test that a missing folder yields no entries."""
+        assert list_statements_dir("/nonexistent/statements") == []
 
 
 class TestFormatCurrency:
@@ -130,6 +258,12 @@ class TestFormatCurrency:
         """Test USD formatting without symbol."""
         result = format_currency_usd(1234.56, include_symbol=False)
         assert result == "1,234.56"
+    
+    def test_format_repeated_and_zero_amounts(self):
+        """Test cached formatting keeps exact output, including signed zero."""
+        assert format_currency_inr(1500.0) == format_currency_inr(1500.0) == "₹1,500.00"
+        assert format_currency_usd(-0.0, include_symbol=False) == "-0.00"
+        assert format_currency_usd(0.0, include_symbol=False) == "0.00"
 
 
 class TestAdvanceTaxQuartersConstant:
@@ -140,10 +274,12 @@ class TestAdvanceTaxQuartersConstant:
         assert len(ADVANCE_TAX_QUARTERS) == 5
     
     def test_quarter_names(self):
-        """Test quarter names are correct."""
-        assert "Upto 15 Jun" in ADVANCE_TAX_QUARTERS
-        assert "16 Jun-15 Sep" in ADVANCE_TAX_QUARTERS
-        assert "16 Sep-15 Dec" in ADVANCE_TAX_QUARTERS
-        assert "16 Dec-15 Mar" in ADVANCE_TAX_QUARTERS
-        assert "16 Mar-31 Mar" in ADVANCE_TAX_QUARTERS
+        """Test quarter names are correct and in fiscal-year order."""
+        assert ADVANCE_TAX_QUARTERS == (
+            "Upto 15 Jun",
+            "16 Jun-15 Sep",
+            "16 Sep-15 Dec",
+            "16 Dec-15 Mar",
+            "16 Mar-31 Mar",
+        )
 
@@ -0,0 +1,48 @@
+"""
+Micro-benchmarks for the per-row utility functions.
+
+Marked perf, which pytest.ini deselects by default; run them with
+``pytest -m perf`` (requires pytest-benchmark).
+"""
+
+import random
+from datetime import datetime, timedelta
+
+import pytest
+
+pytest.importorskip("pytest_benchmark")
+
+from capital_gains.utils import parse_currency, get_advance_tax_quarter
+
+BATCH_SIZE = 100_000
+
+
+@pytest.fixture(scope="module")
+def currency_batch():
+    """Seeded '$1,234.56'-style strings, generated once per module."""
+    rng = random.Random(0)
+    return [f"${rng.random() * 1e6:,.2f}" for _ in range(BATCH_SIZE)]
+
+
+@pytest.fixture(scope="module")
+def date_batch():
+    """Seeded sale dates spread over two fiscal years."""
+    rng = random.Random(0)
+    start = datetime(2024, 4, 1)
+    return [start + timedelta(days=rng.randrange(730)) for _ in range(BATCH_SIZE)]
+
+
+@pytest.mark.perf
+@pytest.mark.benchmark(group="utils")
+class TestUtilsPerf:
+    """Benchmarks for parse_currency and get_advance_tax_quarter."""
+    
+    def test_parse_currency_perf(self, benchmark, currency_batch):
+        """Time parsing a batch of currency strings."""
+        result = benchmark(lambda: [parse_currency(s) for s in currency_batch])
+        assert len(result) == BATCH_SIZE
+    
+    def test_get_advance_tax_quarter_perf(self, benchmark, date_batch):
+        """Time bucketing a batch of sale dates into quarters."""
+        result = benchmark(lambda: [get_advance_tax_quarter(d) for d in date_batch])
+        assert len(result) == BATCH_SIZE
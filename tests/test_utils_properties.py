@@ -0,0 +1,44 @@
+"""
+Property-based tests for utility functions.
+"""
+
+from decimal import Decimal
+
+import pytest
+
+pytest.importorskip("hypothesis")
+
+from hypothesis import given, strategies as st
+
+from capital_gains.utils import parse_currency
+
+
+# Well-formed amounts as they appear in broker exports: two decimal places
+AMOUNTS = st.decimals(
+    min_value=0, max_value=10**9, allow_nan=False, allow_infinity=False, places=2
+)
+
+
+class TestParseCurrencyProperties:
+    """Property-based tests for parse_currency function."""
+    
+    @given(amount=AMOUNTS)
+    def test_formatted_amount_roundtrip(self, amount: Decimal):
+        """Test that '$1,234.56'-style strings parse back to the amount."""
+        assert parse_currency(f"${amount:,.2f}") == pytest.approx(float(amount))
+    
+    @given(amount=AMOUNTS)
+    def test_sign_is_dropped(self, amount: Decimal):
+        """Test that a leading minus sign gives the same value."""
+        formatted = f"${amount:,.2f}"
+        assert parse_currency(f"-{formatted}") == parse_currency(formatted)
+    
+    @given(raw=st.text(alphabet="0123456789$,. -"))
+    def test_malformed_input_raises_value_error(self, raw: str):
+        """Test that any input either parses to a non-negative float or raises ValueError."""
+        try:
+            result = parse_currency(raw)
+        except ValueError:
+            return
+        assert isinstance(result, float)
+        assert result >= 0.0